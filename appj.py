@@ -15,33 +15,82 @@ if backend_path not in sys.path:
 # Backend 모듈 import (linter 경고 무시)
 import importlib.util
 
-# open.py 모듈 동적 로드
-open_spec = importlib.util.spec_from_file_location("open_module", os.path.join(backend_path, "open.py"))
-if open_spec and open_spec.loader:
-    open_module = importlib.util.module_from_spec(open_spec)
-    open_spec.loader.exec_module(open_module)
-    get_routine_category_suggestion = open_module.get_routine_category_suggestion
-    get_ai_advice = open_module.get_ai_advice
-    get_realtime_feedback = open_module.get_realtime_feedback
-else:
-    raise ImportError("Cannot load backend/open.py module")
+def _load_backend_module(module_name, filename):
+    """backend 모듈을 파일 경로로 로드해 sys.modules에 등록 (이미 로드됐으면 그대로 재사용)"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(backend_path, filename))
+    if not (spec and spec.loader):
+        raise ImportError(f"Cannot load backend/{filename} module")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        del sys.modules[module_name]
+        raise
+    return module
+
+@st.cache_resource
+def load_backend():
+    """
+    backend 모듈을 서버 프로세스당 한 번만 로드 (모든 세션과 재실행이 공유)
+    
+    database.py는 import 시 init_database()를 실행하며, backend 모듈들이 import하는 것과
+    같은 이름("database")으로 등록해 연결 풀/통계 캐시가 프로세스에 하나만 생기도록 함
+    """
+    database_module = _load_backend_module("database", "database.py")
+    open_module = _load_backend_module("open_module", "open.py")
+    feedback_module = _load_backend_module("feedback", "feedback.py")
+    time_engine_module = _load_backend_module("time_engine", "time_engine.py")
+    analytics_module = _load_backend_module("analytics", "analytics.py")
+    query_cache_module = _load_backend_module("query_cache", "query_cache.py")
+    return open_module, database_module, feedback_module, time_engine_module, analytics_module, query_cache_module
+
+(open_module, database_module, feedback_module, time_engine_module, analytics_module,
+ query_cache_module) = load_backend()
+
+# query_cache.py (읽기 함수는 세션 간 공유 캐시를 거쳐 호출, 쓰기가 데이터 버전을 올리면 다시 읽음)
+cached_query = query_cache_module.cached_query
+get_query_cache_info = query_cache_module.get_query_cache_info
+clear_query_cache = query_cache_module.clear_query_cache
+
+# open.py
+get_routine_category_suggestion = open_module.get_routine_category_suggestion
+stream_ai_advice = open_module.stream_ai_advice
+generate_realtime_feedback = open_module.generate_realtime_feedback
+fill_record_categories = open_module.fill_record_categories
+
+# database.py
+db_add_record = database_module.add_record
+DuplicateRecordError = database_module.DuplicateRecordError
+db_add_records_bulk = database_module.add_records_bulk
+filter_new_records = database_module.filter_new_records
+get_records_by_date = cached_query(database_module.get_records_by_date)
+delete_record = database_module.delete_record
+update_record = database_module.update_record
+get_statistics_cache_info = database_module.get_statistics_cache_info
+get_daily_counts = cached_query(database_module.get_daily_counts)
+get_data_version = database_module.get_data_version
 
-# database.py 모듈 동적 로드
-database_spec = importlib.util.spec_from_file_location("database_module", os.path.join(backend_path, "database.py"))
-if database_spec and database_spec.loader:
-    database_module = importlib.util.module_from_spec(database_spec)
-    database_spec.loader.exec_module(database_module)
-    db_add_record = database_module.add_record
-    get_all_records = database_module.get_all_records
-    get_records_by_date = database_module.get_records_by_date
-    get_records_by_date_range = database_module.get_records_by_date_range
-    delete_record = database_module.delete_record
-    update_record = database_module.update_record
-    get_statistics = database_module.get_statistics
-    migrate_from_json = database_module.migrate_from_json
-    init_database = database_module.init_database
-else:
-    raise ImportError("Cannot load backend/database.py module")
+# feedback.py
+FeedbackRefresher = feedback_module.FeedbackRefresher
+FEEDBACK_POLL_SECONDS = feedback_module.FEEDBACK_POLL_SECONDS
+
+# time_engine.py
+split_time_ranges = time_engine_module.split_time_ranges
+
+# analytics.py
+get_analytics_snapshot = analytics_module.get_analytics_snapshot
+
+@st.cache_resource
+def get_feedback_refresher():
+    """실시간 피드백 백그라운드 갱신기 (프로세스당 하나, 모든 세션이 공유)"""
+    # 실패 시 예외를 던지는 생성 함수를 써서, 갱신기가 오류를 기록하고 마지막 정상 피드백을 유지하도록 함
+    refresher = FeedbackRefresher(generate=generate_realtime_feedback, version_source=get_data_version)
+    refresher.start()
+    return refresher
 
 # 페이지 설정
 st.set_page_config(
@@ -803,107 +852,153 @@ if 'show_visualizations' not in st.session_state:
 if 'show_csv_upload' not in st.session_state:
     st.session_state.show_csv_upload = False
 
-# 데이터베이스 초기화
-init_database()
+# 데이터베이스 초기화는 load_backend()에서 database 모듈을 처음 로드할 때 한 번만 실행됨
 
 
 def add_record(activity, category, start_time, end_time, memo, record_date=None):
-    """새 기록 추가 (데이터베이스)"""
+    """새 기록 추가 (데이터베이스, 같은 기록이 이미 있으면 DuplicateRecordError)"""
     return db_add_record(activity, category, start_time, end_time, memo, record_date)
 
-def calculate_time_duration(start_time: str, end_time: str) -> float:
-    """시간 차이 계산 (분 단위)"""
-    try:
-        start = datetime.strptime(start_time, "%H:%M")
-        end = datetime.strptime(end_time, "%H:%M")
-        if end < start:
-            # 자정을 넘어가는 경우
-            end += timedelta(days=1)
-        duration = (end - start).total_seconds() / 60  # 분 단위
-        return duration
-    except:
-        return 0
-
 def parse_csv_file(uploaded_file) -> list:
     """CSV 파일 파싱"""
     try:
         # CSV 파일 읽기
         df = pd.read_csv(uploaded_file, encoding='utf-8')
         
-        records = []
-        for _, row in df.iterrows():
-            # 시간 범위 파싱 (예: "00:00-07:34")
-            time_range = str(row['시간(시작-종료)']).strip()
-            if '-' in time_range:
-                start_time, end_time = time_range.split('-')
-                start_time = start_time.strip()
-                end_time = end_time.strip()
-            else:
-                continue
-            
-            # 날짜 파싱
-            date_str = str(row['날짜']).strip()
-            
-            record = {
-                'date': date_str,
-                'activity': str(row['활동명']).strip(),
-                'category': str(row['카테고리']).strip(),
-                'start_time': start_time,
-                'end_time': end_time,
-                'memo': str(row['메모']).strip() if pd.notna(row['메모']) else ''
-            }
-            records.append(record)
-        
-        return records
+        # 시간 범위 파싱 (예: "00:00-07:34"), "-"가 없는 행은 제외
+        times = split_time_ranges(df['시간(시작-종료)'])
+        parsed = pd.DataFrame({
+            'date': df['날짜'].astype(str).str.strip(),
+            'activity': df['활동명'].astype(str).str.strip(),
+            'category': df['카테고리'].astype(str).str.strip(),
+            'start_time': times['start_time'],
+            'end_time': times['end_time'],
+            'memo': df['메모'].fillna('').astype(str).str.strip()
+        })
+        return parsed[times['has_range']].to_dict('records')
     except Exception as e:
         st.error(f"CSV 파일 파싱 오류: {str(e)}")
         return []
 
-def import_csv_to_database(records: list) -> dict:
-    """CSV 데이터를 데이터베이스에 임포트"""
-    success_count = 0
-    error_count = 0
-    duplicate_count = 0
+def import_csv_to_database(records: list, auto_categorize: bool = False) -> dict:
+    """
+    CSV 데이터를 데이터베이스에 임포트
+    
+    auto_categorize가 True이면 새로 저장될 기록 중 카테고리가 비었거나 표준이 아닌 기록을
+    일괄 분류로 채움 (같은 활동명은 한 번만, 요청은 묶어서, 분류하지 못하면 원래 값 유지)
+    """
+    categorized = None
+    if auto_categorize:
+        # 이미 있거나 파일 안에서 겹치는 기록은 저장되지 않으므로 분류 대상에서 제외
+        categorized = fill_record_categories(filter_new_records(records))
+    
+    # 중복 체크 (날짜, 활동명, 시작시간이 동일한 경우)는 데이터베이스 고유 인덱스가 처리
+    result = db_add_records_bulk(records)
+    result['categorized'] = categorized
+    return result
+
+def render_ai_advice(advice: dict, sort_by_priority: bool = True):
+    """AI 조언 카드 표시 (스트리밍 중에는 도착 순서대로 표시)"""
+    st.markdown(f"""
+    <div class="ai-advice-card">
+        <div class="ai-advice-title">
+            ✨ AI 조언
+        </div>
+        <div class="ai-advice-summary">
+            {advice.get('summary', '')}
+        </div>
+    """, unsafe_allow_html=True)
     
-    for record in records:
-        try:
-            # 중복 체크 (날짜, 활동명, 시작시간이 동일한 경우)
-            existing_records = get_records_by_date(record['date'])
-            is_duplicate = False
-            
-            for existing in existing_records:
-                if (existing.get('activity') == record['activity'] and
-                    existing.get('start_time') == record['start_time']):
-                    is_duplicate = True
-                    duplicate_count += 1
-                    break
-            
-            if not is_duplicate:
-                result = db_add_record(
-                    activity=record['activity'],
-                    category=record['category'],
-                    start_time=record['start_time'],
-                    end_time=record['end_time'],
-                    memo=record['memo'],
-                    record_date=record['date']
-                )
-                if result:
-                    success_count += 1
-                else:
-                    error_count += 1
-        except Exception as e:
-            error_count += 1
-            print(f"기록 추가 오류: {e}")
+    # 조언 목록 표시 (priority 순으로 정렬)
+    if advice.get('advices'):
+        advices = advice['advices']
+        if sort_by_priority:
+            advices = sorted(advices, key=lambda x: x.get('priority', 999))
+        for idx, item in enumerate(advices, 1):
+            st.markdown(f"""
+            <div class="ai-advice-item">
+                <div class="ai-advice-item-title">
+                    <span class="ai-advice-priority">우선순위 {item.get('priority', idx)}</span>
+                    {item.get('title', '')}
+                </div>
+                <div class="ai-advice-item-desc">
+                    {item.get('description', '')}
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
     
-    return {
-        'success': success_count,
-        'error': error_count,
-        'duplicate': duplicate_count,
-        'total': len(records)
-    }
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def show_streaming_ai_advice(advice_input: str):
+    """
+    AI 조언을 스트리밍으로 받아 요약과 조언 카드를 완성되는 대로 표시하고,
+    완료되면 최종 결과를 세션에 저장 (결과 영역에서 우선순위 순으로 다시 표시됨)
+    """
+    placeholder = st.empty()
+    placeholder.info("AI가 조언을 생성하는 중입니다...")
+    partial = {"summary": "", "advices": []}
+    result = None
+    try:
+        for event in stream_ai_advice(advice_input):
+            if event["type"] == "summary":
+                partial["summary"] = event["summary"]
+            elif event["type"] == "advice":
+                partial["advices"].append(event["advice"])
+            elif event["type"] == "done":
+                result = event["result"]
+                continue
+            else:
+                continue
+            
+            with placeholder.container():
+                render_ai_advice(partial, sort_by_priority=False)
+                st.caption("✍️ 조언을 작성하는 중입니다...")
+        
+        placeholder.empty()
+        st.session_state.ai_advice = result
+        st.session_state.show_ai_advice = result is not None
+    except Exception as e:
+        placeholder.empty()
+        st.error(f"AI 조언을 가져오는 중 오류가 발생했습니다: {str(e)}")
+        st.session_state.ai_advice = None
+
+def shift_month(year: int, month: int, offset: int) -> tuple:
+    """(year, month)에서 offset개월 이동한 (연, 월)"""
+    index = year * 12 + (month - 1) + offset
+    return index // 12, index % 12 + 1
+
+def get_month_badges(year: int, month: int) -> dict:
+    """해당 월의 날짜별 기록 수 (캘린더 배지, 조회 캐시를 거쳐 월 단위로 한 번만 읽음)"""
+    first_day = datetime(year, month, 1).date()
+    last_day = (first_day + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return get_daily_counts(first_day.isoformat(), last_day.isoformat())
+
+def prefetch_month_badges(year: int, month: int):
+    """이전/다음 달 배지를 미리 읽어 조회 캐시에 넣어 둠 (월 이동 시 쿼리 없이 그림)"""
+    for offset in (-1, 1):
+        get_month_badges(*shift_month(year, month, offset))
+
+def select_calendar_date(selected_date):
+    """날짜 버튼 콜백 (fragment 재실행 전에 선택 상태를 바꿔 한 번의 재실행으로 반영)"""
+    st.session_state.selected_calendar_date = selected_date
+
+def move_calendar_month(offset: int):
+    """월 이동 버튼 콜백"""
+    year, month = shift_month(st.session_state.calendar_year, st.session_state.calendar_month, offset)
+    st.session_state.calendar_year = year
+    st.session_state.calendar_month = month
 
 def create_calendar_view():
-    """캘린더 뷰 생성"""
+    """
+    캘린더 뷰 생성
+    
+    그리드와 선택한 날짜의 기록 목록은 각각 fragment라서 날짜 클릭/월 이동은 앱 전체가 아닌
+    캘린더 부분만 다시 실행함 (수정/삭제/기록 추가처럼 다른 화면으로 가는 동작만 전체 재실행)
+    """
+    st.fragment(render_calendar_grid)()
+
+def render_calendar_grid():
+    """캘린더 그리드와 월 이동 버튼 (선택한 날짜의 기록 목록 fragment를 포함)"""
     year = st.session_state.calendar_year
     month = st.session_state.calendar_month
     
@@ -914,19 +1009,8 @@ def create_calendar_view():
     # 첫 날의 요일 (월요일=0, 일요일=6)
     start_weekday = first_day.weekday()
     
-    # 날짜별 기록 수 가져오기
-    start_date = first_day.date()
-    end_date = last_day.date()
-    month_records = get_records_by_date_range(start_date.isoformat(), end_date.isoformat())
-    
-    # 날짜별 기록 수 딕셔너리
-    date_counts = {}
-    for record in month_records:
-        date = record.get('date')
-        if date in date_counts:
-            date_counts[date] += 1
-        else:
-            date_counts[date] = 1
+    # 날짜별 기록 수 딕셔너리 (일별 집계 테이블에서 월 단위로 조회)
+    date_counts = get_month_badges(year, month)
     
     # 요일 헤더
     weekdays = ['월', '화', '수', '목', '금', '토', '일']
@@ -998,14 +1082,15 @@ def create_calendar_view():
             if is_today:
                 button_type = "primary"
             
-            # 버튼 클릭 처리
-            # 버튼 생성
-            clicked = st.button(
+            # 버튼 생성 (클릭 시 콜백이 선택 날짜를 바꾸고 캘린더 fragment만 다시 실행)
+            st.button(
                 button_label, 
                 key=f"cal_btn_{date_str}", 
                 use_container_width=True, 
                 type=button_type, # 오늘만 primary가 들어감
-                help=tooltip_message
+                help=tooltip_message,
+                on_click=select_calendar_date,
+                args=(current_date,)
             )
             
             # 기록이 있는 경우: CSS에 정의된 클래스를 사용하여 버튼 위에 겹침
@@ -1019,10 +1104,6 @@ def create_calendar_view():
 
             # wrapper 끝
             st.markdown('</div>', unsafe_allow_html=True)
-
-            if clicked:
-                st.session_state.selected_calendar_date = current_date
-                st.rerun()
             
             # 선택된 날짜 표시 (버튼 아래에 표시)
             if is_selected and not is_today:
@@ -1044,28 +1125,23 @@ def create_calendar_view():
     # 월 이동 버튼
     col_prev, col_current, col_next = st.columns([1, 2, 1])
     with col_prev:
-        if st.button("◀ 이전 달", key="prev_month"):
-            if month == 1:
-                st.session_state.calendar_year = year - 1
-                st.session_state.calendar_month = 12
-            else:
-                st.session_state.calendar_month = month - 1
-            st.rerun()
+        st.button("◀ 이전 달", key="prev_month", on_click=move_calendar_month, args=(-1,))
     
     with col_current:
         st.markdown(f"<div style='text-align: center; padding: 0.5rem; color: #2C3E50; font-weight: 600;'>{year}년 {month}월</div>", unsafe_allow_html=True)
     
     with col_next:
-        if st.button("다음 달 ▶", key="next_month"):
-            if month == 12:
-                st.session_state.calendar_year = year + 1
-                st.session_state.calendar_month = 1
-            else:
-                st.session_state.calendar_month = month + 1
-            st.rerun()
+        st.button("다음 달 ▶", key="next_month", on_click=move_calendar_month, args=(1,))
+    
+    # 다음 월 이동에 대비해 이웃 달 배지를 미리 읽어 둠
+    prefetch_month_badges(year, month)
     
     # 선택한 날짜의 기록 표시
     st.markdown("---")
+    st.fragment(render_selected_day_records)()
+
+def render_selected_day_records():
+    """캘린더에서 선택한 날짜의 기록 목록"""
     if st.session_state.selected_calendar_date:
         selected_date_str = st.session_state.selected_calendar_date.isoformat()
         selected_records = get_records_by_date(selected_date_str)
@@ -1136,23 +1212,18 @@ def create_calendar_view():
                 st.rerun()
 
 def create_visualizations():
-    """데이터베이스 기록 시각화 생성"""
-    all_records = get_all_records()
+    """
+    데이터베이스 기록 시각화 생성
     
-    if not all_records:
+    네 탭 모두 데이터 버전당 한 번 만들어지는 통계 스냅샷에서 계산하므로, 렌더링 중에는
+    추가 쿼리나 DataFrame 재구성이 없음
+    """
+    snapshot = get_analytics_snapshot()
+    
+    if snapshot.total_records == 0:
         st.info("📊 시각화할 데이터가 없습니다. 기록을 추가해보세요!")
         return
     
-    # 데이터프레임 생성
-    df = pd.DataFrame(all_records)
-    
-    # 시간 계산 (분 단위)
-    df['duration_minutes'] = df.apply(
-        lambda row: calculate_time_duration(row['start_time'], row['end_time']), 
-        axis=1
-    )
-    df['date'] = pd.to_datetime(df['date'])
-    
     # 탭 생성
     tab1, tab2, tab3, tab4 = st.tabs(["📅 날짜별 통계", "📊 카테고리별 통계", "⏰ 시간 분석", "📈 전체 통계"])
     
@@ -1162,15 +1233,9 @@ def create_visualizations():
         # 최근 30일 데이터
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=30)
-        recent_records = get_records_by_date_range(start_date.isoformat(), end_date.isoformat())
+        daily_category_count = snapshot.daily_category_between(start_date, end_date)
         
-        if recent_records:
-            df_recent = pd.DataFrame(recent_records)
-            df_recent['date'] = pd.to_datetime(df_recent['date'])
-            
-            # 날짜별 카테고리별 기록 수 계산
-            daily_category_count = df_recent.groupby(['date', 'category']).size().reset_index(name='count')
-            daily_category_count = daily_category_count.sort_values('date')
+        if not daily_category_count.empty:
             
             # 카테고리 순서 정의
             category_order = ["수면", "식사", "일과", "운동", "취미", "기타"]
@@ -1219,18 +1284,9 @@ def create_visualizations():
         
         with col1:
             # 카테고리별 기록 수
-            category_count = df['category'].value_counts().reset_index()
-            category_count.columns = ['category', 'count']
-            
-            # 카테고리 순서 정의
+            # 카테고리 순서 정의 (스냅샷의 카테고리 요약은 이 순서로 정렬되어 있음)
             category_order = ["수면", "식사", "일과", "운동", "취미", "기타"]
-            
-            # 카테고리 순서에 따라 정렬
-            category_count['순서'] = category_count['category'].apply(
-                lambda x: category_order.index(x) if x in category_order else len(category_order)
-            )
-            category_count = category_count.sort_values('순서')
-            category_count = category_count.drop('순서', axis=1)
+            category_count = snapshot.category_summary[['category', 'count']]
             
             # 하늘색 계열 색상 팔레트
             sky_blue_colors = [
@@ -1260,19 +1316,13 @@ def create_visualizations():
         
         with col2:
             # 카테고리별 총 시간
-            category_time = df.groupby('category')['duration_minutes'].sum().reset_index()
-            category_time['hours'] = category_time['duration_minutes'] / 60
+            category_time = snapshot.category_summary[['category']].assign(
+                hours=snapshot.category_summary['total_minutes'] / 60
+            )
             
             # 카테고리 순서 정의
             category_order = ["수면", "식사", "일과", "운동", "취미", "기타"]
             
-            # 카테고리 순서에 따라 정렬
-            category_time['순서'] = category_time['category'].apply(
-                lambda x: category_order.index(x) if x in category_order else len(category_order)
-            )
-            category_time = category_time.sort_values('순서')
-            category_time = category_time.drop('순서', axis=1)
-            
             fig_bar = px.bar(
                 category_time,
                 x='category',
@@ -1295,10 +1345,8 @@ def create_visualizations():
     with tab3:
         st.subheader("시간대별 활동 분석")
         
-        # 시간대별 기록 수
-        df['start_hour'] = df['start_time'].apply(lambda x: int(x.split(':')[0]))
-        hourly_count = df.groupby('start_hour').size().reset_index(name='count')
-        hourly_count = hourly_count.sort_values('start_hour')
+        # 시간대별 기록 수 (시작 시각을 알 수 없는 기록은 제외)
+        hourly_count = snapshot.hourly_counts
         
         fig_hour = px.line(
             hourly_count,
@@ -1319,19 +1367,13 @@ def create_visualizations():
         
         # 평균 활동 시간
         st.subheader("카테고리별 평균 활동 시간")
-        category_avg = df.groupby('category')['duration_minutes'].mean().reset_index()
-        category_avg['avg_hours'] = category_avg['duration_minutes'] / 60
+        category_avg = snapshot.category_summary[['category']].assign(
+            avg_hours=snapshot.category_summary['avg_minutes'] / 60
+        )
         
         # 카테고리 순서 정의
         category_order = ["수면", "식사", "일과", "운동", "취미", "기타"]
         
-        # 카테고리 순서에 따라 정렬
-        category_avg['순서'] = category_avg['category'].apply(
-            lambda x: category_order.index(x) if x in category_order else len(category_order)
-        )
-        category_avg = category_avg.sort_values('순서')
-        category_avg = category_avg.drop('순서', axis=1)
-        
         fig_avg = px.bar(
             category_avg,
             x='category',
@@ -1354,82 +1396,39 @@ def create_visualizations():
     with tab4:
         st.subheader("전체 통계 요약")
         
-        # 통계 정보
-        stats = get_statistics()
-        
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("총 기록 수", f"{stats['total_records']}개")
+            st.metric("총 기록 수", f"{snapshot.total_records}개")
         
         with col2:
-            total_time = df['duration_minutes'].sum() / 60
+            total_time = snapshot.total_minutes / 60
             st.metric("총 활동 시간", f"{total_time:.1f}시간")
         
         with col3:
-            avg_time = df['duration_minutes'].mean() / 60 if len(df) > 0 else 0
+            avg_time = snapshot.avg_minutes / 60
             st.metric("평균 활동 시간", f"{avg_time:.1f}시간")
         
         with col4:
-            unique_days = df['date'].nunique()
-            st.metric("기록한 날짜", f"{unique_days}일")
+            st.metric("기록한 날짜", f"{snapshot.unique_days}일")
         
-        # 카테고리별 상세 통계
+        # 카테고리별 상세 통계 (지정된 순서 우선, 그 다음 기록 수 순)
         st.subheader("카테고리별 상세 통계")
-        if stats['category_stats']:
-            # 카테고리 순서 정의
-            category_order = ["수면", "식사", "일과", "운동", "취미", "기타"]
-            
-            # 카테고리별 기록 수
-            category_count_data = [
-                {'카테고리': k, '기록 수': v} 
-                for k, v in stats['category_stats'].items()
-            ]
-            
-            # 카테고리별 시간 계산
-            category_time_data = df.groupby('category')['duration_minutes'].sum().reset_index()
-            category_time_data['시간(시간)'] = (category_time_data['duration_minutes'] / 60).round(2)
-            
-            # 데이터 병합
-            category_df = pd.DataFrame(category_count_data)
-            category_df = category_df.merge(
-                category_time_data[['category', '시간(시간)']], 
-                left_on='카테고리', 
-                right_on='category', 
-                how='left'
-            )
-            category_df = category_df.drop('category', axis=1)
-            category_df['시간(시간)'] = category_df['시간(시간)'].fillna(0)
-            
-            # 카테고리 순서에 따라 정렬 (지정된 순서 우선, 그 다음 기록 수 순)
-            category_df['순서'] = category_df['카테고리'].apply(
-                lambda x: category_order.index(x) if x in category_order else len(category_order)
-            )
-            category_df = category_df.sort_values(['순서', '기록 수'], ascending=[True, False])
-            category_df = category_df.drop('순서', axis=1)
-            
-            # 컬럼 순서: 카테고리, 기록 수, 시간
-            category_df = category_df[['카테고리', '기록 수', '시간(시간)']]
-            
-            st.dataframe(category_df, use_container_width=True, hide_index=True)
+        category_df = pd.DataFrame({
+            '카테고리': snapshot.category_summary['category'].astype(str),
+            '기록 수': snapshot.category_summary['count'],
+            '시간(시간)': (snapshot.category_summary['total_minutes'] / 60).round(2),
+        })
+        st.dataframe(category_df, use_container_width=True, hide_index=True)
         
         # 최근 활동 추이
         st.subheader("주간 활동 추이")
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=7)
-        weekly_records = get_records_by_date_range(start_date.isoformat(), end_date.isoformat())
+        daily_stats = snapshot.daily_totals_between(start_date, end_date)
         
-        if weekly_records:
-            df_weekly = pd.DataFrame(weekly_records)
-            df_weekly['date'] = pd.to_datetime(df_weekly['date'])
-            df_weekly['duration_minutes'] = df_weekly.apply(
-                lambda row: calculate_time_duration(row['start_time'], row['end_time']), 
-                axis=1
-            )
-            daily_stats = df_weekly.groupby('date').agg({
-                'duration_minutes': ['sum', 'count']
-            }).reset_index()
-            daily_stats.columns = ['date', '총 시간(분)', '기록 수']
+        if not daily_stats.empty:
+            daily_stats = daily_stats.rename(columns={'total_minutes': '총 시간(분)', 'count': '기록 수'})
             daily_stats['총 시간(시간)'] = daily_stats['총 시간(분)'] / 60
             
             fig_weekly = go.Figure()
@@ -1474,78 +1473,144 @@ def create_visualizations():
     </div>
     """, unsafe_allow_html=True)
     
-    # 피드백 로딩 및 표시
-    with st.spinner("피드백을 생성하는 중..."):
-        try:
-            feedback_data = get_realtime_feedback()
+    # 피드백 표시 (백그라운드에서 생성된 마지막 결과를 바로 표시하고, 갱신 중이면 주기적으로 다시 확인)
+    refresher = get_feedback_refresher()
+    feedback_state = refresher.snapshot()
+    poll_interval = FEEDBACK_POLL_SECONDS if feedback_state["refreshing"] or feedback_state["stale"] else None
+    st.fragment(render_realtime_feedback, run_every=poll_interval)(polling=poll_interval is not None)
+
+def render_realtime_feedback(polling: bool = False):
+    """
+    실시간 피드백 섹션 렌더링 (생성을 기다리지 않고 저장된 결과 사용)
+    
+    Args:
+        polling: 이 fragment가 주기적으로 다시 실행되도록 만들어졌는지 여부
+    """
+    refresher = get_feedback_refresher()
+    feedback_state = refresher.snapshot()
+    feedback_data = feedback_state["feedback"]
+    
+    # run_every는 전체 실행 때 정해지므로, 갱신이 끝나면 전체를 다시 실행해 주기 실행을 멈춤
+    if polling and not (feedback_state["refreshing"] or feedback_state["stale"]):
+        st.rerun()
+    
+    if feedback_state["refreshing"] or feedback_state["stale"]:
+        if feedback_data:
+            st.caption("🔄 최근 기록을 반영해 피드백을 갱신 중입니다...")
+        else:
+            st.info("🔄 피드백을 생성하는 중입니다. 잠시만 기다려주세요...")
+    
+    if feedback_state["error"]:
+        st.error(f"피드백을 불러오는 중 오류가 발생했습니다: {feedback_state['error']}")
+        st.info("잠시 후 다시 시도해주세요.")
+    
+    try:
+        if feedback_data and 'feedbacks' in feedback_data:
+            # 요약 표시
+            if 'summary' in feedback_data:
+                st.markdown(f"""
+                <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                            padding: 1.5rem; 
+                            border-radius: 12px; 
+                            margin-bottom: 1.5rem;
+                            color: white;
+                            text-align: center;
+                            font-size: 1.1rem;
+                            font-weight: 500;">
+                    {feedback_data['summary']}
+                </div>
+                """, unsafe_allow_html=True)
             
-            if feedback_data and 'feedbacks' in feedback_data:
-                # 요약 표시
-                if 'summary' in feedback_data:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                                padding: 1.5rem; 
-                                border-radius: 12px; 
-                                margin-bottom: 1.5rem;
-                                color: white;
-                                text-align: center;
-                                font-size: 1.1rem;
-                                font-weight: 500;">
-                        {feedback_data['summary']}
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # 피드백 카드 표시
-                feedbacks = feedback_data['feedbacks']
-                
-                # 타입별 색상 정의
-                type_colors = {
-                    'positive': {'bg': '#E8F5E9', 'border': '#4CAF50', 'icon': '✅'},
-                    'suggestion': {'bg': '#FFF3E0', 'border': '#FF9800', 'icon': '💡'},
-                    'neutral': {'bg': '#E3F2FD', 'border': '#2196F3', 'icon': '📊'}
-                }
-                
-                # 피드백을 타입별로 정렬 (positive -> suggestion -> neutral)
-                type_order = ['positive', 'suggestion', 'neutral']
-                sorted_feedbacks = sorted(feedbacks, key=lambda x: type_order.index(x.get('type', 'neutral')) if x.get('type', 'neutral') in type_order else 999)
-                
-                for idx, feedback in enumerate(sorted_feedbacks):
-                    feedback_type = feedback.get('type', 'neutral')
-                    colors = type_colors.get(feedback_type, type_colors['neutral'])
-                    
-                    st.markdown(f"""
-                    <div style="background: {colors['bg']}; 
-                                border-left: 4px solid {colors['border']}; 
-                                padding: 1.5rem; 
-                                border-radius: 8px; 
-                                margin-bottom: 1rem;
-                                box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                        <div style="display: flex; align-items: center; margin-bottom: 0.5rem;">
-                            <span style="font-size: 1.5rem; margin-right: 0.5rem;">{colors['icon']}</span>
-                            <h3 style="margin: 0; color: #2C3E50; font-size: 1.2rem;">{feedback.get('title', '피드백')}</h3>
-                        </div>
-                        <p style="margin: 0; color: #4A5568; line-height: 1.6; font-size: 1rem;">{feedback.get('description', '')}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+            # 피드백 카드 표시
+            feedbacks = feedback_data['feedbacks']
+            
+            # 타입별 색상 정의
+            type_colors = {
+                'positive': {'bg': '#E8F5E9', 'border': '#4CAF50', 'icon': '✅'},
+                'suggestion': {'bg': '#FFF3E0', 'border': '#FF9800', 'icon': '💡'},
+                'neutral': {'bg': '#E3F2FD', 'border': '#2196F3', 'icon': '📊'}
+            }
+            
+            # 피드백을 타입별로 정렬 (positive -> suggestion -> neutral)
+            type_order = ['positive', 'suggestion', 'neutral']
+            sorted_feedbacks = sorted(feedbacks, key=lambda x: type_order.index(x.get('type', 'neutral')) if x.get('type', 'neutral') in type_order else 999)
+            
+            for idx, feedback in enumerate(sorted_feedbacks):
+                feedback_type = feedback.get('type', 'neutral')
+                colors = type_colors.get(feedback_type, type_colors['neutral'])
                 
-                # 타임스탬프 표시
-                if 'timestamp' in feedback_data:
-                    st.markdown(f"""
-                    <div style="text-align: center; color: #A0AEC0; font-size: 0.85rem; margin-top: 1rem;">
-                        마지막 업데이트: {feedback_data['timestamp']}
+                st.markdown(f"""
+                <div style="background: {colors['bg']}; 
+                            border-left: 4px solid {colors['border']}; 
+                            padding: 1.5rem; 
+                            border-radius: 8px; 
+                            margin-bottom: 1rem;
+                            box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                    <div style="display: flex; align-items: center; margin-bottom: 0.5rem;">
+                        <span style="font-size: 1.5rem; margin-right: 0.5rem;">{colors['icon']}</span>
+                        <h3 style="margin: 0; color: #2C3E50; font-size: 1.2rem;">{feedback.get('title', '피드백')}</h3>
                     </div>
-                    """, unsafe_allow_html=True)
-                
-                # 새로고침 버튼
-                col1, col2, col3 = st.columns([1, 2, 1])
-                with col2:
-                    if st.button("🔄 피드백 새로고침", use_container_width=True, key="refresh_feedback"):
-                        st.rerun()
-            else:
-                st.info("피드백을 생성할 수 없습니다. 기록을 추가해보세요!")
-        except Exception as e:
-            st.error(f"피드백을 불러오는 중 오류가 발생했습니다: {str(e)}")
-            st.info("잠시 후 다시 시도해주세요.")
+                    <p style="margin: 0; color: #4A5568; line-height: 1.6; font-size: 1rem;">{feedback.get('description', '')}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # 타임스탬프 표시
+            if 'timestamp' in feedback_data:
+                st.markdown(f"""
+                <div style="text-align: center; color: #A0AEC0; font-size: 0.85rem; margin-top: 1rem;">
+                    마지막 업데이트: {feedback_data['timestamp']}
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # 새로고침 버튼
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                if st.button("🔄 피드백 새로고침", use_container_width=True, key="refresh_feedback",
+                             disabled=feedback_state["refreshing"]):
+                    refresher.request_refresh()
+                    st.rerun()
+        elif not feedback_state["refreshing"] and not feedback_state["stale"] and not feedback_state["error"]:
+            st.info("피드백을 생성할 수 없습니다. 기록을 추가해보세요!")
+    except Exception as e:
+        st.error(f"피드백을 불러오는 중 오류가 발생했습니다: {str(e)}")
+        st.info("잠시 후 다시 시도해주세요.")
+
+def render_cache_debug_panel():
+    """사이드바 디버그 패널: 조회 캐시 적중률과 메모리 사용량"""
+    with st.sidebar.expander("🛠️ 조회 캐시 상태", expanded=False):
+        info = get_query_cache_info()
+        stats_info = get_statistics_cache_info()
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("적중률", f"{info['hit_rate']:.0%}")
+            st.metric("보관 중인 결과", f"{info['entries']}/{info['max_entries']}")
+        with col2:
+            st.metric("조회 수", f"{info['hits'] + info['misses']}회")
+            st.metric("메모리(추정)", f"{info['bytes'] / 1024 / 1024:.1f}/{info['max_bytes'] / 1024 / 1024:.0f}MB")
+        
+        if info['functions']:
+            st.dataframe(
+                pd.DataFrame([
+                    {'함수': name, '적중': counts['hits'], '미스': counts['misses'],
+                     '버전 변경': counts['stale'], '축출': counts['evictions'],
+                     '적중률': f"{counts['hit_rate']:.0%}"}
+                    for name, counts in sorted(info['functions'].items())
+                ]),
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        stats_lookups = stats_info['hits'] + stats_info['misses']
+        stats_rate = stats_info['hits'] / stats_lookups if stats_lookups else 0.0
+        st.caption(
+            f"데이터 버전 {stats_info['data_version']} · 통계 캐시 적중 "
+            f"{stats_info['hits']}/{stats_lookups} ({stats_rate:.0%}), {stats_info['size']}개 보관"
+        )
+        
+        if st.button("캐시 비우기", key="clear_query_cache"):
+            clear_query_cache()
+            st.rerun()
 
 # 메인 화면 - 디자인에 맞춘 초기 화면
 if not st.session_state.show_record_form and not st.session_state.show_records and not st.session_state.show_category_modal and not st.session_state.show_calendar and not st.session_state.editing_record_id and not st.session_state.deleting_record_id and not st.session_state.show_visualizations:
@@ -1619,45 +1684,11 @@ if not st.session_state.show_record_form and not st.session_state.show_records a
             st.rerun()
         
         if get_advice and advice_input:
-            with st.spinner("AI가 조언을 생성하는 중입니다..."):
-                try:
-                    advice_result = get_ai_advice(advice_input)
-                    st.session_state.ai_advice = advice_result
-                    st.session_state.show_ai_advice = True
-                except Exception as e:
-                    st.error(f"AI 조언을 가져오는 중 오류가 발생했습니다: {str(e)}")
-                    st.session_state.ai_advice = None
+            show_streaming_ai_advice(advice_input)
     
     # AI 조언 결과 표시
     if st.session_state.show_ai_advice and st.session_state.ai_advice:
-        advice = st.session_state.ai_advice
-        st.markdown(f"""
-        <div class="ai-advice-card">
-            <div class="ai-advice-title">
-                ✨ AI 조언
-            </div>
-            <div class="ai-advice-summary">
-                {advice.get('summary', '')}
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # 조언 목록 표시 (priority 순으로 정렬)
-        if advice.get('advices'):
-            sorted_advices = sorted(advice['advices'], key=lambda x: x.get('priority', 999))
-            for idx, item in enumerate(sorted_advices, 1):
-                st.markdown(f"""
-                <div class="ai-advice-item">
-                    <div class="ai-advice-item-title">
-                        <span class="ai-advice-priority">우선순위 {item.get('priority', idx)}</span>
-                        {item.get('title', '')}
-                    </div>
-                    <div class="ai-advice-item-desc">
-                        {item.get('description', '')}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        st.markdown("</div>", unsafe_allow_html=True)
+        render_ai_advice(st.session_state.ai_advice)
     
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -1717,12 +1748,19 @@ if st.session_state.show_record_form:
                     if start_time >= end_time and category != "수면":
                         st.warning("종료 시간은 시작 시간보다 늦어야 합니다.")
                     else:
-                        add_record(activity, category, start_time_str, end_time_str, memo)
-                        st.success("기록이 저장되었습니다! 🌱")
-                        st.session_state.show_record_form = False
-                        st.session_state.show_records = True
-                        st.session_state.selected_record_date = None
-                        st.rerun()
+                        try:
+                            saved = add_record(activity, category, start_time_str, end_time_str, memo)
+                        except DuplicateRecordError:
+                            st.warning("같은 날짜·시작 시간에 같은 활동 기록이 이미 있습니다. 기존 기록을 수정해주세요.")
+                        else:
+                            if not saved:
+                                st.error("저장 실패: 기록을 저장하지 못했습니다. 잠시 후 다시 시도해주세요.")
+                            else:
+                                st.success("기록이 저장되었습니다! 🌱")
+                                st.session_state.show_record_form = False
+                                st.session_state.show_records = True
+                                st.session_state.selected_record_date = None
+                                st.rerun()
             else:
                 st.warning("활동/루틴을 입력해주세요.")
     
@@ -1855,45 +1893,11 @@ if st.session_state.show_records and not st.session_state.show_record_form and n
             st.rerun()
         
         if get_advice_list and advice_input_list:
-            with st.spinner("AI가 조언을 생성하는 중입니다..."):
-                try:
-                    advice_result = get_ai_advice(advice_input_list)
-                    st.session_state.ai_advice = advice_result
-                    st.session_state.show_ai_advice = True
-                except Exception as e:
-                    st.error(f"AI 조언을 가져오는 중 오류가 발생했습니다: {str(e)}")
-                    st.session_state.ai_advice = None
+            show_streaming_ai_advice(advice_input_list)
     
     # AI 조언 결과 표시
     if st.session_state.show_ai_advice and st.session_state.ai_advice:
-        advice = st.session_state.ai_advice
-        st.markdown(f"""
-        <div class="ai-advice-card">
-            <div class="ai-advice-title">
-                ✨ AI 조언
-            </div>
-            <div class="ai-advice-summary">
-                {advice.get('summary', '')}
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # 조언 목록 표시 (priority 순으로 정렬)
-        if advice.get('advices'):
-            sorted_advices = sorted(advice['advices'], key=lambda x: x.get('priority', 999))
-            for idx, item in enumerate(sorted_advices, 1):
-                st.markdown(f"""
-                <div class="ai-advice-item">
-                    <div class="ai-advice-item-title">
-                        <span class="ai-advice-priority">우선순위 {item.get('priority', idx)}</span>
-                        {item.get('title', '')}
-                    </div>
-                    <div class="ai-advice-item-desc">
-                        {item.get('description', '')}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        st.markdown("</div>", unsafe_allow_html=True)
+        render_ai_advice(st.session_state.ai_advice)
     
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -1938,6 +1942,13 @@ if st.session_state.show_csv_upload and not st.session_state.show_category_modal
         except Exception as e:
             st.error(f"파일 읽기 오류: {str(e)}")
         
+        auto_categorize = st.checkbox(
+            "카테고리 자동 분류",
+            value=False,
+            key="csv_auto_categorize",
+            help="카테고리가 비었거나 표준이 아닌 새 기록을 기존 기록과 AI로 분류합니다. 분류하지 못한 기록은 원래 카테고리를 유지합니다."
+        )
+        
         # 업로드 버튼
         col_upload, col_cancel = st.columns([1, 1])
         
@@ -1949,7 +1960,7 @@ if st.session_state.show_csv_upload and not st.session_state.show_category_modal
                     records = parse_csv_file(uploaded_file)
                     
                     if records:
-                        result = import_csv_to_database(records)
+                        result = import_csv_to_database(records, auto_categorize=auto_categorize)
                         
                         st.success(f"""
                         ✅ 임포트 완료!
@@ -1958,6 +1969,14 @@ if st.session_state.show_csv_upload and not st.session_state.show_category_modal
                         - 오류: {result['error']}개
                         - 전체: {result['total']}개
                         """)
+                        categorized = result['categorized']
+                        if categorized is not None:
+                            st.info(f"""
+                            🏷️ 카테고리 자동 분류: 기록 {categorized['filled']}개
+                            - 기록 기반 분류: 활동 {categorized['local']}개
+                            - AI 분류: 활동 {categorized['llm']}개 (AI 요청 {categorized['calls']}회)
+                            - 분류하지 못함 (원래 카테고리 유지): 활동 {categorized['fallback']}개
+                            """)
                         
                         # 잠시 후 메인 화면으로 돌아가기
                         import time
@@ -2242,7 +2261,14 @@ if st.session_state.show_category_modal and not st.session_state.editing_record_
                         if st.session_state.selected_record_date:
                             record_date = st.session_state.selected_record_date.isoformat()
                         
-                        add_record(activity_input, category, start_time_str, end_time_str, memo, record_date)
+                        try:
+                            saved = add_record(activity_input, category, start_time_str, end_time_str, memo, record_date)
+                        except DuplicateRecordError:
+                            st.warning("같은 날짜·시작 시간에 같은 활동 기록이 이미 있습니다. 기존 기록을 수정해주세요.")
+                            st.stop()
+                        if not saved:
+                            st.error("저장 실패: 기록을 저장하지 못했습니다. 잠시 후 다시 시도해주세요.")
+                            st.stop()
                         st.success("기록이 저장되었습니다! 🌱")
                         st.session_state.show_category_modal = False
                         st.session_state.show_records = True
@@ -2254,6 +2280,9 @@ if st.session_state.show_category_modal and not st.session_state.editing_record_
     
     st.markdown("</div></div>", unsafe_allow_html=True)
 
+# 조회 캐시 디버그 패널 (사이드바)
+render_cache_debug_panel()
+
 # 도움말 아이콘 (항상 표시)
 st.markdown("""
 <div class="help-icon" style="cursor: pointer;" onclick="alert('도움말: 오늘의 기록을 추가하고 관리할 수 있습니다.')">?</div>
@@ -0,0 +1,295 @@
+from collections import OrderedDict, defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
+
+# AI 조언 컨텍스트 설정
+ADVICE_CONTEXT_TOKEN_BUDGET = 2500   # 루틴 데이터 부분에 허용하는 최대 토큰 수 (추정치)
+RECENT_DAYS = 7                      # 원문 그대로 넣는 최근 일수
+RECENT_SHARE = 0.6                   # 최근 원문 기록이 차지할 수 있는 예산 비율
+AI_INTERVENTION_TAGS = ("[동적 루틴]", "[마이크로 루틴]")
+MIN_LINE_TOKENS = 16                 # 남은 예산이 이보다 적으면 더 이상 기록 줄을 추가하지 않음
+SECTION_HEADER_TOKENS = 80           # 섹션 제목/안내 문구용으로 미리 빼 두는 예산
+MINUTES_PER_DAY = 24 * 60
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (토크나이저 없이 보수적으로 계산)
+
+    ASCII는 4글자당 1토큰, 한글 등 그 밖의 문자는 1글자당 1토큰으로 계산
+    """
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+def _memo_of(row: Dict) -> str:
+    memo = row.get("메모")
+    if memo is None or memo != memo:  # None 또는 NaN
+        return ""
+    return str(memo).strip()
+
+@lru_cache(maxsize=4096)
+def _parse_range(time_range: str):
+    from database import time_columns
+
+    start_text, _, end_text = time_range.partition("-")
+    return time_columns(start_text, end_text)
+
+def _split_range(time_range: str):
+    """'HH:MM-HH:MM'을 (시작 분, 종료 분, 길이 분)으로 변환 (같은 시간대 문자열은 한 번만 해석)"""
+    return _parse_range(str(time_range))
+
+def _format_row(row: Dict) -> str:
+    memo = _memo_of(row)
+    line = f"  [{row['날짜']}] {row['시간(시작-종료)']} | {row['활동명']} | {row['카테고리']}"
+    return f"{line} | 메모: {memo}" if memo else line
+
+def _format_clock(minute: float) -> str:
+    minute = int(round(minute)) % MINUTES_PER_DAY
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+def _format_minutes(minutes: float) -> str:
+    minutes = int(round(minutes))
+    hours, rest = divmod(minutes, 60)
+    return f"{hours}시간 {rest}분" if hours else f"{rest}분"
+
+def _week_start(day: str) -> str:
+    parsed = date.fromisoformat(day)
+    return (parsed - timedelta(days=parsed.weekday())).isoformat()
+
+class _Budget:
+    """남은 토큰 예산을 추적하며 줄 단위로 추가"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+
+    def fits(self, lines: Iterable[str], limit: Optional[int] = None) -> bool:
+        cost = sum(estimate_tokens(line) + 1 for line in lines)
+        return self.used + cost <= (self.limit if limit is None else limit)
+
+    @property
+    def remaining(self) -> int:
+        return self.limit - self.used
+
+    def take(self, lines: List[str]) -> List[str]:
+        self.used += sum(estimate_tokens(line) + 1 for line in lines)
+        return lines
+
+class _Rollup:
+    """
+    행 목록을 한 번만 훑어 만든 날짜·카테고리별 집계 (DB의 daily_category_rollup과 같은 형태)
+
+    개요/주별 요약은 이 집계만 읽으므로 행 수가 아닌 날짜 수에 비례해 계산됨
+    """
+
+    def __init__(self, rows: List[Dict]):
+        self.by_date: Dict[str, List[Dict]] = defaultdict(list)
+        self.daily: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        self.memos: Dict[int, str] = {}
+        self.tagged: set = set()   # AI 개입 태그가 있는 행의 id
+        self.tag_counts = [0] * len(AI_INTERVENTION_TAGS)
+        self.sleep_rows: List[Dict] = []
+
+        for row in rows:
+            day = str(row["날짜"])
+            category = row["카테고리"]
+            self.by_date[day].append(row)
+            memo = _memo_of(row)
+            if memo:
+                self.memos[id(row)] = memo
+                if "[" in memo:
+                    for n, tag in enumerate(AI_INTERVENTION_TAGS):
+                        if tag in memo:
+                            self.tag_counts[n] += 1
+                            self.tagged.add(id(row))
+            totals = self.daily[day][category]
+            totals[0] += 1
+            totals[1] += _split_range(row["시간(시작-종료)"])[2] or 0
+            if category == "수면":
+                self.sleep_rows.append(row)
+        self.dates = sorted(self.by_date)
+
+    def memo(self, row: Dict) -> str:
+        return self.memos.get(id(row), "")
+
+    def category_counts(self, dates: Iterable[str]) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for day in dates:
+            for category, (count, _) in self.daily[day].items():
+                counts[category] += count
+        return counts
+
+def _overview_lines(rollup: _Rollup) -> List[str]:
+    dates = rollup.dates
+    lines = ["=== 사용자 루틴 데이터 요약 ===\n"]
+    lines.append(f"기록된 날짜: {len(dates)}일")
+    lines.append(f"기간: {dates[0]} ~ {dates[-1]}\n")
+
+    lines.append("카테고리별 활동 횟수:")
+    for category, count in sorted(rollup.category_counts(dates).items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"  - {category}: {count}회")
+    lines.append("")
+
+    tag_counts = rollup.tag_counts
+    if any(tag_counts):
+        lines.append(f"AI 개입 이력: 동적 루틴 {tag_counts[0]}회, 마이크로 루틴 {tag_counts[1]}회\n")
+    return lines
+
+def _sleep_lines(rollup: _Rollup) -> List[str]:
+    sleep_rows = rollup.sleep_rows
+    if not sleep_rows:
+        return []
+
+    # 자정에서 끊긴 기록(23:30-24:00, 00:00-07:00)처럼 이어지는 수면 기록은 한 번의 수면으로 합침
+    episodes: List[List[int]] = []
+    for row in sorted(sleep_rows, key=lambda row: (str(row["날짜"]), str(row["시간(시작-종료)"]))):
+        start, _, duration = _split_range(row["시간(시작-종료)"])
+        if duration is None:
+            continue
+        absolute_start = date.fromisoformat(str(row["날짜"])).toordinal() * MINUTES_PER_DAY + start
+        if episodes and episodes[-1][1] == absolute_start:
+            episodes[-1][1] += duration
+        else:
+            episodes.append([absolute_start, absolute_start + duration])
+
+    durations, bedtimes, waketimes = [], [], []
+    for start, end in episodes:
+        durations.append(end - start)
+        # 취침 시각은 자정 전후로 갈리므로 정오 이후를 음수로 바꿔 평균
+        bedtime = start % MINUTES_PER_DAY
+        bedtimes.append(bedtime - MINUTES_PER_DAY if bedtime >= MINUTES_PER_DAY // 2 else bedtime)
+        waketimes.append(end % MINUTES_PER_DAY)
+
+    lines = ["수면 패턴:"]
+    if durations:
+        lines.append(f"  - 수면 {len(durations)}회, 평균 {_format_minutes(sum(durations) / len(durations))} "
+                     f"(최소 {_format_minutes(min(durations))}, 최대 {_format_minutes(max(durations))})")
+        lines.append(f"  - 평균 취침 {_format_clock(sum(bedtimes) / len(bedtimes))}, "
+                     f"평균 기상 {_format_clock(sum(waketimes) / len(waketimes))}")
+    for row in sleep_rows[-3:]:
+        lines.append(f"  - {row['날짜']} {row['시간(시작-종료)']}: {rollup.memo(row)}")
+    lines.append("")
+    return lines
+
+def _weekly_lines(rollup: _Rollup, dates: List[str]) -> List[List[str]]:
+    """이전 기간을 주(월요일 시작) 단위 카테고리별 시간으로 요약 (최근 주부터, 날짜별 집계에서 계산)"""
+    weeks: Dict[str, Dict] = OrderedDict()
+    for day in dates:
+        week = weeks.setdefault(_week_start(day), {"dates": set(), "minutes": defaultdict(int)})
+        week["dates"].add(day)
+        for category, (_, minutes) in rollup.daily[day].items():
+            week["minutes"][category] += minutes
+
+    blocks = []
+    for week_start in sorted(weeks, reverse=True):
+        week = weeks[week_start]
+        parts = ", ".join(f"{category} {minutes}분" for category, minutes
+                          in sorted(week["minutes"].items(), key=lambda item: item[1], reverse=True))
+        blocks.append([f"  - {week_start} 주 ({len(week['dates'])}일 기록): {parts}"])
+    return blocks
+
+def scaled_budget(rows: List[Dict], token_budget: int = ADVICE_CONTEXT_TOKEN_BUDGET) -> int:
+    """
+    데이터 양에 맞춘 토큰 예산
+
+    기록 원문을 모두 나열해도 token_budget보다 작으면 그 크기(+섹션 안내 문구)로 줄여서,
+    기록이 적을 때 요약 섹션이 붙어 예전(전체 나열)보다 프롬프트가 커지지 않게 함
+    """
+    listing = 0
+    for row in rows:
+        listing += estimate_tokens(_format_row(row)) + 1
+        if listing + SECTION_HEADER_TOKENS >= token_budget:
+            return token_budget
+    return listing + SECTION_HEADER_TOKENS
+
+def build_advice_context(rows: List[Dict], token_budget: int = ADVICE_CONTEXT_TOKEN_BUDGET,
+                         recent_days: int = RECENT_DAYS) -> str:
+    """
+    토큰 예산 안에서 AI 조언용 루틴 데이터 문자열 생성
+
+    우선순위: 개요/수면 통계 → 최근 기록 원문(최근 날짜부터) → 이전 기간 주별 요약
+    → 이전 기간 메모(AI 개입 태그가 있는 메모 우선). 예산은 scaled_budget으로 데이터 양에 맞춰 줄임
+
+    Args:
+        rows: CSV 행 목록 (날짜, 시간(시작-종료), 활동명, 카테고리, 메모)
+        token_budget: 최대 토큰 수 (추정치)
+        recent_days: 원문 그대로 넣을 최근 일수
+
+    Returns:
+        str: 프롬프트에 넣을 데이터 문자열
+    """
+    if not rows:
+        return "기록된 루틴 데이터가 없습니다."
+
+    rollup = _Rollup(rows)
+    by_date, dates = rollup.by_date, rollup.dates
+
+    effective_budget = scaled_budget(rows, token_budget)
+    budget = _Budget(effective_budget - SECTION_HEADER_TOKENS)
+    overview = budget.take(_overview_lines(rollup))
+    sleep = budget.take(_sleep_lines(rollup))
+
+    # 최근 기록 원문: 최근 날짜부터 하루 단위로 추가 (가장 최근 하루는 줄 단위로라도 포함)
+    # 예산을 데이터 양에 맞춰 줄인 경우에는 요약보다 원문을 우선해 남은 예산을 모두 사용
+    if effective_budget < token_budget:
+        recent_limit = budget.limit
+    else:
+        recent_limit = budget.used + int(budget.remaining * RECENT_SHARE)
+    recent_dates: List[str] = []
+    recent_lines: List[str] = []
+    for day in reversed(dates[-recent_days:]):
+        day_lines = [_format_row(row) for row in by_date[day]]
+        if budget.fits(day_lines, recent_limit):
+            recent_lines = budget.take(day_lines) + recent_lines
+            recent_dates.insert(0, day)
+        elif not recent_dates:
+            for line in day_lines:
+                if not budget.fits([line], recent_limit):
+                    break
+                recent_lines.append(budget.take([line])[0])
+            recent_dates.insert(0, day)
+            break
+        else:
+            break
+
+    recent = set(recent_dates)
+    older_dates = [day for day in dates if day not in recent]
+    older_count = sum(len(by_date[day]) for day in older_dates)
+
+    weekly_lines: List[str] = []
+    for block in _weekly_lines(rollup, older_dates):
+        if not budget.fits(block):
+            break
+        weekly_lines = budget.take(block) + weekly_lines
+
+    # 이전 기간 메모: AI 개입 태그가 있는 메모 먼저, 각각 최근 기록부터 (예산이 차면 더 훑지 않음)
+    older_rows = [row for day in reversed(older_dates) for row in reversed(by_date[day])]
+    memo_rows = chain(
+        (row for row in older_rows if id(row) in rollup.tagged),
+        (row for row in older_rows if id(row) not in rollup.tagged and rollup.memo(row)),
+    )
+    memo_lines: List[str] = []
+    for row in memo_rows:
+        if budget.remaining < MIN_LINE_TOKENS:
+            break
+        line = _format_row(row)
+        if not budget.fits([line]):
+            continue
+        memo_lines.append(budget.take([line])[0])
+
+    lines = overview + sleep
+    if weekly_lines:
+        lines.append(f"이전 기간 주별 카테고리 시간 ({older_dates[0]} ~ {older_dates[-1]}):")
+        lines.extend(weekly_lines + [""])
+    if memo_lines:
+        lines.append("이전 기간 주요 메모 (AI 개입 기록 우선):")
+        lines.extend(memo_lines + [""])
+    if recent_lines:
+        title = "전체 활동 기록:" if not older_count else f"최근 {len(recent_dates)}일 활동 기록:"
+        lines.append(title)
+        lines.extend(recent_lines + [""])
+    omitted = len(rows) - len(recent_lines) - len(memo_lines)
+    if omitted > 0:
+        lines.append(f"(토큰 예산으로 기록 {omitted}건은 위 요약으로 대체됨)")
+    return "\n".join(lines)
@@ -0,0 +1,99 @@
+import threading
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from category_classifier import CATEGORIES
+from database import ANALYTICS_COLUMNS, get_analytics_rows, get_data_version
+from time_engine import fill_time_columns
+
+class AnalyticsSnapshot:
+    """
+    통계 화면용 기록 스냅샷 (데이터 버전당 한 번 만들어 모든 탭이 공유)
+
+    기록 전체를 한 번만 읽어 타입이 정해진 DataFrame(records)을 만들고, 탭들이 쓰는 집계를
+    미리 계산해 둠. 날짜 구간 조회(daily_category_between 등)는 이미 집계된 표를 자르기만 함
+    """
+
+    def __init__(self, records: pd.DataFrame, version: Optional[int] = None):
+        self.version = version
+        self.records = self._typed(records)
+        df = self.records
+
+        self.total_records = len(df)
+        self.total_minutes = float(df["duration_minutes"].sum())
+        self.avg_minutes = float(df["duration_minutes"].mean()) if len(df) else 0.0
+        self.unique_days = int(df["date"].nunique())
+
+        # 날짜·카테고리별 기록 수와 시간 (날짜별 통계, 주간 추이)
+        self.daily_category = (
+            df.groupby(["date", "category"], observed=True)["duration_minutes"]
+            .agg(count="size", total_minutes="sum")
+            .reset_index()
+            .sort_values("date", kind="stable")
+        )
+        self.daily_totals = (
+            self.daily_category.groupby("date")[["count", "total_minutes"]].sum().reset_index()
+        )
+
+        # 카테고리별 기록 수, 총/평균 시간 (정해진 카테고리 순서, 그 밖의 카테고리는 기록 수 순)
+        summary = (
+            df.groupby("category", observed=True)["duration_minutes"]
+            .agg(count="size", total_minutes="sum", avg_minutes="mean")
+            .reset_index()
+        )
+        summary["order"] = summary["category"].cat.codes.clip(upper=len(CATEGORIES))
+        self.category_summary = (
+            summary.sort_values(["order", "count"], ascending=[True, False], kind="stable")
+            .drop(columns="order")
+            .reset_index(drop=True)
+        )
+
+        # 시작 시각(시)별 기록 수 (시작 시각을 알 수 없는 기록은 제외)
+        self.hourly_counts = (
+            df["start_hour"].dropna().astype(int).value_counts().sort_index()
+            .rename_axis("start_hour").reset_index(name="count")
+        )
+
+    @staticmethod
+    def _typed(records: pd.DataFrame) -> pd.DataFrame:
+        df = fill_time_columns(records.copy())
+        df["duration_minutes"] = df["duration_minutes"].fillna(0)
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        extra = sorted(set(df["category"].dropna()) - set(CATEGORIES))
+        df["category"] = pd.Categorical(df["category"], categories=CATEGORIES + extra)
+        df["start_hour"] = np.floor_divide(df["start_minute"], 60)
+        return df
+
+    def daily_category_between(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """기간 안의 날짜·카테고리별 {date, category, count, total_minutes}"""
+        rows = self.daily_category
+        return rows[rows["date"].between(pd.Timestamp(start_date), pd.Timestamp(end_date))]
+
+    def daily_totals_between(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """기간 안의 날짜별 {date, count, total_minutes}"""
+        rows = self.daily_totals
+        return rows[rows["date"].between(pd.Timestamp(start_date), pd.Timestamp(end_date))]
+
+# 데이터 버전이 바뀔 때만 다시 만듦 (프로세스 전체가 공유)
+_snapshot: Optional[AnalyticsSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+def load_analytics_snapshot() -> AnalyticsSnapshot:
+    """기록 전체를 한 번의 쿼리로 읽어 스냅샷 생성"""
+    # 쿼리보다 먼저 버전을 읽어야 쓰기와 겹쳐도 오래된 결과가 새 버전으로 저장되지 않음
+    version = get_data_version()
+    records = pd.DataFrame.from_records(get_analytics_rows(), columns=list(ANALYTICS_COLUMNS))
+    return AnalyticsSnapshot(records, version)
+
+def get_analytics_snapshot() -> AnalyticsSnapshot:
+    """현재 데이터 버전의 통계 스냅샷 반환 (기록이 바뀌었으면 다시 생성)"""
+    global _snapshot
+    version = get_data_version()
+    if _snapshot is None or _snapshot.version != version:
+        with _snapshot_lock:
+            if _snapshot is None or _snapshot.version != version:
+                _snapshot = load_analytics_snapshot()
+    return _snapshot
@@ -0,0 +1,221 @@
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 분류 대상 카테고리 (기록 화면의 선택지와 동일)
+CATEGORIES = ["수면", "식사", "일과", "운동", "취미", "기타"]
+
+# 분류기 설정
+CONFIDENCE_THRESHOLD = 0.9   # 이 확신도 이상일 때만 LLM 없이 로컬 결과 사용
+NGRAM_SIZES = (1, 2, 3)      # 문자 n-gram 길이
+SMOOTHING = 0.5              # n-gram 빈도 가산 평활 값
+MIN_NGRAM_SAMPLES = 30       # 학습 기록이 이보다 적으면 n-gram 모델은 쓰지 않고 정확 일치만 사용
+MIN_ALTERNATIVE_RATIO = 0.01 # 대체 카테고리로 보일 n-gram 사후 확률 하한
+NGRAM_EVIDENCE_WEIGHT = 4.0  # 조각 수로 나눈 로그 우도에 곱하는 값 (겹치는 n-gram은 독립이 아니므로 유효 근거 수로 보정)
+MIN_NGRAM_MATCH_RATIO = 0.3  # 입력의 2글자 이상 조각 중 학습한 조각의 비율이 이보다 낮으면 판단하지 않음
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def normalize_activity(text: str) -> str:
+    """활동명 정규화 (유니코드 정규화, 소문자, 공백 제거)"""
+    text = unicodedata.normalize("NFKC", str(text or "")).lower()
+    return _WHITESPACE_PATTERN.sub("", text)
+
+def _ngrams(normalized: str) -> List[str]:
+    padded = f"^{normalized}$"
+    return [padded[i:i + n] for n in NGRAM_SIZES for i in range(len(padded) - n + 1)]
+
+class CategoryClassifier:
+    """
+    기록 이력으로 학습하는 로컬 카테고리 분류기
+
+    - 정확히 같은 활동명이 있으면 그 활동명에 가장 많이 쓰인 카테고리 (확신도 = 그 비율)
+    - 없으면 문자 n-gram 나이브 베이즈 (확신도 = 조각 수로 보정한 사후 확률, 학습한 조각과
+      충분히 겹칠 때만)
+    """
+
+    def __init__(self, categories: List[str] = CATEGORIES):
+        self.categories = list(categories)
+        self._exact: Dict[str, Counter] = {}
+        self._log_prior: Dict[str, float] = {}
+        self._log_likelihood: Dict[str, Dict[str, float]] = {}
+        self._log_unseen: Dict[str, float] = {}
+        self._vocabulary = set()
+        self.sample_count = 0
+
+    def fit(self, samples: Iterable[Tuple[str, str, int]]) -> "CategoryClassifier":
+        """
+        (활동명, 카테고리, 기록 수) 목록으로 학습 (분류 대상이 아닌 카테고리는 무시)
+        """
+        exact: Dict[str, Counter] = defaultdict(Counter)
+        ngram_counts: Dict[str, Counter] = {category: Counter() for category in self.categories}
+        class_counts: Counter = Counter()
+
+        for activity, category, count in samples:
+            normalized = normalize_activity(activity)
+            if not normalized or category not in ngram_counts or count <= 0:
+                continue
+            exact[normalized][category] += count
+            class_counts[category] += count
+            for gram in _ngrams(normalized):
+                ngram_counts[category][gram] += count
+
+        vocabulary = set()
+        for counts in ngram_counts.values():
+            vocabulary.update(counts)
+        vocabulary_size = max(len(vocabulary), 1)
+        total = sum(class_counts.values())
+
+        self._exact = dict(exact)
+        self._vocabulary = vocabulary
+        self.sample_count = total
+        self._log_prior = {}
+        self._log_likelihood = {}
+        self._log_unseen = {}
+        for category in self.categories:
+            if class_counts[category] == 0:
+                continue
+            denominator = sum(ngram_counts[category].values()) + SMOOTHING * vocabulary_size
+            self._log_prior[category] = math.log(class_counts[category] / total)
+            self._log_likelihood[category] = {
+                gram: math.log((count + SMOOTHING) / denominator)
+                for gram, count in ngram_counts[category].items()
+            }
+            self._log_unseen[category] = math.log(SMOOTHING / denominator)
+        return self
+
+    def predict(self, activity: str) -> Tuple[Optional[str], float, str]:
+        """
+        카테고리 예측
+
+        Returns:
+            Tuple[Optional[str], float, str]: (카테고리, 확신도 0~1, 근거 "exact"/"ngram"/"none")
+        """
+        normalized = normalize_activity(activity)
+        if not normalized or not self._log_prior:
+            return None, 0.0, "none"
+
+        counts = self._exact.get(normalized)
+        if counts:
+            category, count = counts.most_common(1)[0]
+            return category, count / sum(counts.values()), "exact"
+
+        posterior = self._posterior(normalized)
+        if not posterior:
+            return None, 0.0, "none"
+        best = max(posterior, key=posterior.get)
+        return best, posterior[best], "ngram"
+
+    def _posterior(self, normalized: str) -> Dict[str, float]:
+        """n-gram 나이브 베이즈 사후 확률 (근거가 없으면 빈 dict)"""
+        grams = _ngrams(normalized)
+        # 기록이 적거나 학습한 활동명과 겹치는 2글자 이상 조각이 적으면 근거가 약하므로 판단하지 않음
+        multi = [gram for gram in grams if len(gram) > 1]
+        matched = sum(1 for gram in multi if gram in self._vocabulary)
+        if self.sample_count < MIN_NGRAM_SAMPLES or not matched or matched < MIN_NGRAM_MATCH_RATIO * len(multi):
+            return {}
+
+        # 조각별 로그 우도를 그대로 더하면 겹치는 조각이 근거를 중복으로 세어 사후 확률이 0 또는 1로
+        # 쏠리므로, 조각 수로 나눠 NGRAM_EVIDENCE_WEIGHT개 분량의 근거로 보정
+        weight = NGRAM_EVIDENCE_WEIGHT / len(grams)
+        scores = {}
+        for category, log_prior in self._log_prior.items():
+            likelihood = self._log_likelihood[category]
+            unseen = self._log_unseen[category]
+            scores[category] = log_prior + weight * sum(likelihood.get(gram, unseen) for gram in grams)
+
+        # 로그 점수를 정규화한 사후 확률을 확신도로 사용
+        top = max(scores.values())
+        total = sum(math.exp(score - top) for score in scores.values())
+        return {category: math.exp(score - top) / total for category, score in scores.items()}
+
+    def alternatives(self, activity: str, exclude: str, limit: int = 2) -> List[Tuple[str, str, float]]:
+        """
+        exclude 다음으로 가능성이 높은 카테고리 목록
+
+        같은 활동명의 다른 카테고리 기록, n-gram 사후 확률(MIN_ALTERNATIVE_RATIO 이상), 전체 기록
+        비율 순으로 채움
+
+        Returns:
+            List[Tuple[str, str, float]]: (카테고리, 근거 "exact"/"ngram"/"prior", 비율 0~1)
+        """
+        normalized = normalize_activity(activity)
+        candidates: List[Tuple[str, str, float]] = []
+        counts = self._exact.get(normalized)
+        if counts:
+            total = sum(counts.values())
+            candidates += [(category, "exact", count / total) for category, count in counts.most_common()]
+        posterior = self._posterior(normalized) if normalized else {}
+        candidates += sorted(((category, "ngram", p) for category, p in posterior.items()
+                              if p >= MIN_ALTERNATIVE_RATIO), key=lambda item: -item[2])
+        candidates += sorted(((category, "prior", math.exp(log_prior)) for category, log_prior in self._log_prior.items()),
+                             key=lambda item: -item[2])
+
+        result, seen = [], {exclude}
+        for category, source, ratio in candidates:
+            if category not in seen:
+                seen.add(category)
+                result.append((category, source, ratio))
+                if len(result) == limit:
+                    break
+        return result
+
+# 학습된 분류기는 데이터 버전이 바뀔 때만 다시 학습
+_classifier: Optional[CategoryClassifier] = None
+_classifier_version: Optional[int] = None
+_classifier_lock = threading.Lock()
+
+# 로컬 분류 적중/LLM 위임 횟수 (프로세스 누적)
+_stats = {"local": 0, "llm": 0}
+_stats_lock = threading.Lock()
+
+def get_category_classifier() -> CategoryClassifier:
+    """기록 이력으로 학습한 분류기 반환 (기록이 바뀌었으면 다시 학습)"""
+    global _classifier, _classifier_version
+    from database import get_activity_category_counts, get_data_version
+
+    version = get_data_version()
+    if _classifier is None or _classifier_version != version:
+        with _classifier_lock:
+            if _classifier is None or _classifier_version != version:
+                _classifier = CategoryClassifier().fit(get_activity_category_counts())
+                _classifier_version = version
+    return _classifier
+
+def classify_activity(activity: str, threshold: float = CONFIDENCE_THRESHOLD) -> Optional[Dict]:
+    """
+    로컬 분류기로 카테고리 판단
+
+    Returns:
+        Optional[Dict]: 확신도가 threshold 이상이면 {"category", "confidence", "source", "alternatives"},
+        아니면 None (LLM에 위임해야 함). alternatives는 CategoryClassifier.alternatives 결과
+    """
+    try:
+        classifier = get_category_classifier()
+        category, confidence, source = classifier.predict(activity)
+    except Exception as e:
+        print(f"로컬 카테고리 분류 오류: {e}")
+        category, confidence, source = None, 0.0, "none"
+
+    local = category is not None and confidence >= threshold
+    with _stats_lock:
+        _stats["local" if local else "llm"] += 1
+    if not local:
+        return None
+    return {"category": category, "confidence": confidence, "source": source,
+            "alternatives": classifier.alternatives(activity, category)}
+
+def get_classifier_stats() -> Dict:
+    """로컬 분류 적중률 통계"""
+    with _stats_lock:
+        local, llm = _stats["local"], _stats["llm"]
+    total = local + llm
+    return {
+        "local": local,
+        "llm": llm,
+        "hit_rate": local / total if total else 0.0,
+        "trained_samples": _classifier.sample_count if _classifier is not None else 0,
+    }
@@ -1,53 +1,846 @@
 import sqlite3
+import base64
 import json
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 # 데이터베이스 파일 경로
 DB_FILE = "routine_database.db"
 
+# 연결 풀 설정
+POOL_MAX_IDLE = 8          # 풀에 보관할 유휴 연결 최대 개수
+
+# 저장소 PRAGMA 프로필
+# - journal_mode는 DB 파일에 기록되는 설정이라 init_database에서 한 번만 적용
+# - 나머지는 연결 단위 설정이라 연결을 만들 때마다 적용
+STORAGE_PROFILES = {
+    # SQLite 기본 동작 (롤백 저널, synchronous=FULL)
+    "legacy": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+    # 여러 세션이 동시에 읽고 쓰는 환경용: 쓰기 중에도 읽기가 막히지 않음
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -16000,        # 음수는 KiB 단위 (약 16MB)
+        "mmap_size": 134217728,      # 128MB
+        "temp_store": "MEMORY",
+    },
+}
+DEFAULT_STORAGE_PROFILE = "wal"
+
+_connection_pragmas: Dict[str, object] = {
+    key: value for key, value in STORAGE_PROFILES[DEFAULT_STORAGE_PROFILE].items()
+    if key != "journal_mode"
+}
+
+# 자연키: 같은 날짜에 같은 활동이 같은 시각에 시작하면 같은 기록으로 간주
+NATURAL_KEY_COLUMNS = ("date", "activity", "start_time")
+
+# 대량 입력 설정
+BULK_CHUNK_SIZE = 500      # 트랜잭션 하나에 넣을 기록 수
+
+# 통계 캐시 설정
+STATS_CACHE_SIZE = 64      # 보관할 (기간별) 통계 결과 최대 개수
+
+# 검색 설정
+SEARCH_LIMIT = 50          # 검색 결과 기본 개수
+TRIGRAM_MIN_LENGTH = 3     # trigram 토크나이저가 색인으로 찾을 수 있는 최소 글자 수
+
+# 조회 설정
+PAGE_SIZE = 50             # 페이지 조회 기본 크기
+ITER_BATCH_SIZE = 500      # 스트리밍 조회 시 한 번에 읽을 기록 수
+
+MINUTES_PER_DAY = 24 * 60
+
+# 통계 화면 스냅샷에 필요한 컬럼 (get_analytics_rows의 튜플 순서)
+ANALYTICS_COLUMNS = ("date", "category", "start_time", "end_time", "start_minute", "end_minute", "duration_minutes")
+
+def time_to_minutes(value: str) -> Optional[int]:
+    """
+    "HH:MM" 문자열을 자정 기준 분(0~1440)으로 변환
+    
+    "24:00"은 하루의 끝(1440)으로 취급하며, 형식이 잘못되면 None 반환
+    """
+    try:
+        hour_text, minute_text = str(value).strip().split(":")
+        hour, minute = int(hour_text), int(minute_text)
+    except (ValueError, AttributeError):
+        return None
+    if hour == 24 and minute == 0:
+        return MINUTES_PER_DAY
+    if 0 <= hour < 24 and 0 <= minute < 60:
+        return hour * 60 + minute
+    return None
+
+def duration_between(start_minute: Optional[int], end_minute: Optional[int]) -> Optional[int]:
+    """시작/종료 분 사이의 길이 (종료가 시작보다 이르면 자정을 넘긴 것으로 계산)"""
+    if start_minute is None or end_minute is None:
+        return None
+    if end_minute < start_minute:
+        end_minute += MINUTES_PER_DAY
+    return end_minute - start_minute
+
+def time_columns(start_time: str, end_time: str) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """저장용 (start_minute, end_minute, duration_minutes) 계산"""
+    start_minute = time_to_minutes(start_time)
+    end_minute = time_to_minutes(end_time)
+    return start_minute, end_minute, duration_between(start_minute, end_minute)
+
+def _duration_of_times(start_time: str, end_time: str) -> Optional[int]:
+    return time_columns(start_time, end_time)[2]
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+def search_grams(activity: Optional[str], memo: Optional[str]) -> str:
+    """
+    활동명/메모를 짧은 검색어 색인용 토큰 문자열로 변환
+    
+    단어마다 한 글자와 연속된 두 글자를 모두 토큰으로 만듦 ("아침운동" → "아 침 운 동 아침 침운 운동"),
+    2글자 이하 검색어는 이 토큰과 정확히 일치하면 부분 문자열로 포함된 것
+    """
+    grams = []
+    for word in _WORD_PATTERN.findall(f"{activity or ''} {memo or ''}".lower()):
+        grams.extend(word)
+        grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return " ".join(grams)
+
 def get_db_connection():
-    """데이터베이스 연결 생성"""
+    """데이터베이스 연결 생성 (연결 단위 PRAGMA 설정 포함)"""
     conn = sqlite3.connect(DB_FILE, check_same_thread=False)
     conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
+    for name, value in _connection_pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    # SQL 안에서 시간 문자열을 분 단위로 변환할 수 있도록 함수 등록
+    conn.create_function("time_to_minutes", 1, time_to_minutes, deterministic=True)
+    conn.create_function("duration_minutes", 2, _duration_of_times, deterministic=True)
+    # 짧은 검색어 색인(records_fts_bigram) 트리거가 쓰는 1~2글자 토큰 생성 함수
+    conn.create_function("search_grams", 2, search_grams, deterministic=True)
     return conn
 
-def init_database():
-    """데이터베이스 초기화 및 테이블 생성"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+class ConnectionPool:
+    """
+    SQLite 연결 풀
+
+    - 같은 스레드 안에서 중첩 호출되면 이미 빌려 간 연결을 그대로 재사용
+    - 사용이 끝난 연결은 닫지 않고 유휴 목록에 반납하여 다음 호출에서 재사용
+    - PRAGMA 설정은 연결을 새로 만들 때 한 번만 수행
+    """
+
+    def __init__(self, db_file: str, max_idle: int = POOL_MAX_IDLE):
+        self.db_file = db_file
+        self.max_idle = max_idle
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return get_db_connection()
+
+    def _release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        """연결을 빌려 주는 컨텍스트 매니저 (정상 종료 시 커밋, 예외 시 롤백)"""
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            # 같은 스레드의 중첩 호출: 바깥 트랜잭션에 합류
+            yield held
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def close_all(self):
+        """유휴 연결을 모두 닫음"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_connection_pool() -> ConnectionPool:
+    """현재 DB_FILE에 대한 연결 풀 반환 (없으면 생성)"""
+    pool = _pools.get(DB_FILE)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(DB_FILE)
+            if pool is None:
+                pool = ConnectionPool(DB_FILE)
+                _pools[DB_FILE] = pool
+    return pool
+
+def db_connection():
+    """
+    풀에서 연결을 빌려 사용하는 컨텍스트 매니저
+
+    사용 예:
+        with db_connection() as conn:
+            conn.execute(...)
+    """
+    return get_connection_pool().connection()
+
+def close_all_connections():
+    """모든 연결 풀의 유휴 연결 종료"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+# 데이터 버전: records가 바뀔 때마다 트리거가 DB 안의 카운터를 증가시키며 캐시 키로 사용
+# (DB에 저장되므로 모든 세션, 모듈 재실행, 다른 프로세스에서도 같은 값을 봄)
+def get_data_version() -> int:
+    """현재 데이터 버전 반환"""
+    try:
+        with db_connection() as conn:
+            row = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+        return row[0] if row else 0
+    except Exception as e:
+        print(f"데이터 버전 조회 오류: {e}")
+        return 0
+
+def _bump_data_version(cursor):
+    """records 밖의 변경(집계 재계산 등)으로 캐시를 무효화해야 할 때 버전 증가"""
+    cursor.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+
+# 기록 ID 생성기 (ULID 형식: 48비트 밀리초 타임스탬프 + 80비트 난수, Crockford Base32)
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ULID_RANDOM_MAX = (1 << 80) - 1
+_id_lock = threading.Lock()
+_last_id_ms = -1
+_last_id_random = 0
+
+def _encode_base32(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        chars.append(_ULID_ALPHABET[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
+
+def generate_record_id(prefix: str = "record") -> str:
+    """
+    시간순 정렬이 가능한 고유 기록 ID 생성
+
+    테이블을 조회하지 않으며, 같은 밀리초 안에서 여러 번 호출되면
+    난수부를 1씩 증가시켜 프로세스 내 단조 증가를 보장함
+
+    Args:
+        prefix: ID 접두사 (기본값: "record")
+
+    Returns:
+        str: "{prefix}_{ULID 26자}" 형식의 ID
+    """
+    global _last_id_ms, _last_id_random
+    with _id_lock:
+        now_ms = int(time.time() * 1000)
+        if now_ms <= _last_id_ms:
+            # 같은 밀리초(또는 시계 역행): 직전 값에서 증가
+            now_ms = _last_id_ms
+            random_part = _last_id_random + 1
+            if random_part > _ULID_RANDOM_MAX:
+                now_ms += 1
+                random_part = secrets.randbits(79)
+        else:
+            # 상위 1비트를 비워 두어 같은 밀리초 내 증가 여유 확보
+            random_part = secrets.randbits(79)
+        _last_id_ms = now_ms
+        _last_id_random = random_part
+    return f"{prefix}_{_encode_base32(now_ms, 10)}{_encode_base32(random_part, 16)}"
+
+def resolve_storage_profile(profile=None) -> Dict[str, object]:
+    """
+    저장소 프로필 이름 또는 PRAGMA 딕셔너리를 실제 PRAGMA 설정으로 변환
+    
+    Args:
+        profile: STORAGE_PROFILES의 키, PRAGMA 딕셔너리, 또는 None(기본 프로필)
+    
+    Returns:
+        Dict[str, object]: PRAGMA 이름과 값
+    """
+    if profile is None:
+        profile = os.environ.get("ROUTINE_DB_PROFILE", DEFAULT_STORAGE_PROFILE)
+    if isinstance(profile, str):
+        if profile not in STORAGE_PROFILES:
+            raise ValueError(f"알 수 없는 저장소 프로필입니다: {profile} (사용 가능: {', '.join(STORAGE_PROFILES)})")
+        return dict(STORAGE_PROFILES[profile])
+    return dict(profile)
+
+def apply_storage_profile(profile=None) -> Dict[str, object]:
+    """
+    저장소 프로필 적용
+    
+    연결 단위 PRAGMA를 교체하고 풀의 기존 연결을 닫아 새 설정으로 다시 열리게 한 뒤,
+    journal_mode를 DB 파일에 적용함
+    
+    Args:
+        profile: 프로필 이름 또는 PRAGMA 딕셔너리 (None이면 기본 프로필)
+    
+    Returns:
+        Dict[str, object]: 적용된 PRAGMA 설정 (journal_mode는 실제 적용 결과)
+    """
+    global _connection_pragmas
+    pragmas = resolve_storage_profile(profile)
+    journal_mode = pragmas.pop("journal_mode", None)
+    
+    _connection_pragmas = pragmas
+    close_all_connections()
+    
+    applied = dict(pragmas)
+    if journal_mode:
+        with db_connection() as conn:
+            applied["journal_mode"] = conn.execute(f"PRAGMA journal_mode = {journal_mode}").fetchone()[0]
+    return applied
+
+def init_database(profile=None):
+    """
+    데이터베이스 초기화 및 테이블 생성
+    
+    Args:
+        profile: 저장소 프로필 이름("wal", "legacy") 또는 PRAGMA 딕셔너리
+                 (None이면 ROUTINE_DB_PROFILE 환경 변수, 없으면 "wal")
+    """
+    apply_storage_profile(profile)
     
-    # 기록 테이블 생성
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        
+        # 기록 테이블 생성
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                id TEXT PRIMARY KEY,
+                activity TEXT NOT NULL,
+                category TEXT NOT NULL,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                memo TEXT,
+                date TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                start_minute INTEGER,
+                end_minute INTEGER,
+                duration_minutes INTEGER
+            )
+        """)
+        
+        _migrate_time_columns(cursor)
+        _create_data_version(cursor)
+        
+        # 인덱스 생성 (검색 성능 향상)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_date ON records(date)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_category ON records(category)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_timestamp ON records(timestamp)
+        """)
+        
+        # 키셋 페이지네이션용 (timestamp, id) 복합 인덱스
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_timestamp_id ON records(timestamp, id)
+        """)
+        
+        # 분 단위 정수 컬럼 인덱스 (카테고리별 시간 합계, 시간대별 분포)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_category_duration ON records(category, duration_minutes)
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_start_minute ON records(start_minute)
+        """)
+        
+        _create_natural_key_index(cursor)
+        _create_daily_rollup(cursor)
+        _create_feedback_totals(cursor)
+        _create_search_index(cursor)
+        _create_short_term_index(cursor)
+        
+        # 기존 데이터 정리/보정이 있었을 수 있으므로 캐시 무효화
+        _bump_data_version(cursor)
+
+def _create_data_version(cursor):
+    """데이터 버전 카운터 테이블과 records 변경 시 증가시키는 트리거 생성"""
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS records (
-            id TEXT PRIMARY KEY,
-            activity TEXT NOT NULL,
-            category TEXT NOT NULL,
-            start_time TEXT NOT NULL,
-            end_time TEXT NOT NULL,
-            memo TEXT,
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+    
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_data_version_{event.lower()} AFTER {event} ON records
+            BEGIN
+                UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+        """)
+
+def _create_daily_rollup(cursor):
+    """
+    날짜·카테고리별 기록 수와 총 시간(분)을 담는 집계 테이블과 유지용 트리거 생성
+    
+    records에 INSERT/UPDATE/DELETE가 일어나면 트리거가 해당 (date, category) 행만 갱신하므로
+    통계/캘린더 조회가 기록 수가 아닌 날짜 수에 비례하게 됨
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_category_rollup'")
+    is_new = cursor.fetchone() is None
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_category_rollup (
             date TEXT NOT NULL,
-            timestamp TEXT NOT NULL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            category TEXT NOT NULL,
+            record_count INTEGER NOT NULL DEFAULT 0,
+            total_minutes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (date, category)
+        ) WITHOUT ROWID
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_insert AFTER INSERT ON records
+        BEGIN
+            INSERT INTO daily_category_rollup (date, category, record_count, total_minutes)
+            VALUES (NEW.date, NEW.category, 1, COALESCE(NEW.duration_minutes, 0))
+            ON CONFLICT(date, category) DO UPDATE SET
+                record_count = record_count + 1,
+                total_minutes = total_minutes + excluded.total_minutes;
+        END
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_delete AFTER DELETE ON records
+        BEGIN
+            UPDATE daily_category_rollup SET
+                record_count = record_count - 1,
+                total_minutes = total_minutes - COALESCE(OLD.duration_minutes, 0)
+            WHERE date = OLD.date AND category = OLD.category;
+            DELETE FROM daily_category_rollup
+            WHERE date = OLD.date AND category = OLD.category AND record_count <= 0;
+        END
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_update AFTER UPDATE OF date, category, duration_minutes ON records
+        BEGIN
+            UPDATE daily_category_rollup SET
+                record_count = record_count - 1,
+                total_minutes = total_minutes - COALESCE(OLD.duration_minutes, 0)
+            WHERE date = OLD.date AND category = OLD.category;
+            DELETE FROM daily_category_rollup
+            WHERE date = OLD.date AND category = OLD.category AND record_count <= 0;
+            INSERT INTO daily_category_rollup (date, category, record_count, total_minutes)
+            VALUES (NEW.date, NEW.category, 1, COALESCE(NEW.duration_minutes, 0))
+            ON CONFLICT(date, category) DO UPDATE SET
+                record_count = record_count + 1,
+                total_minutes = total_minutes + excluded.total_minutes;
+        END
+    """)
+    
+    if is_new:
+        _rebuild_daily_rollup(cursor)
+
+def _rebuild_daily_rollup(cursor):
+    cursor.execute("DELETE FROM daily_category_rollup")
+    cursor.execute("""
+        INSERT INTO daily_category_rollup (date, category, record_count, total_minutes)
+        SELECT date, category, COUNT(*), COALESCE(SUM(duration_minutes), 0)
+        FROM records
+        GROUP BY date, category
+    """)
+
+def _create_feedback_totals(cursor):
+    """
+    피드백 요약용 누적 집계 테이블과 유지용 트리거 생성
+    
+    - record_totals: 전체 기록 수와 기록된 날짜 수 (한 행)
+    - category_totals: 카테고리별 기록 수와 총 시간(분)
+    - hourly_totals: 시작 시각(시)별 기록 수
+    
+    날짜 수는 daily_category_rollup에 날짜의 첫 행이 생기거나 마지막 행이 지워질 때만 바뀌므로
+    집계 테이블의 트리거에서 갱신함. 피드백 요약은 기록 수와 관계없이 이 작은 테이블들만 읽음
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'record_totals'")
+    is_new = cursor.fetchone() is None
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS record_totals (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            record_count INTEGER NOT NULL DEFAULT 0,
+            date_count INTEGER NOT NULL DEFAULT 0
         )
     """)
+    cursor.execute("INSERT OR IGNORE INTO record_totals (id, record_count, date_count) VALUES (1, 0, 0)")
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS category_totals (
+            category TEXT PRIMARY KEY,
+            record_count INTEGER NOT NULL DEFAULT 0,
+            total_minutes INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS hourly_totals (
+            hour INTEGER PRIMARY KEY,
+            record_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    
+    add_statements = """
+            UPDATE record_totals SET record_count = record_count + 1 WHERE id = 1;
+            INSERT INTO category_totals (category, record_count, total_minutes)
+            VALUES (NEW.category, 1, COALESCE(NEW.duration_minutes, 0))
+            ON CONFLICT(category) DO UPDATE SET
+                record_count = record_count + 1,
+                total_minutes = total_minutes + excluded.total_minutes;
+            INSERT INTO hourly_totals (hour, record_count)
+            SELECT NEW.start_minute / 60, 1 WHERE NEW.start_minute IS NOT NULL
+            ON CONFLICT(hour) DO UPDATE SET record_count = record_count + 1;
+    """
+    remove_statements = """
+            UPDATE record_totals SET record_count = record_count - 1 WHERE id = 1;
+            UPDATE category_totals SET
+                record_count = record_count - 1,
+                total_minutes = total_minutes - COALESCE(OLD.duration_minutes, 0)
+            WHERE category = OLD.category;
+            DELETE FROM category_totals WHERE category = OLD.category AND record_count <= 0;
+            UPDATE hourly_totals SET record_count = record_count - 1
+            WHERE OLD.start_minute IS NOT NULL AND hour = OLD.start_minute / 60;
+            DELETE FROM hourly_totals WHERE record_count <= 0;
+    """
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_totals_insert AFTER INSERT ON records
+        BEGIN
+            {add_statements}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_totals_delete AFTER DELETE ON records
+        BEGIN
+            {remove_statements}
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_totals_update AFTER UPDATE OF category, duration_minutes, start_minute ON records
+        BEGIN
+            {remove_statements}
+            {add_statements}
+        END
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_date_count_insert AFTER INSERT ON daily_category_rollup
+        WHEN NOT EXISTS (
+            SELECT 1 FROM daily_category_rollup WHERE date = NEW.date AND category != NEW.category
+        )
+        BEGIN
+            UPDATE record_totals SET date_count = date_count + 1 WHERE id = 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_date_count_delete AFTER DELETE ON daily_category_rollup
+        WHEN NOT EXISTS (SELECT 1 FROM daily_category_rollup WHERE date = OLD.date)
+        BEGIN
+            UPDATE record_totals SET date_count = date_count - 1 WHERE id = 1;
+        END
+    """)
+    
+    if is_new:
+        _rebuild_feedback_totals(cursor)
+
+def _rebuild_feedback_totals(cursor):
+    cursor.execute("""
+        UPDATE record_totals SET
+            record_count = (SELECT COUNT(*) FROM records),
+            date_count = (SELECT COUNT(DISTINCT date) FROM records)
+        WHERE id = 1
+    """)
+    cursor.execute("DELETE FROM category_totals")
+    cursor.execute("""
+        INSERT INTO category_totals (category, record_count, total_minutes)
+        SELECT category, COUNT(*), COALESCE(SUM(duration_minutes), 0)
+        FROM records
+        GROUP BY category
+    """)
+    cursor.execute("DELETE FROM hourly_totals")
+    cursor.execute("""
+        INSERT INTO hourly_totals (hour, record_count)
+        SELECT start_minute / 60, COUNT(*)
+        FROM records
+        WHERE start_minute IS NOT NULL
+        GROUP BY start_minute / 60
+    """)
+
+def rebuild_daily_rollup() -> bool:
+    """집계 테이블들을 records 기준으로 다시 계산 (트리거 밖에서 데이터를 고친 경우 사용)"""
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            _rebuild_daily_rollup(cursor)
+            _rebuild_feedback_totals(cursor)
+            _bump_data_version(cursor)
+        return True
+    except Exception as e:
+        print(f"집계 테이블 재계산 오류: {e}")
+        return False
+
+def _create_search_index(cursor):
+    """
+    활동명/메모 전문 검색용 FTS5 색인과 동기화 트리거 생성
+    
+    한국어는 어절에 조사가 붙어 단어 단위 토크나이저로는 "숙면"으로 "숙면도"를 찾을 수 없으므로
+    부분 문자열 검색이 되는 trigram 토크나이저를 우선 사용하고, 지원하지 않는 SQLite에서는
+    unicode61 토크나이저로 대체함. FTS5 자체가 없으면 색인 없이 LIKE 검색만 사용
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'records_fts'")
+    if cursor.fetchone():
+        return
+    
+    for tokenizer in ("trigram", "unicode61"):
+        try:
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE records_fts USING fts5(
+                    activity, memo,
+                    content='records', content_rowid='rowid',
+                    tokenize='{tokenizer}'
+                )
+            """)
+            break
+        except sqlite3.OperationalError:
+            continue
+    else:
+        print("FTS5를 사용할 수 없어 전문 검색 색인 없이 동작합니다.")
+        return
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_fts_insert AFTER INSERT ON records
+        BEGIN
+            INSERT INTO records_fts (rowid, activity, memo) VALUES (NEW.rowid, NEW.activity, NEW.memo);
+        END
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_fts_delete AFTER DELETE ON records
+        BEGIN
+            INSERT INTO records_fts (records_fts, rowid, activity, memo)
+            VALUES ('delete', OLD.rowid, OLD.activity, OLD.memo);
+        END
+    """)
+    
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_fts_update AFTER UPDATE OF activity, memo ON records
+        BEGIN
+            INSERT INTO records_fts (records_fts, rowid, activity, memo)
+            VALUES ('delete', OLD.rowid, OLD.activity, OLD.memo);
+            INSERT INTO records_fts (rowid, activity, memo) VALUES (NEW.rowid, NEW.activity, NEW.memo);
+        END
+    """)
+    
+    cursor.execute("INSERT INTO records_fts (records_fts) VALUES ('rebuild')")
+
+def _create_short_term_index(cursor):
+    """
+    2글자 이하 검색어용 FTS5 색인(records_fts_bigram)과 동기화 트리거 생성
+    
+    trigram 토크나이저는 3글자 미만 검색어를 색인으로 찾지 못하는데, "운동", "수면", "독서"처럼
+    2글자 단어가 가장 흔한 검색어이므로 search_grams로 만든 1~2글자 토큰을 별도 색인에 저장함
+    (원문은 records에 있으므로 내용 없는 contentless 테이블)
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'records_fts_bigram'")
+    if cursor.fetchone():
+        return
+    
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE records_fts_bigram USING fts5(
+                grams, content='', tokenize='unicode61'
+            )
+        """)
+    except sqlite3.OperationalError:
+        return
     
-    # 인덱스 생성 (검색 성능 향상)
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_date ON records(date)
+        CREATE TRIGGER IF NOT EXISTS trg_fts_bigram_insert AFTER INSERT ON records
+        BEGIN
+            INSERT INTO records_fts_bigram (rowid, grams) VALUES (NEW.rowid, search_grams(NEW.activity, NEW.memo));
+        END
     """)
     
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_category ON records(category)
+        CREATE TRIGGER IF NOT EXISTS trg_fts_bigram_delete AFTER DELETE ON records
+        BEGIN
+            INSERT INTO records_fts_bigram (records_fts_bigram, rowid, grams)
+            VALUES ('delete', OLD.rowid, search_grams(OLD.activity, OLD.memo));
+        END
     """)
     
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_timestamp ON records(timestamp)
+        CREATE TRIGGER IF NOT EXISTS trg_fts_bigram_update AFTER UPDATE OF activity, memo ON records
+        BEGIN
+            INSERT INTO records_fts_bigram (records_fts_bigram, rowid, grams)
+            VALUES ('delete', OLD.rowid, search_grams(OLD.activity, OLD.memo));
+            INSERT INTO records_fts_bigram (rowid, grams) VALUES (NEW.rowid, search_grams(NEW.activity, NEW.memo));
+        END
     """)
     
-    conn.commit()
-    conn.close()
+    _rebuild_short_term_index(cursor)
+
+def _rebuild_short_term_index(cursor):
+    cursor.execute("INSERT INTO records_fts_bigram (records_fts_bigram) VALUES ('delete-all')")
+    cursor.execute("""
+        INSERT INTO records_fts_bigram (rowid, grams)
+        SELECT rowid, search_grams(activity, memo) FROM records
+    """)
+
+def _has_table(cursor, name: str) -> bool:
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return cursor.fetchone() is not None
+
+def rebuild_search_index() -> bool:
+    """
+    전문 검색 색인을 records 기준으로 다시 생성
+    
+    두 색인 모두 records의 rowid를 키로 쓰는데, records는 TEXT 기본 키라 rowid가 VACUUM에서
+    다시 매겨질 수 있으므로 VACUUM 뒤에는 반드시 다시 생성해야 함 (vacuum_database가 처리)
+    """
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            if _has_table(cursor, "records_fts"):
+                cursor.execute("INSERT INTO records_fts (records_fts) VALUES ('rebuild')")
+            if _has_table(cursor, "records_fts_bigram"):
+                _rebuild_short_term_index(cursor)
+        return True
+    except Exception as e:
+        print(f"검색 색인 재생성 오류: {e}")
+        return False
+
+def vacuum_database() -> bool:
+    """VACUUM으로 DB 파일을 정리하고, rowid가 바뀌었을 수 있으므로 검색 색인을 다시 생성"""
+    try:
+        with db_connection() as conn:
+            conn.execute("VACUUM")
+    except Exception as e:
+        print(f"VACUUM 오류: {e}")
+        return False
+    return rebuild_search_index()
+
+def _migrate_time_columns(cursor):
+    """기존 DB에 분 단위 컬럼을 추가하고 비어 있는 값 채우기"""
+    cursor.execute("PRAGMA table_info(records)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    for column in ("start_minute", "end_minute", "duration_minutes"):
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE records ADD COLUMN {column} INTEGER")
+    
+    cursor.execute("""
+        UPDATE records SET
+            start_minute = time_to_minutes(start_time),
+            end_minute = time_to_minutes(end_time),
+            duration_minutes = duration_minutes(start_time, end_time)
+        WHERE start_minute IS NULL OR end_minute IS NULL
+    """)
+
+def _create_natural_key_index(cursor):
+    """
+    자연키 고유 인덱스 생성
+    
+    기존 DB에 같은 자연키의 기록이 여러 개 있으면 가장 먼저 저장된 기록만 records에 남기고,
+    나머지는 삭제하지 않고 records_quarantine 테이블로 옮겨 보관함 (end_time/memo가 달라도
+    사용자가 get_quarantined_records로 확인하고 복구할 수 있음)
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_natural_key'")
+    if cursor.fetchone():
+        return
+    
+    key_columns = ", ".join(NATURAL_KEY_COLUMNS)
+    cursor.execute(f"""
+        SELECT rowid FROM records
+        WHERE rowid NOT IN (SELECT MIN(rowid) FROM records GROUP BY {key_columns})
+    """)
+    conflicting = [row[0] for row in cursor.fetchall()]
+    if conflicting:
+        cursor.execute("CREATE TABLE IF NOT EXISTS records_quarantine AS SELECT * FROM records WHERE 0")
+        cursor.execute("PRAGMA table_info(records_quarantine)")
+        if "quarantined_at" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE records_quarantine ADD COLUMN quarantined_at TEXT")
+        
+        cursor.execute("PRAGMA table_info(records)")
+        columns = ", ".join(row[1] for row in cursor.fetchall())
+        quarantined_at = datetime.now().isoformat()
+        for chunk in _chunked(conflicting, BULK_CHUNK_SIZE):
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"""
+                INSERT INTO records_quarantine ({columns}, quarantined_at)
+                SELECT {columns}, ? FROM records WHERE rowid IN ({placeholders})
+            """, [quarantined_at, *chunk])
+            cursor.execute(f"DELETE FROM records WHERE rowid IN ({placeholders})", chunk)
+        print(f"자연키가 겹치는 기록 {len(conflicting)}개를 records_quarantine 테이블로 옮겼습니다.")
+    
+    cursor.execute(f"CREATE UNIQUE INDEX idx_natural_key ON records({key_columns})")
+
+def get_quarantined_records() -> List[Dict]:
+    """
+    자연키 고유 인덱스를 만들 때 records_quarantine으로 옮긴 기록 조회
+    
+    Returns:
+        List[Dict]: 보관된 기록 목록 (없으면 빈 리스트)
+    """
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'records_quarantine'")
+            if not cursor.fetchone():
+                return []
+            cursor.execute("SELECT * FROM records_quarantine ORDER BY date, start_time")
+            return [dict(row) for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"보관된 기록 조회 오류: {e}")
+        return []
+
+class DuplicateRecordError(Exception):
+    """같은 자연키(날짜, 활동명, 시작시간)의 기록이 이미 있어 추가하지 못함"""
+
+def _is_natural_key_conflict(error: sqlite3.IntegrityError) -> bool:
+    """IntegrityError가 자연키 고유 인덱스 충돌인지 여부"""
+    columns = ", ".join(f"records.{column}" for column in NATURAL_KEY_COLUMNS)
+    return str(error) == f"UNIQUE constraint failed: {columns}"
 
 def add_record(activity: str, category: str, start_time: str, end_time: str, memo: str = "", record_date: str = None) -> bool:
     """
@@ -62,50 +855,289 @@ def add_record(activity: str, category: str, start_time: str, end_time: str, mem
         record_date: 기록 날짜 (YYYY-MM-DD 형식, 선택 - 기본값: 오늘)
     
     Returns:
-        bool: 성공 여부
+        bool: 성공 여부 (DB 잠김, 잘못된 값 등 자연키 충돌이 아닌 오류는 False)
+    
+    Raises:
+        DuplicateRecordError: 같은 날짜·활동·시작 시간의 기록이 이미 있음 (기존 기록은 덮어쓰지 않음)
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        record_id = f"record_{datetime.now().timestamp()}_{len(get_all_records())}"
-        if record_date is None:
-            date = datetime.now().date().isoformat()
-        else:
-            date = record_date
-        timestamp = datetime.now().isoformat()
-        
-        cursor.execute("""
-            INSERT INTO records (id, activity, category, start_time, end_time, memo, date, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (record_id, activity, category, start_time, end_time, memo, date, timestamp))
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            
+            record_id = generate_record_id()
+            if record_date is None:
+                date = datetime.now().date().isoformat()
+            else:
+                date = record_date
+            timestamp = datetime.now().isoformat()
+            start_minute, end_minute, duration = time_columns(start_time, end_time)
+            
+            cursor.execute("""
+                INSERT INTO records (id, activity, category, start_time, end_time, memo, date, timestamp,
+                                     start_minute, end_minute, duration_minutes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (record_id, activity, category, start_time, end_time, memo, date, timestamp,
+                  start_minute, end_minute, duration))
         
-        conn.commit()
-        conn.close()
         return True
+    except sqlite3.IntegrityError as e:
+        if _is_natural_key_conflict(e):
+            # 자연키 고유 인덱스 충돌: 기존 기록은 그대로 둠 (수정은 update_record로)
+            raise DuplicateRecordError(f"{date} {start_time} '{activity}' 기록이 이미 있습니다.") from e
+        print(f"기록 추가 오류: {e}")
+        return False
     except Exception as e:
         print(f"기록 추가 오류: {e}")
         return False
 
-def get_all_records() -> List[Dict]:
-    """모든 기록 조회"""
+_RECORD_COLUMNS = ("id", "activity", "category", "start_time", "end_time", "memo", "date", "timestamp",
+                   "start_minute", "end_minute", "duration_minutes")
+
+def _chunked(items: Iterable, size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def filter_new_records(records: List[Dict]) -> List[Dict]:
+    """
+    자연키(날짜, 활동명, 시작시간)가 DB에 없고 목록 안에서도 처음 나오는 기록만 반환
+    
+    add_records_bulk가 중복으로 건너뛸 기록을 미리 골라내어, 저장되지 않을 기록에 카테고리
+    분류처럼 비용이 드는 처리를 하지 않도록 함 (조회 오류 시 전체 목록을 그대로 반환)
+    
+    Args:
+        records: 기록 딕셔너리 목록 (date, activity, start_time 포함)
+    
+    Returns:
+        List[Dict]: 새로 저장될 기록 목록 (입력 순서 유지)
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        seen = set()
+        dates = sorted({record.get("date") for record in records if record.get("date")})
+        key_columns = ", ".join(NATURAL_KEY_COLUMNS)
+        with db_connection() as conn:
+            for chunk in _chunked(dates, BULK_CHUNK_SIZE):
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT {key_columns} FROM records WHERE date IN ({placeholders})", chunk
+                ).fetchall()
+                seen.update(tuple(row) for row in rows)
         
-        cursor.execute("""
-            SELECT * FROM records
-            ORDER BY timestamp DESC
-        """)
+        new_records = []
+        for record in records:
+            key = tuple(record.get(column) for column in NATURAL_KEY_COLUMNS)
+            if key not in seen:
+                seen.add(key)
+                new_records.append(record)
+        return new_records
+    except Exception as e:
+        print(f"새 기록 확인 오류: {e}")
+        return list(records)
+
+def add_records_bulk(records: Iterable[Dict], chunk_size: int = BULK_CHUNK_SIZE) -> Dict[str, int]:
+    """
+    여러 기록을 묶음 단위 트랜잭션으로 한 번에 추가
+    
+    중복 판정은 자연키 고유 인덱스(날짜, 활동명, 시작시간)에서 ON CONFLICT로 처리되므로
+    행마다 인덱스 조회 한 번으로 끝남. 각 묶음은 savepoint로 감싸므로 바깥 db_connection()
+    안에서 호출해도 실패한 묶음만 되돌리고 호출한 쪽의 작업과 앞선 묶음은 그대로 둠
+    
+    Args:
+        records: 기록 딕셔너리 목록 (activity, category, start_time, end_time, date 필수,
+                 memo, id, timestamp 선택)
+        chunk_size: 트랜잭션 하나에 넣을 기록 수
+    
+    Returns:
+        Dict[str, int]: success, duplicate, error, total 개수
+    """
+    result = {"success": 0, "duplicate": 0, "error": 0, "total": 0}
+    insert_sql = f"""
+        INSERT INTO records ({', '.join(_RECORD_COLUMNS)})
+        VALUES ({', '.join('?' for _ in _RECORD_COLUMNS)})
+        ON CONFLICT({', '.join(NATURAL_KEY_COLUMNS)}) DO NOTHING
+    """
+    
+    for chunk in _chunked(records, chunk_size):
+        result["total"] += len(chunk)
         
-        rows = cursor.fetchall()
-        conn.close()
+        # 필수 값 검증 및 행 변환
+        rows = []
+        for record in chunk:
+            try:
+                now = datetime.now()
+                rows.append((
+                    record.get("id") or generate_record_id(),
+                    record["activity"],
+                    record["category"],
+                    record["start_time"],
+                    record["end_time"],
+                    record.get("memo") or "",
+                    record.get("date") or now.date().isoformat(),
+                    record.get("timestamp") or now.isoformat(),
+                    *time_columns(record["start_time"], record["end_time"]),
+                ))
+            except (KeyError, TypeError, AttributeError) as e:
+                print(f"대량 기록 변환 오류: {e}")
+                result["error"] += 1
+        
+        if not rows:
+            continue
+        
+        counts = {"success": 0, "duplicate": 0, "error": 0}
+        try:
+            with db_connection() as conn:
+                cursor = conn.cursor()
+                # 같은 스레드의 바깥 db_connection() 트랜잭션에 합류해 있을 수 있으므로
+                # 연결 전체가 아닌 이 묶음의 savepoint까지만 되돌림
+                cursor.execute("SAVEPOINT bulk_chunk")
+                try:
+                    try:
+                        cursor.executemany(insert_sql, rows)
+                        counts["success"] = cursor.rowcount
+                        counts["duplicate"] = len(rows) - cursor.rowcount
+                    except sqlite3.IntegrityError:
+                        # 중복 ID 등이 섞인 묶음은 행 단위로 다시 시도하여 오류 행만 제외
+                        cursor.execute("ROLLBACK TO bulk_chunk")
+                        for values in rows:
+                            try:
+                                cursor.execute(insert_sql, values)
+                                counts["success" if cursor.rowcount else "duplicate"] += 1
+                            except sqlite3.IntegrityError:
+                                counts["error"] += 1
+                except Exception:
+                    cursor.execute("ROLLBACK TO bulk_chunk")
+                    cursor.execute("RELEASE bulk_chunk")
+                    raise
+                cursor.execute("RELEASE bulk_chunk")
+        except Exception as e:
+            print(f"대량 기록 추가 오류: {e}")
+            counts = {"success": 0, "duplicate": 0, "error": len(rows)}
+        for key, count in counts.items():
+            result[key] += count
+    
+    return result
+
+def get_all_records() -> List[Dict]:
+    """모든 기록 조회"""
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM records
+                ORDER BY timestamp DESC, id DESC
+            """)
+            
+            rows = cursor.fetchall()
         
         return [dict(row) for row in rows]
     except Exception as e:
         print(f"기록 조회 오류: {e}")
         return []
 
+def _build_record_filters(filters: Optional[Dict]) -> Tuple[List[str], List]:
+    """
+    조회 필터를 WHERE 조건과 파라미터로 변환
+    
+    지원 키: date, start_date, end_date, category
+    """
+    conditions = []
+    params = []
+    if not filters:
+        return conditions, params
+    
+    if filters.get("date"):
+        conditions.append("date = ?")
+        params.append(filters["date"])
+    if filters.get("start_date"):
+        conditions.append("date >= ?")
+        params.append(filters["start_date"])
+    if filters.get("end_date"):
+        conditions.append("date <= ?")
+        params.append(filters["end_date"])
+    if filters.get("category"):
+        conditions.append("category = ?")
+        params.append(filters["category"])
+    return conditions, params
+
+def _encode_cursor(timestamp: str, record_id: str) -> str:
+    raw = json.dumps([timestamp, record_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        timestamp, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return timestamp, record_id
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"잘못된 페이지 커서입니다: {cursor}") from e
+
+def _fetch_records_after(filters: Optional[Dict], after: Optional[Tuple[str, str]], limit: int) -> List[Dict]:
+    """최신순(timestamp, id 내림차순)으로 after 키 다음의 기록 limit개 조회"""
+    conditions, params = _build_record_filters(filters)
+    if after is not None:
+        conditions.append("(timestamp, id) < (?, ?)")
+        params.extend(after)
+    where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    with db_connection() as conn:
+        rows = conn.execute(f"""
+            SELECT * FROM records{where_clause}
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ?
+        """, params + [limit]).fetchall()
+    return [dict(row) for row in rows]
+
+def get_records_page(cursor: Optional[str] = None, limit: int = PAGE_SIZE, filters: Optional[Dict] = None) -> Dict:
+    """
+    최신순 기록을 키셋 페이지네이션으로 조회
+    
+    Args:
+        cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+        limit: 페이지 크기
+        filters: 조회 필터 (date, start_date, end_date, category)
+    
+    Returns:
+        Dict: {"records": 기록 목록, "next_cursor": 다음 페이지 커서 또는 None}
+    """
+    try:
+        after = _decode_cursor(cursor) if cursor else None
+        records = _fetch_records_after(filters, after, limit)
+        next_cursor = None
+        if len(records) == limit:
+            last = records[-1]
+            next_cursor = _encode_cursor(last["timestamp"], last["id"])
+        return {"records": records, "next_cursor": next_cursor}
+    except Exception as e:
+        print(f"페이지 조회 오류: {e}")
+        return {"records": [], "next_cursor": None}
+
+def iter_records(filters: Optional[Dict] = None, batch_size: int = ITER_BATCH_SIZE) -> Iterator[Dict]:
+    """
+    최신순 기록을 batch_size개씩 나누어 읽는 제너레이터
+    
+    배치마다 짧게 연결을 빌리고 반납하므로, 순회 중에 읽기 트랜잭션을 붙잡지 않고
+    메모리에는 한 배치만 유지함
+    
+    Args:
+        filters: 조회 필터 (date, start_date, end_date, category)
+        batch_size: 한 번에 읽을 기록 수
+    
+    Yields:
+        Dict: 기록
+    """
+    after = None
+    while True:
+        batch = _fetch_records_after(filters, after, batch_size)
+        yield from batch
+        if len(batch) < batch_size:
+            return
+        after = (batch[-1]["timestamp"], batch[-1]["id"])
+
 def get_records_by_date(date: str) -> List[Dict]:
     """
     특정 날짜의 기록 조회
@@ -117,17 +1149,16 @@ def get_records_by_date(date: str) -> List[Dict]:
         List[Dict]: 해당 날짜의 기록 목록
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM records
-            WHERE date = ?
-            ORDER BY start_time ASC
-        """, (date,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM records
+                WHERE date = ?
+                ORDER BY start_time ASC
+            """, (date,))
+            
+            rows = cursor.fetchall()
         
         return [dict(row) for row in rows]
     except Exception as e:
@@ -145,17 +1176,16 @@ def get_records_by_category(category: str) -> List[Dict]:
         List[Dict]: 해당 카테고리의 기록 목록
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM records
-            WHERE category = ?
-            ORDER BY timestamp DESC
-        """, (category,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM records
+                WHERE category = ?
+                ORDER BY timestamp DESC
+            """, (category,))
+            
+            rows = cursor.fetchall()
         
         return [dict(row) for row in rows]
     except Exception as e:
@@ -174,17 +1204,16 @@ def get_records_by_date_range(start_date: str, end_date: str) -> List[Dict]:
         List[Dict]: 해당 기간의 기록 목록
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM records
-            WHERE date BETWEEN ? AND ?
-            ORDER BY date ASC, start_time ASC
-        """, (start_date, end_date))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM records
+                WHERE date BETWEEN ? AND ?
+                ORDER BY date ASC, start_time ASC
+            """, (start_date, end_date))
+            
+            rows = cursor.fetchall()
         
         return [dict(row) for row in rows]
     except Exception as e:
@@ -202,24 +1231,20 @@ def delete_record(record_id: str) -> bool:
         bool: 성공 여부
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 삭제 전에 기록이 존재하는지 확인
-        cursor.execute("SELECT id FROM records WHERE id = ?", (record_id,))
-        if not cursor.fetchone():
-            conn.close()
-            print(f"기록을 찾을 수 없습니다: {record_id}")
-            return False
-        
-        # 기록 삭제
-        cursor.execute("DELETE FROM records WHERE id = ?", (record_id,))
-        
-        # 삭제 확인
-        deleted_count = cursor.rowcount
-        
-        conn.commit()
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            
+            # 삭제 전에 기록이 존재하는지 확인
+            cursor.execute("SELECT id FROM records WHERE id = ?", (record_id,))
+            if not cursor.fetchone():
+                print(f"기록을 찾을 수 없습니다: {record_id}")
+                return False
+            
+            # 기록 삭제
+            cursor.execute("DELETE FROM records WHERE id = ?", (record_id,))
+            
+            # 삭제 확인
+            deleted_count = cursor.rowcount
         
         if deleted_count > 0:
             print(f"기록이 성공적으로 삭제되었습니다: {record_id}")
@@ -248,9 +1273,6 @@ def update_record(record_id: str, activity: str = None, category: str = None,
         bool: 성공 여부
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         updates = []
         values = []
         
@@ -273,21 +1295,61 @@ def update_record(record_id: str, activity: str = None, category: str = None,
         if not updates:
             return False
         
+        # 시간이 바뀌면 분 단위 컬럼도 새 값 기준으로 다시 계산
+        if start_time or end_time:
+            start_expr, start_params = ("?", [start_time]) if start_time else ("start_time", [])
+            end_expr, end_params = ("?", [end_time]) if end_time else ("end_time", [])
+            updates.append(f"start_minute = time_to_minutes({start_expr})")
+            values.extend(start_params)
+            updates.append(f"end_minute = time_to_minutes({end_expr})")
+            values.extend(end_params)
+            updates.append(f"duration_minutes = duration_minutes({start_expr}, {end_expr})")
+            values.extend(start_params + end_params)
+        
         values.append(record_id)
         query = f"UPDATE records SET {', '.join(updates)} WHERE id = ?"
         
-        cursor.execute(query, values)
-        conn.commit()
-        conn.close()
+        with db_connection() as conn:
+            conn.execute(query, values)
         return True
     except Exception as e:
         print(f"기록 수정 오류: {e}")
         return False
 
+_stats_cache: "OrderedDict[Tuple, Tuple[int, Dict]]" = OrderedDict()
+_stats_cache_lock = threading.Lock()
+_stats_cache_hits = 0
+_stats_cache_misses = 0
+
+def _copy_statistics(stats: Dict) -> Dict:
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in stats.items()}
+
+def get_statistics_cache_info() -> Dict[str, int]:
+    """통계 캐시 적중/미스 횟수와 현재 크기"""
+    version = get_data_version()
+    with _stats_cache_lock:
+        return {
+            "hits": _stats_cache_hits,
+            "misses": _stats_cache_misses,
+            "size": len(_stats_cache),
+            "data_version": version,
+        }
+
+def clear_statistics_cache():
+    """통계 캐시와 카운터 초기화"""
+    global _stats_cache_hits, _stats_cache_misses
+    with _stats_cache_lock:
+        _stats_cache.clear()
+        _stats_cache_hits = 0
+        _stats_cache_misses = 0
+
 def get_statistics(start_date: str = None, end_date: str = None) -> Dict:
     """
     통계 정보 조회
     
+    결과는 (기간, 데이터 버전)을 키로 캐시되며, 기록 추가/수정/삭제 시 트리거가 데이터 버전을
+    올리므로 자동으로 다시 계산됨
+    
     Args:
         start_date: 시작 날짜 (선택)
         end_date: 종료 날짜 (선택)
@@ -295,57 +1357,49 @@ def get_statistics(start_date: str = None, end_date: str = None) -> Dict:
     Returns:
         Dict: 통계 정보
     """
+    global _stats_cache_hits, _stats_cache_misses
+    key = (start_date, end_date)
+    # 쿼리보다 먼저 버전을 읽어야 쓰기와 겹쳐도 오래된 결과가 새 버전으로 저장되지 않음
+    version = get_data_version()
+    
+    with _stats_cache_lock:
+        cached = _stats_cache.get(key)
+        if cached is not None and cached[0] == version:
+            _stats_cache.move_to_end(key)
+            _stats_cache_hits += 1
+            return _copy_statistics(cached[1])
+        _stats_cache_misses += 1
+    
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 기본 쿼리
-        base_query = "SELECT * FROM records"
-        conditions = []
-        params = []
-        
-        if start_date and end_date:
-            conditions.append("date BETWEEN ? AND ?")
-            params.extend([start_date, end_date])
-        elif start_date:
-            conditions.append("date >= ?")
-            params.append(start_date)
-        elif end_date:
-            conditions.append("date <= ?")
-            params.append(end_date)
-        
+        conditions, params = _build_record_filters({"start_date": start_date, "end_date": end_date})
         where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
         
-        # 전체 기록 수
-        cursor.execute(f"SELECT COUNT(*) FROM records{where_clause}", params)
-        total_count = cursor.fetchone()[0]
-        
-        # 카테고리별 통계
-        cursor.execute(f"""
-            SELECT category, COUNT(*) as count
-            FROM records{where_clause}
-            GROUP BY category
-            ORDER BY count DESC
-        """, params)
+        # 날짜·카테고리 집계 테이블을 한 번만 읽어 모든 통계를 계산 (기록 수가 아닌 날짜 수에 비례)
+        with db_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT date, category, record_count, total_minutes
+                FROM daily_category_rollup{where_clause}
+            """, params).fetchall()
         
-        category_stats = {row[0]: row[1] for row in cursor.fetchall()}
+        total_count = 0
+        category_stats = {}
+        category_minutes = {}
+        date_counts = {}
+        for date, category, count, minutes in rows:
+            total_count += count
+            category_stats[category] = category_stats.get(category, 0) + count
+            category_minutes[category] = category_minutes.get(category, 0) + minutes
+            date_counts[date] = date_counts.get(date, 0) + count
         
-        # 날짜별 통계
-        cursor.execute(f"""
-            SELECT date, COUNT(*) as count
-            FROM records{where_clause}
-            GROUP BY date
-            ORDER BY date DESC
-            LIMIT 30
-        """, params)
+        # 카테고리는 기록 수 내림차순, 날짜는 최근 30일만 내림차순
+        category_stats = dict(sorted(category_stats.items(), key=lambda item: item[1], reverse=True))
+        category_minutes = {category: category_minutes[category] for category in category_stats}
+        date_stats = {date: date_counts[date] for date in sorted(date_counts, reverse=True)[:30]}
         
-        date_stats = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        conn.close()
-        
-        return {
+        result = {
             "total_records": total_count,
             "category_stats": category_stats,
+            "category_minutes": category_minutes,
             "date_stats": date_stats
         }
     except Exception as e:
@@ -353,8 +1407,284 @@ def get_statistics(start_date: str = None, end_date: str = None) -> Dict:
         return {
             "total_records": 0,
             "category_stats": {},
+            "category_minutes": {},
             "date_stats": {}
         }
+    
+    with _stats_cache_lock:
+        _stats_cache[key] = (version, result)
+        _stats_cache.move_to_end(key)
+        while len(_stats_cache) > STATS_CACHE_SIZE:
+            _stats_cache.popitem(last=False)
+    return _copy_statistics(result)
+
+def get_daily_category_rollup(start_date: str = None, end_date: str = None) -> List[Dict]:
+    """
+    날짜·카테고리별 기록 수와 총 시간(분) 조회
+    
+    Args:
+        start_date: 시작 날짜 (선택)
+        end_date: 종료 날짜 (선택)
+    
+    Returns:
+        List[Dict]: {"date", "category", "count", "total_minutes"} 목록 (날짜 오름차순)
+    """
+    try:
+        conditions, params = _build_record_filters({"start_date": start_date, "end_date": end_date})
+        where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        with db_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT date, category, record_count as count, total_minutes
+                FROM daily_category_rollup{where_clause}
+                ORDER BY date ASC, category ASC
+            """, params).fetchall()
+        
+        return [dict(row) for row in rows]
+    except Exception as e:
+        print(f"일별 집계 조회 오류: {e}")
+        return []
+
+def get_daily_counts(start_date: str, end_date: str) -> Dict[str, int]:
+    """
+    날짜별 기록 수 조회 (캘린더 표시용)
+    
+    Args:
+        start_date: 시작 날짜 (YYYY-MM-DD)
+        end_date: 종료 날짜 (YYYY-MM-DD)
+    
+    Returns:
+        Dict[str, int]: 날짜 → 기록 수
+    """
+    try:
+        with db_connection() as conn:
+            rows = conn.execute("""
+                SELECT date, SUM(record_count)
+                FROM daily_category_rollup
+                WHERE date BETWEEN ? AND ?
+                GROUP BY date
+            """, (start_date, end_date)).fetchall()
+        
+        return {row[0]: row[1] for row in rows}
+    except Exception as e:
+        print(f"날짜별 기록 수 조회 오류: {e}")
+        return {}
+
+def get_analytics_rows() -> List[Tuple]:
+    """
+    통계 화면용 전체 기록 조회 (ANALYTICS_COLUMNS 순서의 튜플, dict 변환 없이 한 번에 읽음)
+    """
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # sqlite3.Row 대신 튜플 그대로
+            cursor.execute(f"SELECT {', '.join(ANALYTICS_COLUMNS)} FROM records")
+            return cursor.fetchall()
+    except Exception as e:
+        print(f"통계용 기록 조회 오류: {e}")
+        return []
+
+def get_feedback_snapshot(today: str, recent_days: int = 7) -> Dict:
+    """
+    피드백 요약용 통계 스냅샷 (트리거로 유지되는 누적 집계만 읽으므로 전체 기록 수와 무관)
+    
+    Args:
+        today: 기준 날짜 (YYYY-MM-DD)
+        recent_days: 날짜별 기록 수를 가져올 최근 기간 (today 포함 이전 recent_days일부터)
+    
+    Returns:
+        Dict: {"total_records", "date_count", "first_date", "last_date",
+               "category_totals": {카테고리: {"count", "minutes"}}, "hourly_counts": {시: 기록 수},
+               "recent_counts": {날짜: 기록 수}, "today_records": [오늘 기록]}
+               (조회 오류 시 기록이 없는 것과 같은 빈 스냅샷)
+    """
+    try:
+        since = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=recent_days)).date().isoformat()
+        with db_connection() as conn:
+            record_count, date_count = conn.execute(
+                "SELECT record_count, date_count FROM record_totals WHERE id = 1"
+            ).fetchone()
+            # MIN/MAX를 한 쿼리에 함께 쓰면 인덱스 최적화가 적용되지 않으므로 하위 쿼리로 분리
+            first_date, last_date = conn.execute("""
+                SELECT (SELECT MIN(date) FROM daily_category_rollup),
+                       (SELECT MAX(date) FROM daily_category_rollup)
+            """).fetchone()
+            category_rows = conn.execute(
+                "SELECT category, record_count, total_minutes FROM category_totals"
+            ).fetchall()
+            hourly_rows = conn.execute("SELECT hour, record_count FROM hourly_totals").fetchall()
+        
+        return {
+            "total_records": record_count,
+            "date_count": date_count,
+            "first_date": first_date,
+            "last_date": last_date,
+            "category_totals": {row[0]: {"count": row[1], "minutes": row[2]} for row in category_rows},
+            "hourly_counts": {row[0]: row[1] for row in hourly_rows},
+            # 미래 날짜 기록도 기존처럼 최근 기간에 포함 (기준일 이후 전체)
+            "recent_counts": get_daily_counts(since, "9999-12-31"),
+            "today_records": get_records_by_date(today),
+        }
+    except Exception as e:
+        print(f"피드백 스냅샷 조회 오류: {e}")
+        return {
+            "total_records": 0,
+            "date_count": 0,
+            "first_date": None,
+            "last_date": None,
+            "category_totals": {},
+            "hourly_counts": {},
+            "recent_counts": {},
+            "today_records": [],
+        }
+
+def get_activity_category_counts() -> List[Tuple[str, str, int]]:
+    """
+    (활동명, 카테고리)별 기록 수 조회 (카테고리 분류기 학습용)
+    
+    Returns:
+        List[Tuple[str, str, int]]: (활동명, 카테고리, 기록 수) 목록
+    """
+    try:
+        with db_connection() as conn:
+            rows = conn.execute("""
+                SELECT activity, category, COUNT(*)
+                FROM records
+                GROUP BY activity, category
+            """).fetchall()
+        
+        return [(row[0], row[1], row[2]) for row in rows]
+    except Exception as e:
+        print(f"활동별 카테고리 조회 오류: {e}")
+        return []
+
+def get_frequent_activities(category: str, limit: int = 3) -> List[Dict]:
+    """
+    카테고리에서 자주 기록한 활동 조회 (카테고리 제안의 추천 루틴용)
+    
+    Args:
+        category: 카테고리명
+        limit: 최대 개수
+    
+    Returns:
+        List[Dict]: [{"activity", "count", "avg_minutes"}] (기록 수가 많은 순, avg_minutes는 시간이 없으면 None)
+    """
+    try:
+        with db_connection() as conn:
+            rows = conn.execute("""
+                SELECT activity, COUNT(*), AVG(duration_minutes)
+                FROM records
+                WHERE category = ?
+                GROUP BY activity
+                ORDER BY COUNT(*) DESC, MAX(timestamp) DESC
+                LIMIT ?
+            """, (category, limit)).fetchall()
+        
+        return [
+            {"activity": row[0], "count": row[1], "avg_minutes": round(row[2]) if row[2] is not None else None}
+            for row in rows
+        ]
+    except Exception as e:
+        print(f"자주 기록한 활동 조회 오류: {e}")
+        return []
+
+_SEARCH_TERM_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+def _parse_search_terms(query: str) -> List[str]:
+    """검색어를 단어 목록으로 분리 (큰따옴표로 묶은 구절은 하나의 단어로 취급)"""
+    return [quoted or plain for quoted, plain in _SEARCH_TERM_PATTERN.findall(query or "")]
+
+def _search_tokenizer(cursor) -> Optional[str]:
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'records_fts'")
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return "trigram" if "trigram" in row[0] else "unicode61"
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def search_records(query: str, date_range: Optional[Tuple[str, str]] = None,
+                   category: Optional[str] = None, limit: int = SEARCH_LIMIT) -> List[Dict]:
+    """
+    활동명과 메모에서 검색어를 찾아 관련도 순으로 반환
+    
+    모든 검색어를 포함하는 기록만 반환(AND). 큰따옴표로 묶은 구절은 한 단어로 취급하며
+    ("[동적 루틴]" 등), trigram 색인은 3글자 이상 검색어만 찾으므로 "운동"처럼 더 짧은
+    검색어는 1~2글자 토큰 색인(records_fts_bigram)으로 찾고 관련도 점수에 함께 반영함.
+    공백/기호가 섞인 짧은 검색어만 색인 없이 부분 문자열(LIKE)로 거름
+    
+    Args:
+        query: 검색어
+        date_range: (시작 날짜, 종료 날짜) (선택)
+        category: 카테고리 (선택)
+        limit: 최대 결과 수
+    
+    Returns:
+        List[Dict]: 기록 목록 (score: 낮을수록 관련도 높음)
+    """
+    terms = _parse_search_terms(query)
+    if not terms:
+        return []
+    
+    try:
+        filters = {"category": category}
+        if date_range:
+            filters["start_date"], filters["end_date"] = date_range
+        conditions, params = _build_record_filters(filters)
+        conditions = [f"r.{condition}" for condition in conditions]
+        
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            tokenizer = _search_tokenizer(cursor)
+            has_short_index = _has_table(cursor, "records_fts_bigram")
+            
+            if tokenizer == "trigram":
+                match_terms = [t for t in terms if len(t) >= TRIGRAM_MIN_LENGTH]
+            elif tokenizer == "unicode61":
+                match_terms = terms
+            else:
+                match_terms = []
+            # 단어 문자만으로 된 짧은 검색어는 1~2글자 토큰과 정확히 일치해야 부분 문자열임
+            short_terms = [t.lower() for t in terms if t not in match_terms
+                           and has_short_index and _WORD_PATTERN.fullmatch(t)]
+            like_terms = [t for t in terms if t not in match_terms and t.lower() not in short_terms]
+            
+            for term in like_terms:
+                conditions.append("(r.activity LIKE ? ESCAPE '\\' OR r.memo LIKE ? ESCAPE '\\')")
+                params.extend([_like_pattern(term), _like_pattern(term)])
+            
+            # 각 색인의 MATCH는 한 번씩만 실행해 (rowid, 점수)로 만든 뒤 기록과 조인
+            # (검색어는 구절로 인용하여 FTS 문법 문자([, : 등)를 그대로 검색)
+            indexes = []
+            if match_terms:
+                suffix = "*" if tokenizer == "unicode61" else ""
+                indexes.append(("records_fts", " ".join('"' + t.replace('"', '""') + '"' + suffix for t in match_terms)))
+            if short_terms:
+                indexes.append(("records_fts_bigram", " ".join(f'"{t}"' for t in short_terms)))
+            
+            ctes = [f"m{n} AS MATERIALIZED (SELECT rowid, bm25({table}) AS score FROM {table} WHERE {table} MATCH ?)"
+                    for n, (table, _) in enumerate(indexes)]
+            joins = "".join(f" JOIN m{n} ON m{n}.rowid = r.rowid" for n in range(len(indexes)))
+            score = " + ".join(f"m{n}.score" for n in range(len(indexes))) or "0.0"
+            where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+            sql = f"""
+                {"WITH " + ", ".join(ctes) if ctes else ""}
+                SELECT r.*, {score} AS score
+                FROM records r{joins}{where_clause}
+                ORDER BY score, r.timestamp DESC
+                LIMIT ?
+            """
+            match_params = [expr for _, expr in indexes]
+            params = match_params + params
+            
+            rows = conn.execute(sql, params + [limit]).fetchall()
+        
+        return [dict(row) for row in rows]
+    except Exception as e:
+        print(f"기록 검색 오류: {e}")
+        return []
 
 def migrate_from_json(json_file: str = "daily_records.json") -> int:
     """
@@ -363,6 +1693,9 @@ def migrate_from_json(json_file: str = "daily_records.json") -> int:
     Args:
         json_file: JSON 파일 경로
     
+    중복 판정은 자연키(날짜, 활동, 시작 시간) 고유 인덱스가 담당하므로, 이미 있는 기록과
+    종료 시간이나 메모만 다른 JSON 기록은 중복으로 보고 건너뜀 (기존 기록을 덮어쓰지 않음)
+    
     Returns:
         int: 마이그레이션된 기록 수
     """
@@ -374,8 +1707,7 @@ def migrate_from_json(json_file: str = "daily_records.json") -> int:
             data = json.load(f)
             records = data.get('records', [])
         
-        migrated_count = 0
-        for record in records:
+        def convert(record: Dict) -> Dict:
             # 기존 데이터 형식에 맞춰 변환
             activity = record.get('activity', '')
             category = record.get('category', '기타')
@@ -394,38 +1726,20 @@ def migrate_from_json(json_file: str = "daily_records.json") -> int:
             if 'end_time' in record:
                 end_time = record.get('end_time', end_time)
             
-            memo = record.get('memo', '')
-            date = record.get('date', datetime.now().date().isoformat())
-            
-            # 중복 체크 (같은 날짜, 같은 활동, 같은 시간)
-            existing = get_records_by_date(date)
-            is_duplicate = any(
-                r.get('activity') == activity and 
-                r.get('start_time') == start_time and
-                r.get('end_time') == end_time
-                for r in existing
-            )
-            
-            if not is_duplicate:
-                record_id = record.get('id', f"migrated_{datetime.now().timestamp()}_{migrated_count}")
-                timestamp = record.get('timestamp', datetime.now().isoformat())
-                
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                
-                try:
-                    cursor.execute("""
-                        INSERT INTO records (id, activity, category, start_time, end_time, memo, date, timestamp)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (record_id, activity, category, start_time, end_time, memo, date, timestamp))
-                    
-                    conn.commit()
-                    migrated_count += 1
-                except sqlite3.IntegrityError:
-                    # 중복 ID인 경우 스킵
-                    pass
-                finally:
-                    conn.close()
+            return {
+                'id': record.get('id') or generate_record_id("migrated"),
+                'activity': activity,
+                'category': category,
+                'start_time': start_time,
+                'end_time': end_time,
+                'memo': record.get('memo', ''),
+                'date': record.get('date', datetime.now().date().isoformat()),
+                'timestamp': record.get('timestamp', datetime.now().isoformat()),
+            }
+        
+        # 중복 체크는 자연키 고유 인덱스(같은 날짜, 같은 활동, 같은 시작 시간)가 담당 (종료 시간은 보지 않음)
+        result = add_records_bulk(convert(record) for record in records)
+        migrated_count = result["success"]
         
         return migrated_count
     except Exception as e:
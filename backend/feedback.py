@@ -0,0 +1,142 @@
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+# 실시간 피드백 갱신 설정
+FEEDBACK_DEBOUNCE_SECONDS = 10.0   # 데이터 버전이 이 시간 동안 바뀌지 않아야 다시 생성 (연속 편집을 한 번으로 묶음)
+FEEDBACK_POLL_SECONDS = 2.0        # 데이터 버전 확인 주기
+
+class FeedbackRefresher:
+    """
+    실시간 피드백 백그라운드 갱신기
+
+    - 작업 스레드가 데이터 버전을 주기적으로 확인하고, 버전이 바뀐 뒤 디바운스 시간 동안
+      더 이상 바뀌지 않으면 피드백을 한 번만 다시 생성
+    - 최초 피드백은 대기 없이 바로 생성
+    - 화면은 snapshot()으로 마지막 결과를 즉시 읽고, 생성 중이면 "갱신 중" 상태를 표시
+    """
+
+    def __init__(self, generate: Callable[[], Dict], version_source: Callable[[], int],
+                 debounce_seconds: float = FEEDBACK_DEBOUNCE_SECONDS,
+                 poll_seconds: float = FEEDBACK_POLL_SECONDS):
+        self.generate = generate
+        self.version_source = version_source
+        self.debounce_seconds = debounce_seconds
+        self.poll_seconds = poll_seconds
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._feedback: Optional[Dict] = None
+        self._error: Optional[str] = None
+        self._updated_at: Optional[str] = None
+        self._refreshing = False
+        self._force = False
+        self._observed_version: Optional[int] = None
+        self._generated_version: Optional[int] = None
+        self._pending_since: Optional[float] = None
+
+    def start(self):
+        """작업 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="feedback-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """작업 스레드 종료"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def request_refresh(self, force: bool = True):
+        """
+        갱신 요청
+
+        Args:
+            force: True이면 데이터 버전/디바운스와 관계없이 바로 다시 생성
+        """
+        with self._lock:
+            self._force = self._force or force
+        self.start()
+        self._wake.set()
+
+    def snapshot(self) -> Dict:
+        """
+        마지막으로 생성된 피드백과 갱신 상태 반환 (생성을 기다리지 않음)
+
+        Returns:
+            dict: {"feedback", "refreshing", "stale", "generated_version", "updated_at", "error"}
+        """
+        self.start()
+        with self._lock:
+            # 생성에 실패해 피드백이 없어도 그 버전으로 시도했으면 stale이 아님 (다음 변경 때 재시도)
+            stale = (self._generated_version is None
+                     or self._force
+                     or self._observed_version != self._generated_version)
+            return {
+                "feedback": self._feedback,
+                "refreshing": self._refreshing,
+                "stale": stale,
+                "generated_version": self._generated_version,
+                "updated_at": self._updated_at,
+                "error": self._error,
+            }
+
+    def _run(self):
+        while not self._stop.is_set():
+            wait_seconds = self.poll_seconds
+            try:
+                wait_seconds = self._check()
+            except Exception as e:
+                print(f"피드백 갱신 확인 오류: {e}")
+            self._wake.wait(wait_seconds)
+            self._wake.clear()
+
+    def _check(self) -> float:
+        """데이터 버전을 확인해 필요하면 피드백을 생성하고, 다음 확인까지 기다릴 시간(초) 반환"""
+        version = self.version_source()
+        now = time.monotonic()
+
+        with self._lock:
+            if version != self._observed_version:
+                # 버전이 바뀔 때마다 디바운스 시작 시각을 다시 잡음
+                self._observed_version = version
+                self._pending_since = now
+
+            if not self._force and self._generated_version is not None:
+                if version == self._generated_version:
+                    return self.poll_seconds
+                remaining = self.debounce_seconds - (now - self._pending_since)
+                if remaining > 0:
+                    return min(self.poll_seconds, remaining)
+
+            self._force = False
+            self._refreshing = True
+
+        self._refresh(version)
+        return self.poll_seconds
+
+    def _refresh(self, version: int):
+        feedback = None
+        error = None
+        try:
+            feedback = self.generate()
+        except Exception as e:
+            print(f"피드백 생성 오류: {e}")
+            error = str(e)
+
+        with self._lock:
+            if feedback is not None:
+                self._feedback = feedback
+                self._updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._error = error
+            # 실패해도 같은 버전으로 반복 호출하지 않음 (다음 변경 또는 수동 새로고침 때 재시도)
+            self._generated_version = version
+            self._refreshing = False
@@ -0,0 +1,89 @@
+import json
+from typing import Any, List, Tuple
+
+class StreamingJSONParser:
+    """
+    스트리밍 응답용 점진적 JSON 파서
+
+    토큰 조각을 feed()로 넣으면, 최상위 객체의 필드 값이 완성되는 즉시
+    ("field", 키, 값) 이벤트를, 최상위 배열 필드의 원소가 완성되는 즉시
+    ("item", 키, 원소) 이벤트를 반환함.
+    첫 "{" 이전의 텍스트(코드 블록 표시 등)는 무시함.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []    # 열린 컨테이너 ("{" 또는 "[")
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._value_start = 0
+        self._item_start = 0
+        self._key = None
+        self._expect_key = False
+        self._done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        """조각을 추가하고 새로 완성된 (종류, 키, 값) 이벤트 목록 반환"""
+        self.buffer += chunk
+        events = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            if self._done:
+                break
+            c = buffer[i]
+            depth = len(self._stack)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if depth == 1:
+                        text = json.loads(buffer[self._string_start:i + 1])
+                        if self._expect_key:
+                            self._key = text
+                        else:
+                            events.append(("field", self._key, text))
+                continue
+
+            if depth == 0:
+                if c == "{":
+                    self._stack.append(c)
+                    self._expect_key = True
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c in "{[":
+                if depth == 1:
+                    self._value_start = i
+                elif depth == 2 and self._stack[1] == "[":
+                    self._item_start = i
+                self._stack.append(c)
+            elif c in "}]":
+                self._stack.pop()
+                depth = len(self._stack)
+                if depth == 0:
+                    self._done = True
+                elif depth == 1:
+                    events.append(("field", self._key, self._loads(buffer[self._value_start:i + 1])))
+                elif depth == 2 and self._stack[1] == "[":
+                    events.append(("item", self._key, self._loads(buffer[self._item_start:i + 1])))
+            elif depth == 1 and c == ":":
+                self._expect_key = False
+            elif depth == 1 and c == ",":
+                self._expect_key = True
+        self._pos = len(buffer)
+        return events
+
+    @staticmethod
+    def _loads(text: str) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+# 캐시 파일 경로 (프로젝트 루트)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+CACHE_FILE = os.environ.get("LLM_CACHE_FILE", os.path.join(project_root, "llm_cache.db"))
+
+# 캐시 설정
+DEFAULT_TTL_SECONDS = 24 * 60 * 60   # 기본 유효 기간 (1일)
+MAX_ENTRIES = 500                    # 최대 보관 응답 수 (초과 시 가장 오래 사용하지 않은 응답부터 삭제)
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def make_cache_key(model: str, system_prompt: str, user_message: str) -> str:
+    """(모델, 시스템 프롬프트 해시, 사용자 메시지 해시)로 캐시 키 생성"""
+    return _sha256(f"{model}\0{_sha256(system_prompt)}\0{_sha256(user_message)}")
+
+class ResponseCache:
+    """
+    LLM 응답 디스크 캐시 (SQLite)
+
+    - 응답마다 만료 시각(TTL)을 저장하고, 만료된 응답은 미스로 처리
+    - 최대 개수를 넘으면 마지막 사용 시각이 가장 오래된 응답부터 삭제 (LRU)
+    - 적중/미스 횟수를 DB에 누적 기록
+    """
+
+    def __init__(self, path: str = CACHE_FILE, max_entries: int = MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA busy_timeout = 5000")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_stats (
+                    event TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    def _count(self, event: str, amount: int = 1):
+        self._conn.execute("""
+            INSERT INTO cache_stats (event, count) VALUES (?, ?)
+            ON CONFLICT(event) DO UPDATE SET count = count + excluded.count
+        """, (event, amount))
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 반환 (없거나 만료되었으면 None)"""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT content, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._count("expired")
+                self._count("miss")
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?",
+                (now, key)
+            )
+            self._count("hit")
+            return row[0]
+
+    def set(self, key: str, model: str, content: str, ttl: float = DEFAULT_TTL_SECONDS):
+        """응답 저장 후 최대 개수를 넘는 오래된 응답 삭제"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO responses (key, model, content, created_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    content = excluded.content,
+                    created_at = excluded.created_at,
+                    expires_at = excluded.expires_at,
+                    last_access = excluded.last_access
+            """, (key, model, content, now, now + ttl, now))
+            evicted = self._conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,)).rowcount
+            if evicted > 0:
+                self._count("evicted", evicted)
+
+    def stats(self) -> Dict[str, float]:
+        """적중/미스/만료/삭제 횟수, 적중률, 현재 보관 수"""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT event, count FROM cache_stats").fetchall())
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        hits = counts.get("hit", 0)
+        misses = counts.get("miss", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "expired": counts.get("expired", 0),
+            "evicted": counts.get("evicted", 0),
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "entries": entries,
+        }
+
+    def clear(self):
+        """모든 응답과 통계 삭제"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM cache_stats")
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """프로세스 공용 응답 캐시 반환 (처음 호출 시 생성)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                # .env는 처음 사용할 때 로드되므로 경로도 이 시점의 환경 변수로 결정
+                _cache = ResponseCache(os.environ.get("LLM_CACHE_FILE", CACHE_FILE))
+    return _cache
@@ -1,17 +1,34 @@
 import os
+import sys
 import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from openai import OpenAI
-from dotenv import load_dotenv
+from typing import Dict, Iterator, List, Optional, Tuple
 
-# .env 파일 로드 (프로젝트 루트에서 찾기)
-# 현재 파일의 디렉토리에서 상위 디렉토리(프로젝트 루트)로 이동
 current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(current_dir)
-env_path = os.path.join(project_root, '.env')
 
-# .env 파일 로드 (프로젝트 루트 경로 명시)
-load_dotenv(dotenv_path=env_path)
+# 같은 폴더의 backend 모듈 import 경로 설정
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from llm_cache import get_response_cache, make_cache_key
+from openai_client import get_openai_client, load_env
+from advice_context import ADVICE_CONTEXT_TOKEN_BUDGET, build_advice_context, estimate_tokens
+from json_stream import StreamingJSONParser
+from category_classifier import (CATEGORIES, CONFIDENCE_THRESHOLD, CategoryClassifier, classify_activity,
+                                 get_category_classifier)
+from structured_output import parse_structured, response_format
+
+# 응답 캐시 유효 기간 (초)
+ADVICE_CACHE_TTL = 6 * 60 * 60          # AI 조언: 같은 질문 + 같은 데이터면 6시간 재사용
+FEEDBACK_CACHE_TTL = 60 * 60            # 실시간 피드백: 통계가 같으면 1시간 재사용
+CATEGORY_CACHE_TTL = 7 * 24 * 60 * 60   # 카테고리 제안: 같은 활동명이면 7일 재사용
+
+# 일괄 카테고리 분류 설정
+BATCH_CATEGORY_TOKEN_BUDGET = 1500   # 요청 1회에 넣는 활동 목록의 최대 토큰 수 (추정치)
+BATCH_CATEGORY_MAX_ITEMS = 100       # 요청 1회에 넣는 최대 활동 수
+BATCH_CATEGORY_CONCURRENCY = 4       # 동시에 보내는 최대 요청 수
 
 # 프롬프트 파일에서 읽어오기
 def load_ai_prompt():
@@ -63,39 +80,161 @@ def load_ai_prompt():
 5. description은 실행 가능한 구체적인 행동 지침
 6. timestamp는 ISO 8601 형식 또는 "YYYY-MM-DD HH:MM:SS" 형식"""
 
-# OpenAI 클라이언트 초기화
-def get_openai_client():
-    """OpenAI 클라이언트 생성 (.env 파일에서 API 키 읽기)"""
-    # .env 파일에서 API 키 읽기
-    api_key = os.getenv("OPENAI_API_KEY")
+def _response_cache_key(model: str, system_prompt: str, user_message: str,
+                        cache_ttl: Optional[float]) -> Optional[str]:
+    load_env()
+    enabled = cache_ttl and os.environ.get("LLM_CACHE_DISABLED") != "1"
+    return make_cache_key(model, system_prompt, user_message) if enabled else None
+
+def _lookup_cached_response(model: str, system_prompt: str, user_message: str,
+                            cache_ttl: Optional[float]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (캐시 키, 캐시된 응답) 반환
+    
+    cache_ttl이 없거나 LLM_CACHE_DISABLED=1이면 (부하 테스트 등) 캐시 키도 None
+    """
+    cache_key = _response_cache_key(model, system_prompt, user_message, cache_ttl)
+    if cache_key:
+        try:
+            return cache_key, get_response_cache().get(cache_key)
+        except Exception as e:
+            print(f"응답 캐시 조회 오류: {e}")
+    return cache_key, None
+
+def _store_cached_response(cache_key: Optional[str], model: str, response_content: str, cache_ttl: Optional[float]):
+    """JSON으로 파싱되는 응답만 캐시에 저장"""
+    if cache_key:
+        try:
+            json.loads(response_content)
+            get_response_cache().set(cache_key, model, response_content, cache_ttl)
+        except (json.JSONDecodeError, TypeError):
+            pass
+        except Exception as e:
+            print(f"응답 캐시 저장 오류: {e}")
+
+def _response_format_options(schema: Optional[str], keys: Optional[List[str]] = None) -> dict:
+    return {"response_format": response_format(schema, keys)} if schema else {}
+
+def create_chat_completion(model: str, system_prompt: str, user_message: str,
+                           temperature: float, max_tokens: int, cache_ttl: float = None,
+                           schema: Optional[str] = None) -> str:
+    """
+    채팅 완성 호출 후 응답 본문 반환
     
-    if not api_key:
-        # 환경 변수에서 직접 확인
-        api_key = os.environ.get("OPENAI_API_KEY")
+    cache_ttl이 주어지면 (모델, 시스템 프롬프트, 사용자 메시지)가 같은 요청은 디스크 캐시에서
+    바로 반환하며, JSON으로 파싱되는 응답만 캐시에 저장함
     
-    if not api_key:
-        # .env 파일 경로 확인
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(current_dir)
-        env_path = os.path.join(project_root, '.env')
-        
-        error_msg = "OPENAI_API_KEY가 설정되지 않았습니다.\n\n"
-        if os.path.exists(env_path):
-            error_msg += f"✅ .env 파일은 존재합니다: {env_path}\n"
-            error_msg += "⚠️ .env 파일에 다음 형식으로 OPENAI_API_KEY를 추가해주세요:\n"
-            error_msg += "   OPENAI_API_KEY=sk-your-api-key-here\n"
-        else:
-            error_msg += f"❌ .env 파일을 찾을 수 없습니다: {env_path}\n"
-            error_msg += "📝 프로젝트 루트에 .env 파일을 생성하고 다음 내용을 추가해주세요:\n"
-            error_msg += "   OPENAI_API_KEY=sk-your-api-key-here\n"
-        
-        error_msg += "\n💡 OpenAI API 키는 https://platform.openai.com/api-keys 에서 발급받을 수 있습니다."
-        raise ValueError(error_msg)
+    Args:
+        model: 모델명
+        system_prompt: 시스템 프롬프트
+        user_message: 사용자 메시지
+        temperature: 샘플링 온도
+        max_tokens: 최대 토큰 수
+        cache_ttl: 캐시 유효 기간 (초, None이면 캐시 사용 안 함)
+        schema: 응답 스키마 종류 (structured_output.SCHEMAS의 키, 주어지면 JSON 스키마로 출력 제한)
     
-    return OpenAI(api_key=api_key)
+    Returns:
+        str: 응답 본문
+    """
+    cache_key, cached = _lookup_cached_response(model, system_prompt, user_message, cache_ttl)
+    if cached is not None:
+        return cached
+    
+    openai_client = get_openai_client()
+    completion = openai_client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ],
+        temperature=temperature,
+        max_tokens=max_tokens,
+        **_response_format_options(schema)
+    )
+    response_content = completion.choices[0].message.content
+    _store_cached_response(cache_key, model, response_content, cache_ttl)
+    return response_content
 
-def load_routine_data_for_advice() -> str:
-    """routine_data_v2.csv 파일을 읽어서 조언에 사용할 데이터 문자열 반환"""
+def stream_chat_completion(model: str, system_prompt: str, user_message: str,
+                           temperature: float, max_tokens: int, cache_ttl: float = None,
+                           schema: Optional[str] = None) -> Iterator[str]:
+    """
+    채팅 완성을 스트리밍으로 호출하며 응답 조각을 도착하는 대로 반환
+    
+    캐시 규칙은 create_chat_completion과 같으며, 캐시 적중 시 전체 응답을 한 조각으로 반환함
+    
+    Yields:
+        str: 응답 본문 조각
+    """
+    cache_key, cached = _lookup_cached_response(model, system_prompt, user_message, cache_ttl)
+    if cached is not None:
+        yield cached
+        return
+    
+    openai_client = get_openai_client()
+    stream = openai_client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ],
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True,
+        **_response_format_options(schema)
+    )
+    parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            yield delta
+    _store_cached_response(cache_key, model, "".join(parts), cache_ttl)
+
+def parse_structured_response(schema: str, response_content: str, model: str, system_prompt: str,
+                              user_message: str, max_tokens: int, cache_ttl: float = None) -> Optional[dict]:
+    """
+    응답 본문을 스키마에 맞는 dict로 변환 (복구하지 못하면 None)
+    
+    코드 블록/잘린 응답 등은 로컬에서 정리하고, 빠지거나 잘못된 필드만 한 번 다시 요청함.
+    고친 결과는 같은 캐시 키에 다시 저장해 다음 캐시 적중 때 복구를 반복하지 않음
+    """
+    def rerequest(missing: List[str], valid_fields: dict) -> str:
+        follow_up = f"""{user_message}
+
+이전 응답 중 올바른 부분:
+{json.dumps(valid_fields, ensure_ascii=False)}
+
+이전 응답에 다음 필드가 없거나 형식이 잘못되었습니다: {", ".join(missing)}
+위 내용과 이어지도록 이 필드만 JSON으로 다시 작성해주세요."""
+        openai_client = get_openai_client()
+        completion = openai_client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": follow_up}
+            ],
+            temperature=0,
+            max_tokens=max_tokens,
+            **_response_format_options(schema, missing)
+        )
+        return completion.choices[0].message.content
+    
+    result, repaired = parse_structured(schema, response_content, rerequest)
+    if result is not None and repaired:
+        cache_key = _response_cache_key(model, system_prompt, user_message, cache_ttl)
+        _store_cached_response(cache_key, model, json.dumps(result, ensure_ascii=False), cache_ttl)
+    return result
+
+def load_routine_data_for_advice(token_budget: int = ADVICE_CONTEXT_TOKEN_BUDGET) -> str:
+    """
+    routine_data_v2.csv 파일을 읽어서 조언에 사용할 데이터 문자열 반환
+    
+    기록이 많아도 프롬프트가 token_budget을 넘지 않도록 최근 기록은 원문으로, 이전 기간은
+    주별 요약과 주요 메모로 압축함 (advice_context.build_advice_context 참고)
+    """
     try:
         csv_path = "routine_data_v2.csv"
         if not os.path.exists(csv_path):
@@ -104,48 +243,7 @@ def load_routine_data_for_advice() -> str:
         if os.path.exists(csv_path):
             import pandas as pd
             df = pd.read_csv(csv_path, encoding='utf-8')
-            
-            # 데이터 요약 정보 생성
-            summary_lines = []
-            summary_lines.append("=== 사용자 루틴 데이터 요약 ===\n")
-            
-            # 날짜별 통계
-            date_counts = df['날짜'].value_counts().sort_index()
-            summary_lines.append(f"기록된 날짜: {len(date_counts)}일")
-            summary_lines.append(f"기간: {df['날짜'].min()} ~ {df['날짜'].max()}\n")
-            
-            # 카테고리별 통계
-            category_stats = df['카테고리'].value_counts()
-            summary_lines.append("카테고리별 활동 횟수:")
-            for cat, count in category_stats.items():
-                summary_lines.append(f"  - {cat}: {count}회")
-            summary_lines.append("")
-            
-            # 전체 활동 데이터 (조언에 필요한 모든 정보)
-            summary_lines.append("전체 활동 기록:")
-            for idx, row in df.iterrows():
-                memo_text = str(row['메모']).strip() if pd.notna(row['메모']) else ""
-                if memo_text:
-                    summary_lines.append(f"  [{row['날짜']}] {row['시간(시작-종료)']} | {row['활동명']} | {row['카테고리']} | 메모: {memo_text}")
-                else:
-                    summary_lines.append(f"  [{row['날짜']}] {row['시간(시작-종료)']} | {row['활동명']} | {row['카테고리']}")
-            summary_lines.append("")
-            
-            # AI 개입 확인
-            dynamic_count = df['메모'].astype(str).str.contains('[동적 루틴]', na=False).sum()
-            micro_count = df['메모'].astype(str).str.contains('[마이크로 루틴]', na=False).sum()
-            if dynamic_count > 0 or micro_count > 0:
-                summary_lines.append(f"AI 개입 이력: 동적 루틴 {dynamic_count}회, 마이크로 루틴 {micro_count}회\n")
-            
-            # 수면 패턴 분석
-            sleep_records = df[df['카테고리'] == '수면']
-            if len(sleep_records) > 0:
-                summary_lines.append("수면 패턴:")
-                for idx, row in sleep_records.tail(3).iterrows():
-                    summary_lines.append(f"  - {row['날짜']} {row['시간(시작-종료)']}: {row['메모'] if pd.notna(row['메모']) else ''}")
-                summary_lines.append("")
-            
-            return "\n".join(summary_lines)
+            return build_advice_context(df.to_dict("records"), token_budget=token_budget)
         else:
             return "CSV 파일을 찾을 수 없습니다."
     except Exception as e:
@@ -155,7 +253,12 @@ def load_routine_data_for_advice() -> str:
         return "데이터를 불러올 수 없습니다."
 
 def load_database_records_for_feedback() -> str:
-    """데이터베이스의 기록을 읽어서 통계 기반 종합 피드백에 사용할 데이터 문자열 반환"""
+    """
+    데이터베이스의 기록을 읽어서 통계 기반 종합 피드백에 사용할 데이터 문자열 반환
+    
+    기록을 순회하지 않고 트리거로 유지되는 누적 집계 스냅샷(get_feedback_snapshot)만 읽으므로
+    전체 기록 수가 늘어나도 생성 비용이 일정함
+    """
     try:
         # database 모듈 import (경로 문제 해결)
         import sys
@@ -164,75 +267,44 @@ def load_database_records_for_feedback() -> str:
         if current_dir not in sys.path:
             sys.path.insert(0, current_dir)
         
-        from database import get_all_records, get_statistics
+        from database import get_feedback_snapshot
         from datetime import datetime, timedelta
         
-        all_records = get_all_records()
-        
-        if not all_records:
+        today = datetime.now().date()
+        today_str = today.isoformat()
+        snapshot = get_feedback_snapshot(today_str)
+        total_records = snapshot['total_records']
+        if total_records == 0 or not snapshot['date_count']:
             return "기록된 데이터가 없습니다."
         
+        recent_week_by_date = snapshot['recent_counts']
+        category_totals = snapshot['category_totals']
+        hourly_counts = snapshot['hourly_counts']
+        today_records = snapshot['today_records']
+        
         # 데이터 요약 정보 생성
         summary_lines = []
         summary_lines.append("=== 통계 기반 종합 분석 데이터 ===\n")
         
-        # 전체 통계 정보
-        stats = get_statistics()
         summary_lines.append("📊 전체 통계 요약:")
-        summary_lines.append(f"  - 총 기록 수: {stats['total_records']}개")
+        summary_lines.append(f"  - 총 기록 수: {total_records}개")
         
         # 날짜별 통계
-        dates = [r['date'] for r in all_records]
-        unique_dates = len(set(dates))
-        min_date = min(dates)
-        max_date = max(dates)
+        unique_dates = snapshot['date_count']
         summary_lines.append(f"  - 기록된 날짜: {unique_dates}일")
-        summary_lines.append(f"  - 기간: {min_date} ~ {max_date}")
+        summary_lines.append(f"  - 기간: {snapshot['first_date']} ~ {snapshot['last_date']}")
         
         # 최근 7일 기록 수
-        today = datetime.now().date()
-        week_ago = today - timedelta(days=7)
-        recent_week_records = [r for r in all_records if r['date'] >= week_ago.isoformat()]
-        summary_lines.append(f"  - 최근 7일 기록 수: {len(recent_week_records)}개")
+        recent_week_count = sum(recent_week_by_date.values())
+        summary_lines.append(f"  - 최근 7일 기록 수: {recent_week_count}개")
         summary_lines.append("")
         
-        # 카테고리별 상세 통계
-        category_counts = {}
-        category_times = {}
-        category_avg_times = {}
-        category_records_list = {}
-        
-        for record in all_records:
-            cat = record['category']
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-            
-            if cat not in category_records_list:
-                category_records_list[cat] = []
-            category_records_list[cat].append(record)
-            
-            # 시간 계산
-            try:
-                start = datetime.strptime(record['start_time'], "%H:%M")
-                end = datetime.strptime(record['end_time'], "%H:%M")
-                if end < start:
-                    end += timedelta(days=1)
-                duration = (end - start).total_seconds() / 3600  # 시간 단위
-                category_times[cat] = category_times.get(cat, 0) + duration
-            except:
-                pass
-        
-        # 카테고리별 평균 시간 계산
-        for cat in category_counts:
-            if category_counts[cat] > 0:
-                category_avg_times[cat] = category_times.get(cat, 0) / category_counts[cat]
-        
         summary_lines.append("📈 카테고리별 상세 통계:")
-        for cat in sorted(category_counts.items(), key=lambda x: x[1], reverse=True):
-            cat_name = cat[0]
-            count = cat[1]
-            total_hours = category_times.get(cat_name, 0)
-            avg_hours = category_avg_times.get(cat_name, 0)
-            percentage = (count / stats['total_records'] * 100) if stats['total_records'] > 0 else 0
+        for cat_name, totals in sorted(category_totals.items(), key=lambda x: x[1]['count'], reverse=True):
+            count = totals['count']
+            total_hours = totals['minutes'] / 60  # 시간 단위
+            avg_hours = total_hours / count if count > 0 else 0
+            percentage = count / total_records * 100
             summary_lines.append(f"  - {cat_name}:")
             summary_lines.append(f"    * 기록 수: {count}회 ({percentage:.1f}%)")
             summary_lines.append(f"    * 총 시간: {total_hours:.1f}시간")
@@ -240,20 +312,11 @@ def load_database_records_for_feedback() -> str:
         summary_lines.append("")
         
         # 시간대별 활동 패턴 분석
-        hourly_counts = {}
-        for record in all_records:
-            try:
-                hour = int(record['start_time'].split(':')[0])
-                hourly_counts[hour] = hourly_counts.get(hour, 0) + 1
-            except:
-                pass
-        
         if hourly_counts:
             summary_lines.append("⏰ 시간대별 활동 패턴:")
             # 가장 활발한 시간대
-            most_active_hour = max(hourly_counts.items(), key=lambda x: x[1])[0] if hourly_counts else None
-            if most_active_hour is not None:
-                summary_lines.append(f"  - 가장 활발한 시간대: {most_active_hour}시 ({hourly_counts[most_active_hour]}회)")
+            most_active_hour = max(hourly_counts.items(), key=lambda x: x[1])[0]
+            summary_lines.append(f"  - 가장 활발한 시간대: {most_active_hour}시 ({hourly_counts[most_active_hour]}회)")
             # 시간대별 분포
             summary_lines.append("  - 시간대별 활동 분포:")
             for hour in sorted(hourly_counts.keys()):
@@ -261,49 +324,33 @@ def load_database_records_for_feedback() -> str:
             summary_lines.append("")
         
         # 일일 평균 기록 수
-        if unique_dates > 0:
-            avg_daily_records = stats['total_records'] / unique_dates
-            summary_lines.append(f"📅 일일 평균 기록 수: {avg_daily_records:.1f}개/일")
-            summary_lines.append("")
+        avg_daily_records = total_records / unique_dates
+        summary_lines.append(f"📅 일일 평균 기록 수: {avg_daily_records:.1f}개/일")
+        summary_lines.append("")
         
         # 최근 활동 패턴 (최근 7일)
         summary_lines.append("📋 최근 7일 활동 패턴:")
-        recent_week_by_date = {}
-        for record in recent_week_records:
-            date = record['date']
-            if date not in recent_week_by_date:
-                recent_week_by_date[date] = []
-            recent_week_by_date[date].append(record)
-        
         for date in sorted(recent_week_by_date.keys(), reverse=True):
-            day_records = recent_week_by_date[date]
-            summary_lines.append(f"  - {date}: {len(day_records)}개 기록")
+            summary_lines.append(f"  - {date}: {recent_week_by_date[date]}개 기록")
         summary_lines.append("")
         
         # 오늘의 활동
-        today_str = today.isoformat()
-        today_records = [r for r in all_records if r['date'] == today_str]
         if today_records:
             summary_lines.append(f"🌅 오늘({today_str}) 활동:")
             for record in today_records:
-                try:
-                    start = datetime.strptime(record['start_time'], "%H:%M")
-                    end = datetime.strptime(record['end_time'], "%H:%M")
-                    if end < start:
-                        end += timedelta(days=1)
-                    duration = (end - start).total_seconds() / 60  # 분 단위
+                duration = record.get('duration_minutes')  # 분 단위
+                if duration is not None:
                     summary_lines.append(f"  - {record['start_time']}-{record['end_time']} ({duration:.0f}분): {record['activity']} ({record['category']})")
-                except:
+                else:
                     summary_lines.append(f"  - {record['start_time']}-{record['end_time']}: {record['activity']} ({record['category']})")
             summary_lines.append("")
         
-        # 활동 연속성 분석 (최근 기록의 일관성)
-        if len(recent_week_records) > 0:
+        # 활동 연속성 분석 (최근 기록의 일관성, 최근 7일 날짜별 기록 수만으로 판단)
+        if recent_week_count > 0:
             consecutive_days = 0
             current_date = today
             for i in range(7):
-                date_str = current_date.isoformat()
-                if any(r['date'] == date_str for r in all_records):
+                if current_date.isoformat() in recent_week_by_date:
                     consecutive_days += 1
                 else:
                     break
@@ -319,10 +366,16 @@ def load_database_records_for_feedback() -> str:
         traceback.print_exc()
         return "데이터를 불러올 수 없습니다."
 
+class FeedbackSchemaError(ValueError):
+    """피드백 응답을 스키마에 맞게 복구하지 못함"""
+
 def get_realtime_feedback() -> dict:
     """
     데이터베이스 기록을 기반으로 실시간 피드백 생성
     
+    실패해도 예외를 던지지 않고 안내 문구가 담긴 기본 응답을 반환함
+    (실패를 구별해야 하는 곳은 generate_realtime_feedback 사용)
+    
     Returns:
         dict: JSON 형식의 피드백 데이터
         {
@@ -335,13 +388,62 @@ def get_realtime_feedback() -> dict:
         }
     """
     try:
-        openai_client = get_openai_client()
+        return generate_realtime_feedback()
+    except Exception as e:
+        error_str = str(e)
+        # 응답을 스키마에 맞게 복구하지 못한 경우
+        if isinstance(e, FeedbackSchemaError):
+            return {
+                "summary": "피드백을 생성할 수 없습니다.",
+                "feedbacks": [
+                    {
+                        "title": "다시 시도",
+                        "description": "잠시 후 다시 시도해주세요.",
+                        "type": "neutral"
+                    }
+                ],
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
         
-        # 데이터베이스 기록 로드
-        routine_data_summary = load_database_records_for_feedback()
+        # 사용량 한도 초과 오류 처리
+        if "insufficient_quota" in error_str or "429" in error_str:
+            return {
+                "summary": "API 사용량 한도가 초과되었습니다.",
+                "feedbacks": [
+                    {
+                        "title": "OpenAI 계정 확인",
+                        "description": "OpenAI 계정의 결제 정보와 사용량 한도를 확인해주세요.",
+                        "type": "neutral"
+                    }
+                ],
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
         
-        # 통계 기반 종합 피드백 프롬프트
-        feedback_prompt = """너는 사용자의 루틴 통계 데이터를 종합적으로 분석하여 하나의 통합된 피드백을 제공하는 AI 코치입니다.
+        # 오류 발생 시 기본 응답
+        return {
+            "summary": "피드백을 불러올 수 없습니다.",
+            "feedbacks": [
+                {
+                    "title": "오류 발생",
+                    "description": f"오류가 발생했습니다: {str(e)}",
+                    "type": "neutral"
+                }
+            ],
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+def generate_realtime_feedback() -> dict:
+    """
+    실시간 피드백 생성 (get_realtime_feedback과 같은 형식)
+    
+    API 오류는 그대로 전달하고, 응답을 복구하지 못하면 FeedbackSchemaError를 던짐
+    (백그라운드 갱신기가 실패를 구별해 마지막 정상 피드백을 유지할 수 있도록)
+    """
+    # 데이터베이스 기록 로드
+    routine_data_summary = load_database_records_for_feedback()
+    
+    # 통계 기반 종합 피드백 프롬프트
+    feedback_prompt = """너는 사용자의 루틴 통계 데이터를 종합적으로 분석하여 하나의 통합된 피드백을 제공하는 AI 코치입니다.
 
 **중요: 반드시 JSON 형식으로만 응답해야 합니다. 다른 텍스트나 설명은 포함하지 마세요.**
 
@@ -412,8 +514,8 @@ def get_realtime_feedback() -> dict:
 7. 모든 텍스트는 존댓말로 작성
 8. 데이터에 없는 내용은 추측하지 말고, 실제 통계 데이터만 기반으로 종합 피드백
 9. 통계별로 따로 피드백을 만들지 말고, 모든 통계를 하나로 종합하여 분석"""
-        
-        user_message = f"""사용자의 루틴 통계 데이터를 종합적으로 분석하여 하나의 통합된 피드백을 제공해주세요.
+    
+    user_message = f"""사용자의 루틴 통계 데이터를 종합적으로 분석하여 하나의 통합된 피드백을 제공해주세요.
 
 {routine_data_summary}
 
@@ -421,68 +523,125 @@ def get_realtime_feedback() -> dict:
 - 카테고리별 통계, 시간대별 패턴, 기록 연속성, 일일 평균 등을 모두 종합하여 분석하세요
 - 긍정적인 점과 개선 가능한 점을 균형있게 존댓말(경어체)로 작성해주세요
 - 통계 데이터에서 확인된 실제 패턴과 사실만을 바탕으로 종합 피드백하시고, 추측이나 이상적인 조언은 피해주세요"""
-        
-        completion = openai_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": feedback_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            temperature=0.7,
-            max_tokens=1000
-        )
-        
-        response_content = completion.choices[0].message.content
-        
-        # JSON 파싱
-        try:
-            result = json.loads(response_content)
-            # timestamp 추가 (없는 경우)
-            if "timestamp" not in result:
-                result["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            return result
-        except json.JSONDecodeError:
-            # JSON 파싱 실패 시 기본 응답
-            return {
-                "summary": "피드백을 생성할 수 없습니다.",
-                "feedbacks": [
-                    {
-                        "title": "다시 시도",
-                        "description": "잠시 후 다시 시도해주세요.",
-                        "type": "neutral"
-                    }
-                ],
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
     
-    except Exception as e:
-        error_str = str(e)
-        # 사용량 한도 초과 오류 처리
-        if "insufficient_quota" in error_str or "429" in error_str:
-            return {
-                "summary": "API 사용량 한도가 초과되었습니다.",
-                "feedbacks": [
-                    {
-                        "title": "OpenAI 계정 확인",
-                        "description": "OpenAI 계정의 결제 정보와 사용량 한도를 확인해주세요.",
-                        "type": "neutral"
-                    }
-                ],
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    response_content = create_chat_completion(
+        model="gpt-4o",
+        system_prompt=feedback_prompt,
+        user_message=user_message,
+        temperature=0.7,
+        max_tokens=1000,
+        cache_ttl=FEEDBACK_CACHE_TTL,
+        schema="feedback"
+    )
+    
+    # 스키마 검증 (빠진 필드는 그 필드만 다시 요청)
+    result = parse_structured_response(
+        "feedback", response_content, "gpt-4o", feedback_prompt, user_message,
+        max_tokens=1000, cache_ttl=FEEDBACK_CACHE_TTL
+    )
+    if result is None:
+        raise FeedbackSchemaError("피드백 응답을 스키마에 맞게 복구하지 못했습니다.")
+    return result
+
+def _build_advice_request(user_input: str) -> Tuple[str, str]:
+    """AI 조언 요청용 (시스템 프롬프트, 사용자 메시지) 생성"""
+    # CSV 데이터 기반 프롬프트 로드
+    try:
+        with open("ai_advice_with_data_prompt.md", "r", encoding="utf-8") as f:
+            content = f.read()
+            start = content.find("`") + 1
+            end = content.rfind("`")
+            if start > 0 and end > start:
+                ai_prompt = content[start:end].strip()
+            else:
+                ai_prompt = load_ai_prompt()  # 기본 프롬프트 사용
+    except:
+        ai_prompt = load_ai_prompt()  # 기본 프롬프트 사용
+    
+    # CSV 데이터 로드
+    routine_data_summary = load_routine_data_for_advice()
+    
+    # 사용자 입력과 데이터를 결합
+    user_message = f"""사용자 질문/고민: {user_input}
+
+{routine_data_summary}
+
+위 루틴 데이터를 반드시 기반으로 하여, 사용자의 질문/고민에 대한 현실적이고 구체적인 조언을 존댓말(경어체)로 작성해주세요. 
+데이터에서 확인된 실제 패턴과 사실만을 바탕으로 조언하시고, 추측이나 이상적인 조언은 피해주세요."""
+    return ai_prompt, user_message
+
+def _parse_advice_response(response_content: str, ai_prompt: str, user_message: str) -> dict:
+    """AI 조언 응답 본문을 결과 dict로 변환 (복구하지 못하면 기본 응답)"""
+    # 스키마 검증 (빠진 필드는 그 필드만 다시 요청)
+    result = parse_structured_response(
+        "advice", response_content, "gpt-4o", ai_prompt, user_message,
+        max_tokens=1000, cache_ttl=ADVICE_CACHE_TTL
+    )
+    if result is not None:
+        return result
+    
+    # 복구하지 못한 경우 기본 응답
+    return {
+        "summary": "응답을 파싱할 수 없습니다.",
+        "advices": [
+            {
+                "title": "다시 시도",
+                "description": "잠시 후 다시 시도해주세요.",
+                "priority": 1
             }
-        
-        # 오류 발생 시 기본 응답
+        ],
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def _advice_error_response(e: Exception) -> dict:
+    """AI 조언 요청 중 오류에 대한 기본 응답"""
+    error_str = str(e)
+    # 사용량 한도 초과 오류 처리
+    if "insufficient_quota" in error_str or "429" in error_str:
         return {
-            "summary": "피드백을 불러올 수 없습니다.",
-            "feedbacks": [
+            "summary": "API 사용량 한도가 초과되었습니다.",
+            "advices": [
                 {
-                    "title": "오류 발생",
-                    "description": f"오류가 발생했습니다: {str(e)}",
-                    "type": "neutral"
+                    "title": "OpenAI 계정 확인",
+                    "description": "OpenAI 계정의 결제 정보와 사용량 한도를 확인해주세요. https://platform.openai.com/usage 에서 확인하실 수 있습니다.",
+                    "priority": 1
+                },
+                {
+                    "title": "크레딧 충전",
+                    "description": "OpenAI 계정에 크레딧이 부족할 수 있습니다. 결제 정보를 확인하고 필요시 크레딧을 충전해주세요.",
+                    "priority": 2
+                },
+                {
+                    "title": "잠시 후 재시도",
+                    "description": "사용량 한도가 리셋될 때까지 기다리시거나, 다른 API 키를 사용해보세요.",
+                    "priority": 3
                 }
             ],
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
+    
+    # 오류 발생 시 기본 응답
+    return {
+        "summary": f"오류가 발생했습니다: {str(e)}",
+        "advices": [
+            {
+                "title": "API 키 확인",
+                "description": "OPENAI_API_KEY가 올바르게 설정되었는지 확인해주세요.",
+                "priority": 1
+            },
+            {
+                "title": "네트워크 확인",
+                "description": "인터넷 연결을 확인해주세요.",
+                "priority": 2
+            },
+            {
+                "title": "다시 시도",
+                "description": "잠시 후 다시 시도해주세요.",
+                "priority": 3
+            }
+        ],
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
 
 def get_ai_advice(user_input: str) -> dict:
     """
@@ -503,113 +662,62 @@ def get_ai_advice(user_input: str) -> dict:
         }
     """
     try:
-        openai_client = get_openai_client()
-        
-        # CSV 데이터 기반 프롬프트 로드
-        try:
-            with open("ai_advice_with_data_prompt.md", "r", encoding="utf-8") as f:
-                content = f.read()
-                start = content.find("`") + 1
-                end = content.rfind("`")
-                if start > 0 and end > start:
-                    ai_prompt = content[start:end].strip()
-                else:
-                    ai_prompt = load_ai_prompt()  # 기본 프롬프트 사용
-        except:
-            ai_prompt = load_ai_prompt()  # 기본 프롬프트 사용
-        
-        # CSV 데이터 로드
-        routine_data_summary = load_routine_data_for_advice()
+        ai_prompt, user_message = _build_advice_request(user_input)
         
-        # 사용자 입력과 데이터를 결합
-        user_message = f"""사용자 질문/고민: {user_input}
-
-{routine_data_summary}
-
-위 루틴 데이터를 반드시 기반으로 하여, 사용자의 질문/고민에 대한 현실적이고 구체적인 조언을 존댓말(경어체)로 작성해주세요. 
-데이터에서 확인된 실제 패턴과 사실만을 바탕으로 조언하시고, 추측이나 이상적인 조언은 피해주세요."""
-        
-        completion = openai_client.chat.completions.create(
+        response_content = create_chat_completion(
             model="gpt-4o",
-            messages=[
-                {"role": "system", "content": ai_prompt},
-                {"role": "user", "content": user_message}
-            ],
+            system_prompt=ai_prompt,
+            user_message=user_message,
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            cache_ttl=ADVICE_CACHE_TTL,
+            schema="advice"
         )
+        return _parse_advice_response(response_content, ai_prompt, user_message)
+    except Exception as e:
+        return _advice_error_response(e)
+
+def stream_ai_advice(user_input: str) -> Iterator[Dict]:
+    """
+    AI 조언을 스트리밍으로 생성하며, 응답이 도착하는 대로 이벤트 반환
+    
+    요약(summary)과 각 조언(advices의 원소)은 JSON이 완성되는 즉시 이벤트로 전달되므로,
+    화면은 전체 응답을 기다리지 않고 카드를 하나씩 표시할 수 있음
+    
+    Args:
+        user_input: 사용자 입력 텍스트
+    
+    Yields:
+        dict: 다음 중 하나
+        {"type": "delta", "text": "응답 조각"}
+        {"type": "summary", "summary": "한 줄 요약"}
+        {"type": "advice", "advice": {"title": "...", "description": "...", "priority": 1}}
+        {"type": "done", "result": get_ai_advice와 같은 형식의 최종 결과}
+    """
+    parser = StreamingJSONParser()
+    try:
+        ai_prompt, user_message = _build_advice_request(user_input)
         
-        response_content = completion.choices[0].message.content
+        for text in stream_chat_completion(
+            model="gpt-4o",
+            system_prompt=ai_prompt,
+            user_message=user_message,
+            temperature=0.7,
+            max_tokens=1000,
+            cache_ttl=ADVICE_CACHE_TTL,
+            schema="advice"
+        ):
+            yield {"type": "delta", "text": text}
+            for kind, key, value in parser.feed(text):
+                if kind == "field" and key == "summary":
+                    yield {"type": "summary", "summary": value}
+                elif kind == "item" and key == "advices" and isinstance(value, dict):
+                    yield {"type": "advice", "advice": value}
         
-        # JSON 파싱
-        try:
-            result = json.loads(response_content)
-            # timestamp 추가 (없는 경우)
-            if "timestamp" not in result:
-                result["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            return result
-        except json.JSONDecodeError:
-            # JSON 파싱 실패 시 기본 응답
-            return {
-                "summary": "응답을 파싱할 수 없습니다.",
-                "advices": [
-                    {
-                        "title": "다시 시도",
-                        "description": "잠시 후 다시 시도해주세요.",
-                        "priority": 1
-                    }
-                ],
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-    
+        result = _parse_advice_response(parser.buffer, ai_prompt, user_message)
     except Exception as e:
-        error_str = str(e)
-        # 사용량 한도 초과 오류 처리
-        if "insufficient_quota" in error_str or "429" in error_str:
-            return {
-                "summary": "API 사용량 한도가 초과되었습니다.",
-                "advices": [
-                    {
-                        "title": "OpenAI 계정 확인",
-                        "description": "OpenAI 계정의 결제 정보와 사용량 한도를 확인해주세요. https://platform.openai.com/usage 에서 확인하실 수 있습니다.",
-                        "priority": 1
-                    },
-                    {
-                        "title": "크레딧 충전",
-                        "description": "OpenAI 계정에 크레딧이 부족할 수 있습니다. 결제 정보를 확인하고 필요시 크레딧을 충전해주세요.",
-                        "priority": 2
-                    },
-                    {
-                        "title": "잠시 후 재시도",
-                        "description": "사용량 한도가 리셋될 때까지 기다리시거나, 다른 API 키를 사용해보세요.",
-                        "priority": 3
-                    }
-                ],
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-        
-        # 오류 발생 시 기본 응답
-        return {
-            "summary": f"오류가 발생했습니다: {str(e)}",
-            "advices": [
-                {
-                    "title": "API 키 확인",
-                    "description": "OPENAI_API_KEY가 올바르게 설정되었는지 확인해주세요.",
-                    "priority": 1
-                },
-                {
-                    "title": "네트워크 확인",
-                    "description": "인터넷 연결을 확인해주세요.",
-                    "priority": 2
-                },
-                {
-                    "title": "다시 시도",
-                    "description": "잠시 후 다시 시도해주세요.",
-                    "priority": 3
-                }
-            ],
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        result = _advice_error_response(e)
+    yield {"type": "done", "result": result}
 
 def load_routine_category_prompt():
     """루틴 카테고리 프롬프트 로드"""
@@ -649,56 +757,101 @@ def load_routine_category_prompt():
   "timestamp": "YYYY-MM-DD HH:MM:SS 형식의 현재 시간"
 }"""
 
+def _local_category_suggestion(local: Dict) -> dict:
+    """
+    로컬 분류 결과로 카테고리 제안 생성 (LLM 응답과 같은 필드)
+    
+    대체 카테고리는 분류기의 다음 후보, 추천 루틴은 해당 카테고리에서 자주 기록한 활동
+    """
+    from database import get_frequent_activities
+    
+    category = local["category"]
+    if local["source"] == "exact":
+        description = f"이전 기록에서 같은 활동을 주로 '{category}' 카테고리로 기록하셨습니다."
+    else:
+        description = f"비슷한 활동 기록을 바탕으로 '{category}' 카테고리로 분류했습니다."
+    
+    reasons = {
+        "exact": "같은 활동을 이 카테고리로도 기록하셨습니다 (해당 활동 기록의 {:.0%})",
+        "ngram": "비슷한 활동 기록 기준으로 다음 후보입니다 (확률 {:.0%})",
+        "prior": "자주 기록하시는 카테고리입니다 (전체 기록의 {:.0%})",
+    }
+    alternatives = [
+        {"name": name, "reason": reasons[source].format(ratio)}
+        for name, source, ratio in local["alternatives"]
+    ]
+    
+    routines = []
+    for activity in get_frequent_activities(category):
+        routines.append({
+            "name": activity["activity"],
+            "description": f"'{category}' 카테고리에서 {activity['count']}회 기록하신 활동",
+            "time_estimate": f"{activity['avg_minutes']}분" if activity["avg_minutes"] else "",
+        })
+    
+    return {
+        "suggested_category": category,
+        "category_description": description,
+        "alternative_categories": alternatives,
+        "routines": routines,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
 def get_routine_category_suggestion(user_input: str) -> dict:
     """
     사용자 입력에 대한 루틴 카테고리 제안 생성
     
+    기록 이력으로 학습한 로컬 분류기의 확신도가 충분하면 LLM을 호출하지 않고 같은 형식의 결과를
+    기록 이력으로 만들어 반환하며, 그렇지 않을 때만 LLM에 제안을 요청함
+    
     Args:
         user_input: 사용자가 입력한 활동/루틴 내용
     
     Returns:
         dict: JSON 형식의 카테고리 제안 데이터
     """
+    local = classify_activity(user_input)
+    if local:
+        return _local_category_suggestion(local)
+    
     try:
-        openai_client = get_openai_client()
         category_prompt = load_routine_category_prompt()
         
-        completion = openai_client.chat.completions.create(
+        user_message = f"사용자가 입력한 활동: {user_input}\n\n이 활동에 적합한 카테고리와 관련 루틴을 제안해주세요."
+        response_content = create_chat_completion(
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": category_prompt},
-                {"role": "user", "content": f"사용자가 입력한 활동: {user_input}\n\n이 활동에 적합한 카테고리와 관련 루틴을 제안해주세요."}
-            ],
+            system_prompt=category_prompt,
+            user_message=user_message,
             temperature=0.7,
-            max_tokens=800
+            max_tokens=800,
+            cache_ttl=CATEGORY_CACHE_TTL,
+            schema="category"
         )
         
-        response_content = completion.choices[0].message.content
-        
-        # JSON 파싱
-        try:
-            result = json.loads(response_content)
-            # timestamp 추가 (없는 경우)
-            if "timestamp" not in result:
-                result["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # 스키마 검증 (빠진 필드는 그 필드만 다시 요청)
+        result = parse_structured_response(
+            "category", response_content, "gpt-4o-mini", category_prompt, user_message,
+            max_tokens=800, cache_ttl=CATEGORY_CACHE_TTL
+        )
+        if result is not None:
             return result
-        except json.JSONDecodeError:
-            # JSON 파싱 실패 시 기본 응답
-            return {
-                "suggested_category": "기타",
-                "category_description": "카테고리를 자동으로 분류할 수 없습니다.",
-                "alternative_categories": [
-                    {"name": "식사", "reason": "일반적인 식사 활동으로 분류됩니다"}
-                ],
-                "routines": [
-                    {
-                        "name": user_input,
-                        "description": "사용자가 입력한 활동",
-                        "time_estimate": "30분"
-                    }
-                ],
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+        
+        # 복구하지 못한 경우 기본 응답
+        return {
+            "suggested_category": "기타",
+            "category_description": "카테고리를 자동으로 분류할 수 없습니다.",
+            "alternative_categories": [
+                {"name": "식사", "reason": "일반적인 식사 활동으로 분류됩니다"}
+            ],
+            "routines": [
+                {
+                    "name": user_input,
+                    "description": "사용자가 입력한 활동",
+                    "time_estimate": "30분"
+                }
+            ],
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
     
     except Exception as e:
         # 오류 발생 시 기본 응답
@@ -717,3 +870,166 @@ def get_routine_category_suggestion(user_input: str) -> dict:
             ],
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
+
+BATCH_CATEGORY_PROMPT = """너는 사용자의 활동명을 루틴 카테고리로 분류하는 분류기야.
+
+**중요: 반드시 JSON 형식으로만 응답해야 해. 다른 텍스트나 설명은 포함하지 마.**
+
+**카테고리:** 수면, 식사, 일과, 운동, 취미, 기타 (이 여섯 개 중 하나만 사용)
+
+**입력 형식:** 한 줄에 하나씩 "번호. 활동명" (기존 분류가 있으면 괄호 안에 표시)
+
+**출력 형식:**
+{
+  "results": [
+    {"id": 1, "category": "식사"},
+    {"id": 2, "category": "운동"}
+  ]
+}
+
+**규칙:**
+1. JSON 형식만 출력 (마크다운, 코드 블록 없이)
+2. 입력된 모든 번호에 대해 결과를 하나씩 포함
+3. 기존 분류가 여섯 카테고리에 없으면 가장 가까운 카테고리로 바꿔서 분류 (예: 학습 → 일과)
+4. 판단하기 어려우면 기타로 분류"""
+
+def _chunk_activities(lines: List[str], token_budget: int, max_items: int) -> List[List[int]]:
+    """활동 목록 줄을 토큰 예산/최대 개수 단위로 나눈 인덱스 묶음 목록"""
+    chunks, current, used = [], [], 0
+    for index, line in enumerate(lines):
+        cost = estimate_tokens(line) + 1
+        if current and (used + cost > token_budget or len(current) >= max_items):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+def _categorize_chunk(lines: List[str]) -> Dict[int, str]:
+    """활동 묶음 하나를 LLM으로 분류해 {번호: 카테고리} 반환 (번호는 1부터)"""
+    response_content = create_chat_completion(
+        model="gpt-4o-mini",
+        system_prompt=BATCH_CATEGORY_PROMPT,
+        user_message="\n".join(lines),
+        temperature=0,
+        max_tokens=min(4000, 50 + 20 * len(lines)),
+        cache_ttl=CATEGORY_CACHE_TTL,
+        schema="batch_category"
+    )
+    # 형식이 잘못된 항목은 검증에서 빠지고, 빠진 번호는 호출한 쪽에서 분류하지 못한 것으로 처리함
+    result, _ = parse_structured("batch_category", response_content)
+    return {item["id"]: item["category"] for item in (result or {}).get("results", [])}
+
+def categorize_activities(activities: List[str], hints: Optional[Dict[str, str]] = None,
+                          classifier: Optional[CategoryClassifier] = None,
+                          token_budget: int = BATCH_CATEGORY_TOKEN_BUDGET,
+                          max_items: int = BATCH_CATEGORY_MAX_ITEMS,
+                          max_concurrency: int = BATCH_CATEGORY_CONCURRENCY) -> dict:
+    """
+    여러 활동을 한꺼번에 카테고리로 분류
+    
+    같은 활동명은 한 번만 분류하고, 로컬 분류기로 확신할 수 있는 활동은 LLM 없이 처리함.
+    나머지는 토큰 예산 단위로 묶어 요청 1회에 여러 활동을 보내며, 묶음들은 최대
+    max_concurrency개까지 동시에 요청함. AI를 쓸 수 없거나(API 키 없음 등) 요청이 실패해
+    분류하지 못한 활동은 categories에 넣지 않으므로 호출한 쪽이 기존 값을 유지할 수 있음.
+    
+    Args:
+        activities: 활동명 목록
+        hints: 활동명 → 기존(비표준) 카테고리 (LLM에 참고로 전달)
+        classifier: 로컬 분류기 (None이면 기록 이력으로 학습한 기본 분류기)
+        token_budget: 요청 1회에 넣는 활동 목록의 최대 토큰 수
+        max_items: 요청 1회에 넣는 최대 활동 수
+        max_concurrency: 동시에 보내는 최대 요청 수
+    
+    Returns:
+        dict: {"categories": {활동명: 카테고리}, "local": 로컬 처리 수, "llm": LLM 분류 수,
+               "fallback": 분류하지 못한 수, "calls": LLM 요청 수}
+    """
+    hints = hints or {}
+    classifier = classifier or get_category_classifier()
+    categories: Dict[str, str] = {}
+    pending: List[str] = []
+    for activity in dict.fromkeys(activities):
+        category, confidence, _ = classifier.predict(activity)
+        if category is not None and confidence >= CONFIDENCE_THRESHOLD:
+            categories[activity] = category
+        else:
+            pending.append(activity)
+    
+    stats = {"local": len(categories), "llm": 0, "fallback": 0, "calls": 0}
+    lines = [
+        f"{activity} (기존 분류: {hints[activity]})" if hints.get(activity) else activity
+        for activity in pending
+    ]
+    chunks = _chunk_activities(lines, token_budget, max_items)
+    if chunks:
+        try:
+            get_openai_client()
+        except Exception as e:
+            print(f"AI를 사용할 수 없어 일괄 카테고리 분류를 건너뜀: {e}")
+            stats["fallback"] = len(pending)
+            chunks = []
+    
+    def run(chunk: List[int]) -> Dict[int, str]:
+        try:
+            return _categorize_chunk([f"{n}. {lines[index]}" for n, index in enumerate(chunk, 1)])
+        except Exception as e:
+            print(f"일괄 카테고리 분류 오류: {e}")
+            return {}
+    
+    if chunks:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as executor:
+            for chunk, result in zip(chunks, executor.map(run, chunks)):
+                for n, index in enumerate(chunk, 1):
+                    if n in result:
+                        categories[pending[index]] = result[n]
+                        stats["llm"] += 1
+                    else:
+                        stats["fallback"] += 1
+        stats["calls"] = len(chunks)
+    
+    stats["categories"] = categories
+    return stats
+
+def fill_record_categories(records: List[Dict], **options) -> dict:
+    """
+    카테고리가 비어 있거나 표준이 아닌 기록의 카테고리를 일괄 분류로 채움 (records를 직접 수정)
+    
+    로컬 분류기는 기존 기록 이력에 같은 파일의 정상 분류 기록을 더해 학습하며, 분류하지 못한
+    기록은 원래 카테고리를 그대로 둠
+    
+    Args:
+        records: 기록 목록 (activity, category 포함)
+        **options: categorize_activities에 전달할 설정
+    
+    Returns:
+        dict: categorize_activities의 통계에 "filled"(카테고리를 채운 기록 수)를 더한 결과
+    """
+    targets = [record for record in records if record.get("category") not in CATEGORIES]
+    if not targets:
+        return {"filled": 0, "local": 0, "llm": 0, "fallback": 0, "calls": 0}
+    
+    from database import get_activity_category_counts
+    
+    labeled = Counter(
+        (record["activity"], record["category"]) for record in records if record.get("category") in CATEGORIES
+    )
+    classifier = CategoryClassifier().fit(
+        list(get_activity_category_counts()) + [(activity, category, count) for (activity, category), count in labeled.items()]
+    )
+    hints = {
+        record["activity"]: record["category"]
+        for record in targets
+        if record.get("category") and record["category"].lower() not in ("nan", "none")
+    }
+    
+    result = categorize_activities([record["activity"] for record in targets], hints=hints,
+                                   classifier=classifier, **options)
+    categories = result["categories"]
+    for record in targets:
+        record["category"] = categories.get(record["activity"], record["category"])
+    result["filled"] = sum(1 for record in targets if record["activity"] in categories)
+    del result["categories"]
+    return result
@@ -0,0 +1,104 @@
+"""
+공유 OpenAI 클라이언트
+
+open.py는 Streamlit 재실행마다 다시 로드될 수 있으므로, 클라이언트는 일반 import로 한 번만
+로드되는 이 모듈에 두어 프로세스 전체에서 HTTP 연결 풀(keep-alive)을 재사용함.
+openai/dotenv는 AI 기능을 처음 사용할 때 import함.
+"""
+import os
+import threading
+
+# .env 파일 경로 (프로젝트 루트에서 찾기)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+env_path = os.path.join(project_root, '.env')
+
+# OpenAI HTTP 연결 설정 (환경 변수로 변경 가능)
+OPENAI_TIMEOUT_SECONDS = float(os.environ.get("OPENAI_TIMEOUT_SECONDS", "60"))                  # 요청 전체 제한 시간
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("OPENAI_CONNECT_TIMEOUT_SECONDS", "5"))   # 연결 수립 제한 시간
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONNECTIONS = 10          # 동시에 열어 둘 수 있는 최대 연결 수
+OPENAI_MAX_KEEPALIVE = 5             # 재사용을 위해 유지하는 유휴 연결 수
+OPENAI_KEEPALIVE_EXPIRY = 60.0       # 유휴 연결 유지 시간 (초)
+
+_openai_client = None
+_openai_client_key = None
+_openai_client_lock = threading.Lock()
+_env_loaded = False
+
+def load_env():
+    """.env 파일 로드 (최초 1회)"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        
+        # .env 파일 로드 (프로젝트 루트 경로 명시)
+        load_dotenv(dotenv_path=env_path)
+        _env_loaded = True
+
+def _create_openai_client(api_key: str):
+    """keep-alive 연결 풀과 제한 시간이 설정된 OpenAI 클라이언트 생성"""
+    import httpx
+    from openai import OpenAI
+    
+    timeout = httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=OPENAI_CONNECT_TIMEOUT_SECONDS)
+    http_client = httpx.Client(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY
+        )
+    )
+    return OpenAI(api_key=api_key, timeout=timeout, max_retries=OPENAI_MAX_RETRIES, http_client=http_client)
+
+def get_openai_client():
+    """
+    공유 OpenAI 클라이언트 반환 (.env 파일에서 API 키 읽기)
+    
+    처음 호출될 때 openai를 import하고 클라이언트를 만든 뒤 재사용하며,
+    API 키가 바뀌면 새로 만듦
+    """
+    global _openai_client, _openai_client_key
+    load_env()
+    
+    # .env 파일에서 API 키 읽기
+    api_key = os.getenv("OPENAI_API_KEY")
+    
+    if not api_key:
+        # 환경 변수에서 직접 확인
+        api_key = os.environ.get("OPENAI_API_KEY")
+    
+    if not api_key:
+        error_msg = "OPENAI_API_KEY가 설정되지 않았습니다.\n\n"
+        if os.path.exists(env_path):
+            error_msg += f"✅ .env 파일은 존재합니다: {env_path}\n"
+            error_msg += "⚠️ .env 파일에 다음 형식으로 OPENAI_API_KEY를 추가해주세요:\n"
+            error_msg += "   OPENAI_API_KEY=sk-your-api-key-here\n"
+        else:
+            error_msg += f"❌ .env 파일을 찾을 수 없습니다: {env_path}\n"
+            error_msg += "📝 프로젝트 루트에 .env 파일을 생성하고 다음 내용을 추가해주세요:\n"
+            error_msg += "   OPENAI_API_KEY=sk-your-api-key-here\n"
+        
+        error_msg += "\n💡 OpenAI API 키는 https://platform.openai.com/api-keys 에서 발급받을 수 있습니다."
+        raise ValueError(error_msg)
+    
+    client = _openai_client
+    if client is not None and _openai_client_key == api_key:
+        return client
+    
+    with _openai_client_lock:
+        if _openai_client is None or _openai_client_key != api_key:
+            # 이전 클라이언트는 진행 중인 요청이 있을 수 있으므로 닫지 않음
+            _openai_client = _create_openai_client(api_key)
+            _openai_client_key = api_key
+        return _openai_client
+
+def close_openai_client():
+    """공유 OpenAI 클라이언트와 연결 풀 정리"""
+    global _openai_client, _openai_client_key
+    with _openai_client_lock:
+        if _openai_client is not None:
+            _openai_client.close()
+        _openai_client = None
+        _openai_client_key = None
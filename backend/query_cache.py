@@ -0,0 +1,160 @@
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from database import get_data_version
+
+QUERY_CACHE_MAX_BYTES = 32 * 1024 * 1024   # 캐시가 보관할 결과의 추정 메모리 합계 상한
+QUERY_CACHE_MAX_ENTRIES = 512               # 캐시가 보관할 결과 최대 개수
+
+_STAT_KEYS = ("hits", "misses", "stale", "evictions", "uncacheable")
+
+def estimate_size(value: Any) -> int:
+    """조회 결과(dict/list/tuple/문자열/숫자 조합)의 대략적인 메모리 크기 (바이트)"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+def freeze_result(value: Any) -> Any:
+    """
+    조회 결과를 읽기 전용으로 변환 (dict → MappingProxyType, list → tuple)
+
+    저장할 때 한 번만 변환하므로 캐시 적중 시 복사 없이 모든 세션이 같은 객체를 공유해도
+    한 세션의 수정이 다른 세션에 섞이지 않음 (수정하려면 호출한 쪽에서 dict/list로 복사)
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_result(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_result(item) for item in value)
+    return value
+
+class QueryCache:
+    """
+    데이터 버전을 키에 포함하는 조회 결과 캐시 (프로세스 전체, 모든 세션이 공유)
+
+    (함수 이름, 인자) → (데이터 버전, 읽기 전용 결과, 크기)를 LRU로 보관하며, 추정 메모리 합계와
+    개수가 상한을 넘으면 오래 쓰지 않은 결과부터 버림. 기록이 바뀌면 트리거가 DB 안의 데이터 버전을
+    올리므로 다른 세션/프로세스의 쓰기에도 다음 조회에서 자동으로 다시 읽음
+    """
+
+    def __init__(self, max_bytes: int = QUERY_CACHE_MAX_BYTES, max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+                 version_source: Callable[[], int] = get_data_version):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._version_source = version_source
+        self._entries: "OrderedDict[Tuple, Tuple[int, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str, key: str):
+        self._stats.setdefault(name, dict.fromkeys(_STAT_KEYS, 0))[key] += 1
+
+    def _remove(self, key: Tuple):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get_or_load(self, name: str, args_key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        캐시된 결과를 반환하고, 없거나 데이터 버전이 바뀌었으면 loader()로 다시 읽어 저장
+
+        결과는 적중 여부와 관계없이 항상 freeze_result로 변환한 읽기 전용 값
+        """
+        key = (name, args_key)
+        # 쿼리보다 먼저 버전을 읽어야 쓰기와 겹쳐도 오래된 결과가 새 버전으로 저장되지 않음
+        version = self._version_source()
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                self._entries.move_to_end(key)
+                self._count(name, "hits")
+                return cached[1]
+            self._count(name, "stale" if cached is not None else "misses")
+
+        result = loader()
+        size = estimate_size(result)
+        result = freeze_result(result)
+
+        with self._lock:
+            if size > self.max_bytes:
+                self._count(name, "uncacheable")
+                return result
+            cached = self._entries.get(key)
+            # 다른 세션이 더 새 버전의 결과를 먼저 저장했으면 덮어쓰지 않음
+            if cached is not None and cached[0] > version:
+                return result
+            if cached is not None:
+                self._remove(key)
+            self._entries[key] = (version, result, size)
+            self._bytes += size
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                evicted = next(iter(self._entries))
+                self._remove(evicted)
+                self._count(evicted[0], "evictions")
+        return result
+
+    def cached(self, func: Callable, name: Optional[str] = None) -> Callable:
+        """읽기 함수를 감싸 (인자, 데이터 버전)별로 결과를 캐시 (반환값은 읽기 전용)"""
+        name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            args_key = (args, tuple(sorted(kwargs.items())))
+            return self.get_or_load(name, args_key, lambda: func(*args, **kwargs))
+        return wrapper
+
+    def clear(self):
+        """캐시와 카운터 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._stats.clear()
+
+    def info(self) -> Dict:
+        """
+        캐시 상태
+
+        - functions: 함수별 hits/misses/stale(데이터 버전이 바뀌어 다시 읽음)/evictions/
+          uncacheable(상한보다 커서 저장하지 않음)과 hit_rate
+        - 전체 hits/misses/hit_rate, 현재 개수와 추정 메모리(bytes), 상한
+        """
+        with self._lock:
+            functions = {name: dict(counts) for name, counts in self._stats.items()}
+            entries, used = len(self._entries), self._bytes
+        for counts in functions.values():
+            lookups = counts["hits"] + counts["misses"] + counts["stale"]
+            counts["hit_rate"] = counts["hits"] / lookups if lookups else 0.0
+        hits = sum(counts["hits"] for counts in functions.values())
+        lookups = sum(counts["hits"] + counts["misses"] + counts["stale"] for counts in functions.values())
+        return {
+            "functions": functions,
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": used,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+# 앱이 쓰는 기본 캐시 (모듈이 프로세스당 한 번 로드되므로 모든 세션이 공유)
+_default_cache = QueryCache()
+
+def cached_query(func: Callable, name: Optional[str] = None) -> Callable:
+    """기본 캐시로 읽기 함수를 감쌈"""
+    return _default_cache.cached(func, name)
+
+def get_query_cache_info() -> Dict:
+    """기본 캐시 상태 (get_statistics의 자체 캐시 상태는 database.get_statistics_cache_info)"""
+    return _default_cache.info()
+
+def clear_query_cache():
+    """기본 캐시와 카운터 초기화"""
+    _default_cache.clear()
@@ -0,0 +1,254 @@
+import json
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from json_stream import StreamingJSONParser
+from category_classifier import CATEGORIES
+
+# 응답 종류별 JSON 스키마 (OpenAI structured outputs의 strict 모드 규칙에 맞춤:
+# 모든 속성은 required, 객체는 additionalProperties: false)
+def _object(properties: Dict[str, Dict]) -> Dict:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+_STRING = {"type": "string"}
+
+SCHEMAS = {
+    "advice": _object({
+        "summary": _STRING,
+        "advices": {
+            "type": "array",
+            "minItems": 1,
+            "items": _object({"title": _STRING, "description": _STRING, "priority": {"type": "integer"}}),
+        },
+        "timestamp": _STRING,
+    }),
+    "feedback": _object({
+        "summary": _STRING,
+        "feedbacks": {
+            "type": "array",
+            "minItems": 1,
+            "items": _object({
+                "title": _STRING,
+                "description": _STRING,
+                "type": {"type": "string", "enum": ["positive", "suggestion", "neutral"]},
+            }),
+        },
+        "timestamp": _STRING,
+    }),
+    "category": _object({
+        "suggested_category": {"type": "string", "enum": CATEGORIES},
+        "category_description": _STRING,
+        "alternative_categories": {"type": "array", "items": _object({"name": _STRING, "reason": _STRING})},
+        "routines": {
+            "type": "array",
+            "items": _object({"name": _STRING, "description": _STRING, "time_estimate": _STRING}),
+        },
+        "timestamp": _STRING,
+    }),
+    "batch_category": _object({
+        "results": {
+            "type": "array",
+            "items": _object({"id": {"type": "integer"}, "category": {"type": "string", "enum": CATEGORIES}}),
+        },
+    }),
+}
+
+# 다시 요청하지 않고 채우는 필드
+LOCAL_DEFAULTS: Dict[str, Callable[[], Any]] = {
+    "timestamp": lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+}
+
+_INVALID = object()
+_CODE_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+def _subset_schema(schema: Dict, keys: List[str]) -> Dict:
+    return _object({key: schema["properties"][key] for key in keys})
+
+def response_format(kind: str, keys: Optional[List[str]] = None) -> Dict:
+    """
+    chat.completions의 response_format 값 (keys가 주어지면 해당 필드만 요구하는 스키마)
+    """
+    schema = SCHEMAS[kind]
+    if keys:
+        schema = _subset_schema(schema, keys)
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": f"{kind}_response", "strict": True, "schema": schema},
+    }
+
+def _conform(value: Any, schema: Dict) -> Any:
+    """값을 스키마에 맞게 정리해 반환 (맞출 수 없으면 _INVALID)"""
+    expected = schema.get("type")
+    if expected == "object":
+        if not isinstance(value, dict):
+            return _INVALID
+        result = {}
+        for key, sub_schema in schema["properties"].items():
+            item = _conform(value[key], sub_schema) if key in value else _INVALID
+            if item is _INVALID:
+                return _INVALID
+            result[key] = item
+        return result
+    if expected == "array":
+        if not isinstance(value, list):
+            return _INVALID
+        # 형식이 잘못된 원소만 버리고 나머지는 사용
+        items = [item for item in (_conform(v, schema["items"]) for v in value) if item is not _INVALID]
+        return items if len(items) >= schema.get("minItems", 0) else _INVALID
+    if expected == "integer":
+        if isinstance(value, bool):
+            return _INVALID
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+            return int(value.strip())
+        return _INVALID
+    if expected == "string":
+        if not isinstance(value, str):
+            return _INVALID
+        enum = schema.get("enum")
+        if enum and value not in enum:
+            normalized = value.strip().lower()
+            matches = [option for option in enum if option.lower() == normalized]
+            return matches[0] if matches else _INVALID
+        return value
+    return value
+
+def validate_response(data: Any, schema: Dict) -> Tuple[Dict, List[str]]:
+    """
+    최상위 필드 단위 검증
+
+    Returns:
+        Tuple[Dict, List[str]]: (스키마에 맞게 정리된 필드들, 없거나 잘못된 필드 목록)
+    """
+    data = data if isinstance(data, dict) else {}
+    cleaned, invalid = {}, []
+    for key, sub_schema in schema["properties"].items():
+        value = _conform(data[key], sub_schema) if key in data else _INVALID
+        if value is _INVALID:
+            invalid.append(key)
+        else:
+            cleaned[key] = value
+    return cleaned, invalid
+
+def loads_lenient(text: str) -> Tuple[Optional[Dict], str]:
+    """
+    응답 본문을 JSON 객체로 변환
+
+    그대로 파싱되지 않으면 코드 블록/앞뒤 설명을 걷어내고, 그래도 안 되면 (max_tokens로
+    잘린 응답 등) 완성된 최상위 필드와 배열 원소만 살려냄
+
+    Returns:
+        Tuple[Optional[Dict], str]: (객체, 방식 "json"/"extracted"/"salvaged"/"failed")
+    """
+    text = text or ""
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data, "json"
+    except json.JSONDecodeError:
+        pass
+
+    fenced = _CODE_FENCE_PATTERN.search(text)
+    candidate = fenced.group(1) if fenced else text
+    start, end = candidate.find("{"), candidate.rfind("}")
+    if start >= 0 and end > start:
+        try:
+            data = json.loads(candidate[start:end + 1])
+            if isinstance(data, dict):
+                return data, "extracted"
+        except json.JSONDecodeError:
+            pass
+
+    parser = StreamingJSONParser()
+    fields, items = {}, {}
+    for kind, key, value in parser.feed(candidate):
+        if kind == "field":
+            fields[key] = value
+        elif kind == "item":
+            items.setdefault(key, []).append(value)
+    for key, values in items.items():
+        if not isinstance(fields.get(key), list):
+            fields[key] = values
+    if fields:
+        return fields, "salvaged"
+    return None, "failed"
+
+# 응답 종류별 파싱 통계 (프로세스 누적)
+_STAT_KEYS = ("responses", "parse_failures", "invalid", "repaired", "rerequests", "failures")
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+def _count(kind: str, key: str):
+    with _stats_lock:
+        _stats.setdefault(kind, dict.fromkeys(_STAT_KEYS, 0))[key] += 1
+
+def get_structured_output_stats() -> Dict[str, Dict]:
+    """
+    응답 종류별 파싱 통계
+
+    - parse_failures: JSON으로 바로 파싱되지 않은 응답 수
+    - invalid: 파싱은 됐지만 필드가 없거나 잘못된 응답 수
+    - repaired: 정리/부분 재요청으로 복구한 응답 수
+    - rerequests: 빠진 필드만 다시 요청한 횟수
+    - failures: 끝내 복구하지 못한 응답 수
+    """
+    with _stats_lock:
+        snapshot = {kind: dict(counts) for kind, counts in _stats.items()}
+    for counts in snapshot.values():
+        total = counts["responses"]
+        counts["parse_failure_rate"] = counts["parse_failures"] / total if total else 0.0
+        counts["failure_rate"] = counts["failures"] / total if total else 0.0
+    return snapshot
+
+def parse_structured(kind: str, content: str,
+                     rerequest: Optional[Callable[[List[str], Dict], str]] = None) -> Tuple[Optional[Dict], bool]:
+    """
+    응답 본문을 kind 스키마에 맞는 dict로 변환
+
+    형식이 조금 어긋난 응답은 로컬에서 정리하고, 빠지거나 잘못된 필드는 기본값이 있으면
+    채우며, 나머지는 rerequest(빠진 필드 목록, 정상 필드)로 해당 필드만 한 번 다시 요청함
+
+    Returns:
+        Tuple[Optional[Dict], bool]: (결과, 원본 응답에서 고친 부분이 있는지),
+        복구하지 못하면 결과는 None
+    """
+    schema = SCHEMAS[kind]
+    _count(kind, "responses")
+    data, method = loads_lenient(content)
+    if method != "json":
+        _count(kind, "parse_failures")
+
+    cleaned, missing = validate_response(data, schema)
+    if method == "json" and (missing or cleaned != data):
+        _count(kind, "invalid")
+    changed = method != "json" or bool(missing) or cleaned != data
+
+    for key in [key for key in missing if key in LOCAL_DEFAULTS]:
+        cleaned[key] = LOCAL_DEFAULTS[key]()
+        missing.remove(key)
+
+    if missing and rerequest is not None:
+        _count(kind, "rerequests")
+        try:
+            extra, _ = loads_lenient(rerequest(missing, cleaned))
+            recovered, missing = validate_response(extra, _subset_schema(schema, missing))
+            cleaned.update(recovered)
+        except Exception as e:
+            print(f"응답 필드 재요청 오류: {e}")
+
+    if missing:
+        _count(kind, "failures")
+        return None, changed
+    if changed:
+        _count(kind, "repaired")
+    return {key: cleaned[key] for key in schema["properties"]}, changed
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from database import MINUTES_PER_DAY, time_to_minutes
+
+# 고정 폭 변환 시 한 칸 여유를 둬서 "HH:MM"보다 긴 문자열을 구별
+_CLOCK_WIDTH = 6
+_COLON = ord(":")
+_ZERO = ord("0")
+
+def _scalar_minutes(value: str) -> float:
+    minute = time_to_minutes(value)
+    return np.nan if minute is None else minute
+
+def clock_to_minutes(values) -> np.ndarray:
+    """
+    "HH:MM" 문자열 배열을 자정 기준 분(0~1440)으로 일괄 변환 (database.time_to_minutes의 벡터 버전)
+
+    정확히 "HH:MM" 형식인 값은 바이트 배열 연산으로 한 번에 처리하고, "7:30"처럼 형식이 다른
+    소수의 값만 time_to_minutes로 처리함. "24:00"은 1440, 잘못된 값은 NaN
+
+    Returns:
+        np.ndarray: float64 배열 (잘못된 값은 NaN)
+    """
+    text = pd.Series(values, copy=False).astype(str).str.strip().to_numpy()
+    result = np.full(len(text), np.nan)
+    if len(text) == 0:
+        return result
+
+    try:
+        raw = text.astype(f"S{_CLOCK_WIDTH}")
+    except UnicodeEncodeError:
+        # ASCII가 아닌 값은 빈 문자열로 바꿔 고정 폭 경로에서 빼고 스칼라 경로로 처리
+        is_ascii = np.fromiter((value.isascii() for value in text), dtype=bool, count=len(text))
+        raw = np.where(is_ascii, text, "").astype(f"S{_CLOCK_WIDTH}")
+
+    grid = np.frombuffer(raw.tobytes(), dtype=np.uint8).reshape(-1, _CLOCK_WIDTH)
+    digits = grid[:, [0, 1, 3, 4]].astype(np.int16) - _ZERO
+    fixed = (grid[:, 2] == _COLON) & (grid[:, 5] == 0) & ((digits >= 0) & (digits <= 9)).all(axis=1)
+
+    hours = digits[:, 0] * 10 + digits[:, 1]
+    minutes = digits[:, 2] * 10 + digits[:, 3]
+    valid = fixed & (((hours < 24) & (minutes < 60)) | ((hours == 24) & (minutes == 0)))
+    result[valid] = hours[valid] * 60 + minutes[valid]
+
+    for index in np.flatnonzero(~fixed):
+        result[index] = _scalar_minutes(text[index])
+    return result
+
+def durations_between(start_minutes, end_minutes) -> np.ndarray:
+    """
+    시작/종료 분 배열 사이의 길이 (database.duration_between의 벡터 버전)
+
+    종료가 시작보다 이르면 자정을 넘긴 것으로 계산하며, 어느 한쪽이 NaN이면 NaN
+    """
+    start = np.asarray(start_minutes, dtype=float)
+    end = np.asarray(end_minutes, dtype=float)
+    return np.where(end < start, end + MINUTES_PER_DAY, end) - start
+
+def split_time_ranges(values) -> pd.DataFrame:
+    """
+    "HH:MM-HH:MM" 문자열 배열을 start_time/end_time 문자열 컬럼으로 분리
+
+    "-"가 없는 값은 has_range가 False
+    """
+    ranges = pd.Series(values, copy=False).astype(str).str.strip()
+    parts = ranges.str.partition("-")
+    return pd.DataFrame({
+        "start_time": parts[0].str.strip(),
+        "end_time": parts[2].str.strip(),
+        "has_range": parts[1].eq("-"),
+    }, index=ranges.index)
+
+def fill_time_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    기록 DataFrame의 start_minute/end_minute/duration_minutes 컬럼을 채움 (df를 직접 수정)
+
+    저장된 값이 있는 행은 그대로 두고, 컬럼이 없거나 값이 비어 있는 행만 start_time/end_time
+    문자열에서 일괄 계산함
+    """
+    columns = ("start_minute", "end_minute", "duration_minutes")
+    for column in columns:
+        df[column] = pd.to_numeric(df[column], errors="coerce") if column in df else np.nan
+
+    missing = df[list(columns)].isna().any(axis=1).to_numpy()
+    if missing.any():
+        start = clock_to_minutes(df.loc[missing, "start_time"])
+        end = clock_to_minutes(df.loc[missing, "end_time"])
+        df.loc[missing, "start_minute"] = start
+        df.loc[missing, "end_minute"] = end
+        df.loc[missing, "duration_minutes"] = durations_between(start, end)
+    return df
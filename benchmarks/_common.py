@@ -0,0 +1,73 @@
+"""벤치마크 공용 유틸리티"""
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+def use_temp_workdir() -> str:
+    """
+    임시 작업 디렉터리로 이동
+
+    database 모듈은 import 시점에 현재 디렉터리의 routine_database.db를 초기화하므로,
+    저장소의 실제 DB를 건드리지 않도록 database import 전에 호출해야 함
+    """
+    workdir = tempfile.mkdtemp(prefix="routine_bench_")
+    os.chdir(workdir)
+    return workdir
+
+def percentile(samples: List[float], pct: float) -> float:
+    """정렬 후 최근접 순위 방식 백분위수"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+def timed(func: Callable, *args, **kwargs) -> float:
+    """함수 1회 실행 시간 (밀리초)"""
+    started = time.perf_counter()
+    func(*args, **kwargs)
+    return (time.perf_counter() - started) * 1000
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """지연 시간 샘플 요약 (밀리초)"""
+    return {
+        "n": len(samples),
+        "p50": percentile(samples, 50),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0,
+    }
+
+def print_summary(label: str, samples: List[float]):
+    """요약 결과 한 줄 출력"""
+    s = summarize(samples)
+    print(f"{label:<32} n={s['n']:>6}  p50={s['p50']:8.3f}ms  p99={s['p99']:8.3f}ms  max={s['max']:8.3f}ms")
+
+def make_sample_records(days: int = 30, per_day: int = 12, start: str = "2025-01-01") -> List[Dict]:
+    """벤치마크용 샘플 기록 생성"""
+    from datetime import date, timedelta
+
+    categories = ["수면", "식사", "일과", "운동", "취미", "기타"]
+    base = date.fromisoformat(start)
+    records = []
+    for d in range(days):
+        day = (base + timedelta(days=d)).isoformat()
+        for i in range(per_day):
+            start_min = (i * 90) % (24 * 60)
+            end_min = start_min + 45
+            records.append({
+                "date": day,
+                "activity": f"활동{i}",
+                "category": categories[i % len(categories)],
+                "start_time": f"{start_min // 60:02d}:{start_min % 60:02d}",
+                "end_time": f"{(end_min // 60) % 24:02d}:{end_min % 60:02d}",
+                "memo": f"메모 {d}-{i}",
+            })
+    return records
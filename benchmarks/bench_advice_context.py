@@ -0,0 +1,134 @@
+"""
+AI 조언 컨텍스트 크기/생성 시간 벤치마크: CSV 전체 나열 vs 토큰 예산 기반 요약
+
+기록 기간을 늘려 가며 프롬프트에 들어가는 데이터 부분의 문자 수, 추정 토큰 수,
+생성 시간을 비교함. --e2e를 주면 모의 OpenAI 서버(프롬프트 길이에 비례하는 처리 시간 포함)로
+stream_ai_advice를 끝까지 호출해 요청 전체의 프롬프트 토큰, 첫 조언 카드까지의 시간,
+전체 응답 시간도 비교함
+
+실행:
+    python benchmarks/bench_advice_context.py --days 7 30 90 365 --budget 2500
+    python benchmarks/bench_advice_context.py --e2e --prefill-ms-per-1k 40 --ttft-ms 300 --dist fixed
+"""
+import argparse
+import glob
+import importlib.util
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from _common import BACKEND_DIR, ROOT_DIR, make_sample_records, summarize, timed, use_temp_workdir
+
+workdir = use_temp_workdir()
+
+from advice_context import build_advice_context, estimate_tokens  # noqa: E402
+from mock_openai_server import add_config_arguments, config_from_args, start_mock_server  # noqa: E402
+
+def to_csv_rows(records):
+    """샘플 기록을 routine_data_v2.csv 행 형식으로 변환 (일부 메모에 AI 개입 태그 부여)"""
+    rows = []
+    for n, r in enumerate(records):
+        memo = r["memo"]
+        if n % 40 == 0:
+            memo = f"[동적 루틴] {memo}"
+        elif n % 55 == 0:
+            memo = f"[마이크로 루틴] {memo}"
+        rows.append({
+            "날짜": r["date"],
+            "시간(시작-종료)": f"{r['start_time']}-{r['end_time']}",
+            "활동명": r["activity"],
+            "카테고리": r["category"],
+            "메모": memo,
+        })
+    return rows
+
+def legacy_context(rows):
+    """기존 방식: 모든 행을 '전체 활동 기록'으로 나열"""
+    lines = ["=== 사용자 루틴 데이터 요약 ===\n"]
+    dates = sorted({row["날짜"] for row in rows})
+    lines.append(f"기록된 날짜: {len(dates)}일")
+    lines.append(f"기간: {dates[0]} ~ {dates[-1]}\n")
+    lines.append("카테고리별 활동 횟수:")
+    for category in sorted({row["카테고리"] for row in rows}):
+        lines.append(f"  - {category}: {sum(1 for row in rows if row['카테고리'] == category)}회")
+    lines.append("")
+    lines.append("전체 활동 기록:")
+    for row in rows:
+        lines.append(f"  [{row['날짜']}] {row['시간(시작-종료)']} | {row['활동명']} | {row['카테고리']} | 메모: {row['메모']}")
+    lines.append("")
+    lines.append("수면 패턴:")
+    for row in [row for row in rows if row["카테고리"] == "수면"][-3:]:
+        lines.append(f"  - {row['날짜']} {row['시간(시작-종료)']}: {row['메모']}")
+    return "\n".join(lines)
+
+def measure(label, build, rows, repeat):
+    text = build(rows)
+    stats = summarize([timed(build, rows) for _ in range(repeat)])
+    print(f"  {label:<10} chars={len(text):>9}  tokens~{estimate_tokens(text):>8}  "
+          f"build p50={stats['p50']:8.3f}ms  p99={stats['p99']:8.3f}ms")
+
+def load_open_module():
+    """앱 실행 위치와 같도록 프롬프트 파일을 작업 디렉터리로 복사한 뒤 backend/open.py 로드"""
+    for prompt_file in glob.glob(os.path.join(ROOT_DIR, "*prompt*.md")):
+        shutil.copy(prompt_file, workdir)
+    spec = importlib.util.spec_from_file_location("open_module", os.path.join(BACKEND_DIR, "open.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def measure_e2e(label, module, repeat):
+    """stream_ai_advice 한 번의 프롬프트 토큰, 첫 조언 카드까지의 시간, 전체 시간"""
+    ai_prompt, user_message = module._build_advice_request("운동 습관을 만들고 싶어요")
+    firsts, totals = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        first = None
+        for event in module.stream_ai_advice("운동 습관을 만들고 싶어요"):
+            if event["type"] == "advice" and first is None:
+                first = (time.perf_counter() - started) * 1000
+        totals.append((time.perf_counter() - started) * 1000)
+        firsts.append(first if first is not None else totals[-1])
+    first_stats, total_stats = summarize(firsts), summarize(totals)
+    print(f"  {label:<10} prompt tokens~{estimate_tokens(ai_prompt + user_message):>8}  "
+          f"first card p50={first_stats['p50']:8.1f}ms  total p50={total_stats['p50']:8.1f}ms  "
+          f"p99={total_stats['p99']:8.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 30, 90, 365])
+    parser.add_argument("--budget", type=int, default=2500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--e2e", action="store_true", help="모의 서버로 stream_ai_advice 전체 시간도 측정")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    module = None
+    if args.e2e:
+        _, base_url = start_mock_server(config_from_args(args))
+        os.environ.update({
+            "OPENAI_BASE_URL": base_url,
+            "OPENAI_API_KEY": "mock-key",
+            "LLM_CACHE_DISABLED": "1",
+            "LLM_CACHE_FILE": os.path.join(workdir, "llm_cache.db"),
+        })
+        module = load_open_module()
+        summarize_csv = module.load_routine_data_for_advice
+
+    for days in args.days:
+        rows = to_csv_rows(make_sample_records(days=days))
+        print(f"days={days} rows={len(rows)} budget={args.budget}")
+        measure("before", legacy_context, rows, args.repeat)
+        measure("after", lambda r: build_advice_context(r, token_budget=args.budget), rows, args.repeat)
+        if module is not None:
+            # load_routine_data_for_advice가 작업 디렉터리의 CSV를 읽도록 저장
+            pd.DataFrame(rows).to_csv("routine_data_v2.csv", index=False, encoding="utf-8")
+            module.load_routine_data_for_advice = lambda token_budget=args.budget: legacy_context(
+                pd.read_csv("routine_data_v2.csv", encoding="utf-8").to_dict("records"))
+            measure_e2e("before e2e", module, args.repeat)
+            module.load_routine_data_for_advice = summarize_csv
+            measure_e2e("after e2e", module, args.repeat)
+
+if __name__ == "__main__":
+    main()
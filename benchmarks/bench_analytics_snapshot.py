@@ -0,0 +1,67 @@
+"""
+통계 화면 데이터 준비 시간 벤치마크: 탭마다 쿼리/DataFrame 생성 vs 데이터 버전별 스냅샷
+
+기존 create_visualizations가 한 번 그릴 때 하던 조회(전체 기록, 30일 집계, 전체 통계, 7일 집계)와
+DataFrame 구성을 흉내 낸 시간과, 스냅샷 생성(쓰기 직후 첫 렌더링) 및 재사용(이후 렌더링) 시간을 비교함
+
+실행:
+    python benchmarks/bench_analytics_snapshot.py --days 30 365 1825 --per-day 12
+"""
+import argparse
+from datetime import date, timedelta
+
+import pandas as pd
+
+from _common import make_sample_records, print_summary, timed, use_temp_workdir
+
+use_temp_workdir()
+
+import database  # noqa: E402
+import analytics  # noqa: E402
+from time_engine import fill_time_columns  # noqa: E402
+
+def legacy_render():
+    """기존 방식: 네 번의 조회와 탭별 DataFrame 구성"""
+    today = date.today()
+    df = pd.DataFrame(database.iter_records())
+    fill_time_columns(df)
+    df["duration_minutes"] = df["duration_minutes"].fillna(0)
+    df["date"] = pd.to_datetime(df["date"])
+    recent = pd.DataFrame(database.get_daily_category_rollup((today - timedelta(days=30)).isoformat(), today.isoformat()))
+    df["category"].value_counts()
+    df.groupby("category")["duration_minutes"].sum()
+    df.groupby(df["start_minute"] // 60).size()
+    df.groupby("category")["duration_minutes"].mean()
+    database.get_statistics()
+    weekly = pd.DataFrame(database.get_daily_category_rollup((today - timedelta(days=7)).isoformat(), today.isoformat()))
+    return df, recent, weekly
+
+def snapshot_render():
+    """스냅샷 방식: 탭들이 쓰는 집계를 스냅샷에서 꺼내기만 함"""
+    today = date.today()
+    snapshot = analytics.get_analytics_snapshot()
+    snapshot.daily_category_between(today - timedelta(days=30), today)
+    snapshot.daily_totals_between(today - timedelta(days=7), today)
+    return snapshot.category_summary, snapshot.hourly_counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 365, 1825])
+    parser.add_argument("--per-day", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    loaded_days = 0
+    for days in sorted(args.days):
+        # 오늘까지 이어지도록 과거 날짜를 앞쪽에 추가
+        start = (date.today() - timedelta(days=days - 1)).isoformat()
+        database.add_records_bulk(make_sample_records(days - loaded_days, args.per_day, start))
+        loaded_days = days
+        print(f"days={days} records={database.get_statistics()['total_records']}")
+        print_summary("  before (queries per render)", [timed(legacy_render) for _ in range(args.repeat)])
+        print_summary("  snapshot build (after write)", [timed(analytics.load_analytics_snapshot)
+                                                         for _ in range(args.repeat)])
+        print_summary("  snapshot reuse (rerender)", [timed(snapshot_render) for _ in range(args.repeat)])
+
+if __name__ == "__main__":
+    main()
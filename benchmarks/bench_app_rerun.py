@@ -0,0 +1,86 @@
+"""
+앱 시작/재실행 시간 벤치마크: 재실행마다 backend 모듈 재로드 vs 프로세스당 한 번 로드
+
+1) backend 로드 단계만: 기존 방식(open.py/database.py/feedback.py를 exec_module로 다시 실행하고
+   init_database 호출)과 현재 방식(이미 로드된 모듈 재사용)의 시간 비교
+2) streamlit이 설치되어 있으면 AppTest로 appj.py 전체의 첫 실행과 재실행 시간을 측정
+   (reload 모드는 재실행마다 backend 모듈과 cache_resource를 비워 기존 동작을 재현)
+
+실행:
+    python benchmarks/bench_app_rerun.py --repeat 20
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+from _common import BACKEND_DIR, ROOT_DIR, print_summary, timed, use_temp_workdir
+
+use_temp_workdir()
+
+BACKEND_MODULES = (("database", "database.py"), ("open_module", "open.py"), ("feedback", "feedback.py"))
+
+def exec_backend_modules():
+    """기존 방식: 모듈 객체를 새로 만들어 파일을 다시 실행하고 DB 초기화"""
+    modules = {}
+    for module_name, filename in BACKEND_MODULES:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(BACKEND_DIR, filename))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        modules[module_name] = module
+    modules["database"].init_database()
+    return modules
+
+def reuse_backend_modules():
+    """현재 방식: 이미 로드된 모듈 재사용"""
+    return [sys.modules[module_name] for module_name, _ in BACKEND_MODULES]
+
+def forget_backend_modules():
+    for module_name, _ in BACKEND_MODULES:
+        sys.modules.pop(module_name, None)
+
+def bench_loading(repeat: int):
+    print_summary("backend load: exec every rerun", [timed(exec_backend_modules) for _ in range(repeat)])
+    for module_name, module in exec_backend_modules().items():
+        sys.modules[module_name] = module
+    print_summary("backend load: once per process", [timed(reuse_backend_modules) for _ in range(repeat)])
+
+def bench_app(repeat: int):
+    try:
+        import streamlit as st
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit이 설치되어 있지 않아 앱 전체 측정은 건너뜁니다.")
+        return
+
+    app_path = os.path.join(ROOT_DIR, "appj.py")
+    forget_backend_modules()
+    app = AppTest.from_file(app_path, default_timeout=120)
+    started = time.perf_counter()
+    app.run()
+    print(f"app first run (process start)    {(time.perf_counter() - started) * 1000:8.1f}ms")
+
+    # 시간에 따른 편차를 줄이기 위해 두 방식을 번갈아 실행
+    samples = {"reload": [], "once": []}
+    for _ in range(repeat):
+        for mode in samples:
+            if mode == "reload":
+                forget_backend_modules()
+                st.cache_resource.clear()
+            samples[mode].append(timed(app.run))
+    print_summary("app rerun: exec every rerun", samples["reload"])
+    print_summary("app rerun: once per process", samples["once"])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-app", action="store_true", help="AppTest 측정 생략")
+    args = parser.parse_args()
+
+    bench_loading(args.repeat)
+    if not args.skip_app:
+        bench_app(args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+로컬 카테고리 분류기 벤치마크: 적중률(LLM 생략 비율), 정확도, 예측 지연 시간
+
+저장소의 기록(DB와 CSV)을 k-fold로 나눠 학습/평가하며, 확신도 기준별로
+로컬에서 처리되는 비율과 그 결과의 정확도를 출력함 (DB는 읽기 전용으로 열어 변경하지 않음)
+
+실행:
+    python benchmarks/bench_category_classifier.py --folds 5 --thresholds 0.6 0.8 0.9 0.95
+"""
+import argparse
+import csv
+import os
+import random
+import sqlite3
+from collections import Counter
+
+from _common import ROOT_DIR, print_summary, timed
+
+from category_classifier import CATEGORIES, CONFIDENCE_THRESHOLD, CategoryClassifier  # noqa: E402
+
+def load_labeled(db_path: str, csv_path: str):
+    """(활동명, 카테고리) 기록 목록 (분류 대상 카테고리만)"""
+    samples = []
+    if os.path.exists(db_path):
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        samples.extend(conn.execute("SELECT activity, category FROM records").fetchall())
+        conn.close()
+    if os.path.exists(csv_path):
+        with open(csv_path, encoding="utf-8") as f:
+            samples.extend((row["활동명"], row["카테고리"]) for row in csv.DictReader(f))
+    return [(activity, category) for activity, category in samples if category in CATEGORIES]
+
+def evaluate(samples, folds: int, thresholds, seed: int, unseen: bool):
+    """
+    k-fold 평가
+
+    unseen=True이면 같은 활동명이 학습/평가에 함께 들어가지 않도록 활동명 단위로 나눠
+    처음 보는 활동명(n-gram 모델)에 대한 성능을 측정
+    """
+    rng = random.Random(seed)
+    if unseen:
+        names = sorted({activity for activity, _ in samples})
+        rng.shuffle(names)
+        fold_of = {name: n % folds for n, name in enumerate(names)}
+        assign = [fold_of[activity] for activity, _ in samples]
+    else:
+        assign = [n % folds for n in range(len(samples))]
+        rng.shuffle(assign)
+
+    predictions = []   # (정답, 예측, 확신도)
+    latencies = []
+    for k in range(folds):
+        test = [s for s, fold in zip(samples, assign) if fold == k]
+        train = [s for s, fold in zip(samples, assign) if fold != k]
+        counts = Counter(train)
+        classifier = CategoryClassifier().fit((a, c, n) for (a, c), n in counts.items())
+        for activity, category in test:
+            latencies.append(timed(classifier.predict, activity))
+            predicted, confidence, _ = classifier.predict(activity)
+            predictions.append((category, predicted, confidence))
+
+    total = len(predictions)
+    overall = sum(1 for truth, predicted, _ in predictions if truth == predicted) / total
+    mode = "unseen activities" if unseen else "all records"
+    print(f"[{mode}] samples={total} folds={folds} classifier-only accuracy={overall:.1%}")
+    for threshold in thresholds:
+        hits = [(truth, predicted) for truth, predicted, confidence in predictions if confidence >= threshold]
+        correct = sum(1 for truth, predicted in hits if truth == predicted)
+        accuracy = correct / len(hits) if hits else 0.0
+        print(f"  threshold={threshold:.2f}  local hit rate={len(hits) / total:6.1%}  "
+              f"local accuracy={accuracy:6.1%}  LLM calls={total - len(hits)}/{total}")
+    print_summary("predict latency", latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=os.path.join(ROOT_DIR, "routine_database.db"))
+    parser.add_argument("--csv", default=os.path.join(ROOT_DIR, "routine_data_v2.csv"))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=sorted({0.6, 0.8, CONFIDENCE_THRESHOLD, 0.95}))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    samples = load_labeled(args.db, args.csv)
+    if len(samples) < args.folds:
+        print("평가할 기록이 부족합니다.")
+        return
+    evaluate(samples, args.folds, args.thresholds, args.seed, unseen=False)
+    evaluate(samples, args.folds, args.thresholds, args.seed, unseen=True)
+
+if __name__ == "__main__":
+    main()
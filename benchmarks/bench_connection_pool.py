@@ -0,0 +1,59 @@
+"""
+연결 생성 방식 벤치마크: 호출마다 새 연결 vs 연결 풀 재사용
+
+실행:
+    python benchmarks/bench_connection_pool.py --threads 8 --calls 300
+"""
+import argparse
+import threading
+
+from _common import make_sample_records, print_summary, timed, use_temp_workdir
+
+use_temp_workdir()
+
+import database  # noqa: E402
+
+def legacy_get_records_by_date(date: str):
+    """기존 방식: 호출마다 연결을 열고 닫음"""
+    conn = database.get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM records WHERE date = ? ORDER BY start_time ASC", (date,))
+    rows = cursor.fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+def run(func, dates, threads: int, calls: int):
+    samples = []
+    lock = threading.Lock()
+
+    def worker(offset: int):
+        local = []
+        for i in range(calls):
+            local.append(timed(func, dates[(offset + i) % len(dates)]))
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=300)
+    args = parser.parse_args()
+
+    records = make_sample_records(days=60)
+    for r in records:
+        database.add_record(r["activity"], r["category"], r["start_time"], r["end_time"], r["memo"], r["date"])
+    dates = sorted({r["date"] for r in records})
+
+    print(f"threads={args.threads} calls/thread={args.calls} records={len(records)}")
+    print_summary("before: connect-per-call", run(legacy_get_records_by_date, dates, args.threads, args.calls))
+    print_summary("after: pooled connection", run(database.get_records_by_date, dates, args.threads, args.calls))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+실시간 피드백 컨텍스트 생성 시간 벤치마크: 전체 기록 순회 vs 누적 집계 스냅샷
+
+기록 기간을 늘려 가며 load_database_records_for_feedback의 생성 시간을 측정하고,
+기존 방식(iter_records로 전체 기록을 한 번 순회하며 집계)과 비교함
+
+실행:
+    python benchmarks/bench_feedback_context.py --days 30 365 1825 --per-day 12
+"""
+import argparse
+import importlib.util
+import os
+from datetime import date, timedelta
+
+from _common import BACKEND_DIR, print_summary, timed, use_temp_workdir
+
+use_temp_workdir()
+
+import database  # noqa: E402
+
+def load_open_module():
+    spec = importlib.util.spec_from_file_location("open_module", os.path.join(BACKEND_DIR, "open.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def legacy_aggregate(today_str: str, week_ago_str: str):
+    """기존 방식: 전체 기록을 순회하며 카테고리/시간대/최근 7일/오늘 기록을 집계"""
+    recorded_dates, recent, category_counts, category_times, hourly, today_records = set(), {}, {}, {}, {}, []
+    for record in database.iter_records():
+        day, cat = record["date"], record["category"]
+        recorded_dates.add(day)
+        if day >= week_ago_str:
+            recent[day] = recent.get(day, 0) + 1
+        if day == today_str:
+            today_records.append(record)
+        category_counts[cat] = category_counts.get(cat, 0) + 1
+        if record.get("duration_minutes") is not None:
+            category_times[cat] = category_times.get(cat, 0) + record["duration_minutes"] / 60
+        if record.get("start_minute") is not None:
+            hour = record["start_minute"] // 60
+            hourly[hour] = hourly.get(hour, 0) + 1
+    return recorded_dates, recent, category_counts, category_times, hourly, today_records
+
+def make_records(start: date, days: int, per_day: int):
+    categories = ["수면", "식사", "일과", "운동", "취미", "기타"]
+    for d in range(days):
+        day = (start + timedelta(days=d)).isoformat()
+        for i in range(per_day):
+            start_min = (i * 90 + d) % (24 * 60 - 60)
+            yield {
+                "date": day,
+                "activity": f"활동{i}",
+                "category": categories[i % len(categories)],
+                "start_time": f"{start_min // 60:02d}:{start_min % 60:02d}",
+                "end_time": f"{(start_min + 45) // 60:02d}:{(start_min + 45) % 60:02d}",
+                "memo": "",
+            }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 365, 1825])
+    parser.add_argument("--per-day", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    module = load_open_module()
+    today = date.today()
+    loaded_days = 0
+    for days in sorted(args.days):
+        # 오늘까지 이어지도록 과거 날짜를 앞쪽에 추가
+        database.add_records_bulk(make_records(today - timedelta(days=days - 1), days - loaded_days, args.per_day))
+        loaded_days = days
+        total = database.get_feedback_snapshot(today.isoformat())["total_records"]
+        print(f"days={days} records={total}")
+        week_ago = (today - timedelta(days=7)).isoformat()
+        print_summary("  before (full scan)", [timed(legacy_aggregate, today.isoformat(), week_ago)
+                                              for _ in range(max(1, args.repeat // 4))])
+        print_summary("  after (snapshot + prompt)", [timed(module.load_database_records_for_feedback)
+                                                     for _ in range(args.repeat)])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+AI 경로 부하 벤치마크: 모의 OpenAI 서버를 띄우고 동시 요청으로 지연 시간 백분위수 측정
+
+get_ai_advice, get_realtime_feedback, get_routine_category_suggestion과 스트리밍 조언
+(첫 조언 카드까지의 시간)을 차례로 부하를 주며, 응답 캐시는 끄고 측정함
+(카테고리 제안은 로컬 분류기가 답하지 않도록 샘플 기록과 겹치지 않는 활동명을 사용)
+
+실행:
+    python benchmarks/bench_llm_paths.py --concurrency 8 --requests 40 --ttft-ms 300 --error-rate 0.05
+    python benchmarks/bench_llm_paths.py --malformed-rate 0.2   # 응답 형식 복구 경로 포함
+"""
+import argparse
+import glob
+import importlib.util
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _common import BACKEND_DIR, ROOT_DIR, make_sample_records, percentile, use_temp_workdir
+
+workdir = use_temp_workdir()
+# open.py는 프롬프트 파일을 현재 디렉터리에서 읽으므로 앱 실행 위치와 같게 복사
+for prompt_file in glob.glob(os.path.join(ROOT_DIR, "*prompt*.md")):
+    shutil.copy(prompt_file, workdir)
+
+from category_classifier import get_classifier_stats  # noqa: E402
+from mock_openai_server import add_config_arguments, config_from_args, start_mock_server  # noqa: E402
+
+# 실패 시 기본 응답에 들어가는 문구 (get_* 함수는 예외 대신 기본 응답을 돌려줌)
+FALLBACK_MARKERS = ("한도가 초과", "오류가 발생", "불러올 수 없습니다", "생성할 수 없습니다", "파싱할 수 없습니다")
+
+def is_fallback(result) -> bool:
+    text = str(result)
+    return any(marker in text for marker in FALLBACK_MARKERS)
+
+def novel_activity(i: int) -> str:
+    """샘플 기록 활동명(한글+숫자)과 n-gram이 겹치지 않는 활동명 (숫자 대신 알파벳 접미사)"""
+    suffix = ""
+    while True:
+        i, r = divmod(i, 26)
+        suffix = chr(ord("a") + r) + suffix
+        if i == 0:
+            return f"pilates lesson {suffix}"
+        i -= 1
+
+def load_open_module():
+    """appj.py와 같은 방식으로 backend/open.py 로드"""
+    spec = importlib.util.spec_from_file_location("open_module", os.path.join(BACKEND_DIR, "open.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def first_advice_latency(module, question: str):
+    """스트리밍 조언에서 첫 조언 카드가 완성될 때까지의 시간(ms)과 최종 결과"""
+    started = time.perf_counter()
+    first = None
+    result = None
+    for event in module.stream_ai_advice(question):
+        if event["type"] == "advice" and first is None:
+            first = (time.perf_counter() - started) * 1000
+        elif event["type"] == "done":
+            result = event["result"]
+    return first, result
+
+def run_load(label: str, call, concurrency: int, total: int):
+    latencies, failures = [], 0
+    extra = []
+    lock = threading.Lock()
+
+    def one(i: int):
+        nonlocal failures
+        started = time.perf_counter()
+        result = call(i)
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            if isinstance(result, tuple):
+                first, result = result
+                if first is not None:
+                    extra.append(first)
+            latencies.append(elapsed)
+            if is_fallback(result):
+                failures += 1
+
+    # 로컬 분류기가 LLM 없이 답한 횟수
+    local_before = get_classifier_stats()["local"]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(total)))
+    wall = time.perf_counter() - started
+    local = get_classifier_stats()["local"] - local_before
+
+    print(f"{label:<34} n={len(latencies):>4}  p50={percentile(latencies, 50):8.1f}ms  "
+          f"p90={percentile(latencies, 90):8.1f}ms  p99={percentile(latencies, 99):8.1f}ms  "
+          f"{total / wall:6.1f} req/s  failed={failures}  local={local}")
+    if extra:
+        print(f"{'  first advice card':<34} n={len(extra):>4}  p50={percentile(extra, 50):8.1f}ms  "
+              f"p90={percentile(extra, 90):8.1f}ms  p99={percentile(extra, 99):8.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--paths", nargs="+", default=["advice", "stream", "feedback", "category"])
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    config = config_from_args(args)
+    server, base_url = start_mock_server(config)
+    os.environ.update({
+        "OPENAI_BASE_URL": base_url,
+        "OPENAI_API_KEY": "mock-key",
+        "LLM_CACHE_DISABLED": "1",
+        "LLM_CACHE_FILE": os.path.join(workdir, "llm_cache.db"),
+    })
+
+    import database
+    database.add_records_bulk(make_sample_records(days=30))
+    module = load_open_module()
+
+    paths = {
+        "advice": ("get_ai_advice", lambda i: module.get_ai_advice(f"운동 습관을 만들고 싶어요 #{i}")),
+        "stream": ("stream_ai_advice", lambda i: first_advice_latency(module, f"잠을 더 잘 자고 싶어요 #{i}")),
+        "feedback": ("get_realtime_feedback", lambda i: module.get_realtime_feedback()),
+        "category": ("get_routine_category_suggestion", lambda i: module.get_routine_category_suggestion(novel_activity(i))),
+    }
+
+    print(f"mock={base_url} dist={args.dist} ttft={args.ttft_ms}ms token={args.token_ms}ms "
+          f"error_rate={args.error_rate} concurrency={args.concurrency} requests={args.requests}")
+    for name in args.paths:
+        label, call = paths[name]
+        run_load(label, call, args.concurrency, args.requests)
+    print(f"server: {config.stats}")
+    from structured_output import get_structured_output_stats
+    for kind, counts in get_structured_output_stats().items():
+        print(f"structured[{kind}]: " + "  ".join(
+            f"{key}={value:.1%}" if key.endswith("rate") else f"{key}={value}" for key, value in counts.items()))
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+조회 캐시 벤치마크: 재실행마다 DB를 읽는 경우 vs 데이터 버전 키 캐시 적중
+
+앱이 위젯 상호작용마다 부르는 읽기 함수(오늘 기록, 캘린더 한 달 기록 수, 한 달 기록)를
+직접 호출한 시간과 캐시를 거친 시간을 비교하고, 여러 스레드가 쓰기와 읽기를 섞어 할 때의
+적중률과 결과 일치 여부를 확인함
+
+실행:
+    python benchmarks/bench_query_cache.py --days 365 --per-day 12 --threads 8
+"""
+import argparse
+import threading
+from datetime import date, timedelta
+
+from _common import make_sample_records, print_summary, timed, use_temp_workdir
+
+use_temp_workdir()
+
+import database  # noqa: E402
+from query_cache import QueryCache  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--per-day", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    today = date.today()
+    start = today - timedelta(days=args.days - 1)
+    database.add_records_bulk(make_sample_records(args.days, args.per_day, start.isoformat()))
+    month_start = today.replace(day=1).isoformat()
+    reads = {
+        "get_records_by_date": (database.get_records_by_date, (today.isoformat(),)),
+        "get_daily_counts": (database.get_daily_counts, (month_start, today.isoformat())),
+        "get_records_by_date_range": (database.get_records_by_date_range, (month_start, today.isoformat())),
+    }
+
+    cache = QueryCache()
+    for name, (func, call_args) in reads.items():
+        wrapped = cache.cached(func)
+        print_summary(f"{name} direct", [timed(func, *call_args) for _ in range(args.repeat)])
+        print_summary(f"{name} cached", [timed(wrapped, *call_args) for _ in range(args.repeat)])
+
+    # 여러 세션이 동시에 쓰고 읽을 때: 쓰기 직후의 조회는 항상 최신 결과여야 함
+    cache.clear()
+    cached_by_date = cache.cached(database.get_records_by_date)
+    target = today.isoformat()
+    mismatches = []
+
+    def session(n: int):
+        for i in range(20):
+            database.add_record(f"동시{n}-{i}", "기타", "01:00", "02:00", "", target)
+            if f"동시{n}-{i}" not in {record["activity"] for record in cached_by_date(target)}:
+                mismatches.append((n, i))
+            for _ in range(10):
+                cached_by_date(target)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = cache.info()
+    print(f"concurrent sessions={args.threads} hit rate={info['hit_rate']:.1%} "
+          f"stale reloads={info['functions']['get_records_by_date']['stale']} missing own writes={len(mismatches)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+저장소 프로필 동시성 벤치마크: 읽기 스레드와 쓰기 스레드를 동시에 실행하여 처리량 비교
+
+실행:
+    python benchmarks/bench_storage_profile.py --readers 6 --writers 2 --seconds 3
+"""
+import argparse
+import os
+import threading
+import time
+
+from _common import make_sample_records, print_summary, timed, use_temp_workdir
+
+use_temp_workdir()
+
+import database  # noqa: E402
+
+def run_profile(profile: str, readers: int, writers: int, seconds: float):
+    # 프로필마다 새 DB 파일 사용
+    database.close_all_connections()
+    database.DB_FILE = f"bench_{profile}.db"
+    database.init_database(profile)
+    records = make_sample_records(days=90)
+    database.add_records_bulk(records)
+    dates = sorted({r["date"] for r in records})
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    read_samples, write_samples = [], []
+
+    def reader(offset: int):
+        local = []
+        i = offset
+        while not stop.is_set():
+            date = dates[i % len(dates)]
+            local.append(timed(database.get_records_by_date_range, date, dates[min(i % len(dates) + 30, len(dates) - 1)]))
+            local.append(timed(database.get_statistics))
+            i += 1
+        with lock:
+            read_samples.extend(local)
+
+    def writer(offset: int):
+        local = []
+        i = 0
+        while not stop.is_set():
+            local.append(timed(
+                database.add_record, f"쓰기{offset}-{i}", "기타", "12:00", "12:30", "", dates[i % len(dates)]
+            ))
+            i += 1
+        with lock:
+            write_samples.extend(local)
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    print(f"[{profile}] reads/s={len(read_samples) / seconds:9.1f}  writes/s={len(write_samples) / seconds:9.1f}")
+    print_summary(f"  {profile} read", read_samples)
+    print_summary(f"  {profile} write", write_samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=6)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--profiles", nargs="+", default=["legacy", "wal"])
+    args = parser.parse_args()
+
+    print(f"readers={args.readers} writers={args.writers} duration={args.seconds}s cwd={os.getcwd()}")
+    for profile in args.profiles:
+        run_profile(profile, args.readers, args.writers, args.seconds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+HH:MM 시간 계산 벤치마크: 행 단위 strptime(apply) vs 스칼라 time_columns vs 벡터 연산(time_engine)
+
+자정을 넘기는 기록, "24:00", "7:30"처럼 형식이 다른 값을 섞은 start_time/end_time 컬럼으로
+길이(분)를 계산하고, 벡터 결과가 스칼라 결과와 같은지 확인함
+
+실행:
+    python benchmarks/bench_time_engine.py --rows 10000 100000 1000000 --legacy-max 100000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from _common import use_temp_workdir
+
+use_temp_workdir()
+
+from database import time_columns  # noqa: E402
+from time_engine import clock_to_minutes, durations_between  # noqa: E402
+
+def make_times(rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    start = rng.integers(0, 24 * 60, rows)
+    end = (start + rng.integers(5, 9 * 60, rows)) % (24 * 60)   # 일부는 자정을 넘김
+    frame = pd.DataFrame({
+        "start_time": [f"{m // 60:02d}:{m % 60:02d}" for m in start],
+        "end_time": [f"{m // 60:02d}:{m % 60:02d}" for m in end],
+    })
+    frame.loc[rng.random(rows) < 0.02, "end_time"] = "24:00"
+    frame.loc[rng.random(rows) < 0.01, "start_time"] = "7:30"
+    return frame
+
+def legacy_duration(start_time: str, end_time: str) -> float:
+    """기존 appj.calculate_time_duration"""
+    try:
+        start = datetime.strptime(start_time, "%H:%M")
+        end = datetime.strptime(end_time, "%H:%M")
+        if end < start:
+            end += timedelta(days=1)
+        return (end - start).total_seconds() / 60
+    except ValueError:
+        return 0
+
+def measure(label: str, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    print(f"  {label:<34} {(time.perf_counter() - started) * 1000:10.1f}ms")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-max", type=int, default=100_000, help="이보다 많은 행은 apply 방식 측정 생략")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = make_times(rows, args.seed)
+        print(f"rows={rows}")
+        if rows <= args.legacy_max:
+            measure("before: apply(strptime) duration", lambda: df.apply(
+                lambda row: legacy_duration(row["start_time"], row["end_time"]), axis=1))
+            measure("before: start_hour split apply", lambda: df["start_time"].apply(lambda x: int(x.split(":")[0])))
+        else:
+            print(f"  {'before: apply(strptime) duration':<34} {'skipped':>12}")
+        scalar = measure("scalar: time_columns per row", lambda: [
+            time_columns(s, e)[2] for s, e in zip(df["start_time"], df["end_time"])])
+
+        def vectorized():
+            start = clock_to_minutes(df["start_time"])
+            return start, durations_between(start, clock_to_minutes(df["end_time"]))
+
+        start, durations = measure("after: time_engine vectorized", vectorized)
+        measure("after: start_hour from minutes", lambda: start // 60)
+
+        expected = np.array([np.nan if value is None else value for value in scalar], dtype=float)
+        assert np.array_equal(expected, durations, equal_nan=True), "벡터 결과가 스칼라 결과와 다릅니다"
+        print(f"  results match ({int(np.isnan(durations).sum())} invalid)")
+
+if __name__ == "__main__":
+    main()
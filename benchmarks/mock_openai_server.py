@@ -0,0 +1,291 @@
+"""
+오프라인 벤치마크용 OpenAI chat.completions 모의 서버
+
+backend/open.py가 사용하는 POST /v1/chat/completions만 구현하며, 요청 프롬프트를 보고
+AI 조언/실시간 피드백/카테고리 제안/일괄 분류에 맞는 JSON 응답을 돌려줌
+
+- 지연 시간: 첫 토큰까지의 시간(fixed/uniform/lognormal 분포) + 토큰당 시간
+  (--prefill-ms-per-1k를 주면 프롬프트 길이에 비례하는 처리 시간을 첫 토큰 앞에 더함)
+- stream=true 요청은 SSE로 토큰 조각을 나눠 전송
+- 일정 비율의 요청에 429(rate limit) 응답 주입
+- response_format(json_schema)이 있으면 스키마의 필드만 반환하며, 일정 비율의 응답은
+  형식을 깨뜨려(코드 블록, 필드 누락, 중간에 잘림) 파싱 복구 경로를 시험할 수 있음
+
+실행:
+    python benchmarks/mock_openai_server.py --port 8765 --ttft-ms 400 --dist lognormal --error-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=mock streamlit run appj.py
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+class MockConfig:
+    """모의 서버 동작 설정"""
+
+    def __init__(self, ttft_ms: float = 300.0, dist: str = "lognormal", sigma: float = 0.5,
+                 jitter_ms: float = 100.0, token_ms: float = 15.0, chunk_chars: int = 4,
+                 error_rate: float = 0.0, retry_after: float = 0.2, malformed_rate: float = 0.0,
+                 prefill_ms_per_1k: float = 0.0, seed: Optional[int] = None):
+        self.ttft_ms = ttft_ms          # 첫 토큰까지의 시간 (중앙값/고정값)
+        self.dist = dist                # fixed, uniform, lognormal
+        self.sigma = sigma              # lognormal 분포의 표준편차 (로그 단위)
+        self.jitter_ms = jitter_ms      # uniform 분포의 ± 범위
+        self.token_ms = token_ms        # 토큰 조각당 생성 시간
+        self.chunk_chars = chunk_chars  # 토큰 조각 하나의 글자 수
+        self.error_rate = error_rate    # 429를 돌려줄 요청 비율
+        self.retry_after = retry_after  # 429 응답의 retry-after (초)
+        self.malformed_rate = malformed_rate  # 형식을 깨뜨려 보낼 응답 비율
+        self.prefill_ms_per_1k = prefill_ms_per_1k  # 프롬프트 1천 토큰당 처리 시간
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "streamed": 0, "rate_limited": 0, "malformed": 0}
+
+    def sample_ttft(self) -> float:
+        """첫 토큰까지의 시간 샘플 (초)"""
+        with self._lock:
+            if self.dist == "fixed":
+                value = self.ttft_ms
+            elif self.dist == "uniform":
+                value = self._random.uniform(self.ttft_ms - self.jitter_ms, self.ttft_ms + self.jitter_ms)
+            else:
+                value = self.ttft_ms * math.exp(self._random.gauss(0.0, self.sigma))
+        return max(value, 0.0) / 1000
+
+    def should_rate_limit(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def malformation(self) -> Optional[str]:
+        """형식을 깨뜨릴 방식 (깨뜨리지 않으면 None)"""
+        with self._lock:
+            if self._random.random() >= self.malformed_rate:
+                return None
+            return self._random.choice(["fence", "drop_field", "truncate"])
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+_BATCH_LINE_PATTERN = re.compile(r"^(\d+)\.\s*(.+)$")
+_KEYWORD_CATEGORIES = [
+    ("수면", ("수면", "잠", "취침", "낮잠")),
+    ("식사", ("식사", "밥", "아침", "점심", "저녁", "간식")),
+    ("운동", ("운동", "헬스", "산책", "러닝", "요가", "스트레칭")),
+    ("일과", ("공부", "업무", "수업", "학습", "회의", "과제")),
+    ("취미", ("독서", "게임", "영화", "음악", "유튜브", "그림")),
+]
+
+def estimate_prompt_tokens(messages: List[Dict]) -> int:
+    """프롬프트 토큰 수 추정 (ASCII 4글자당 1토큰, 그 밖의 문자는 1글자당 1토큰)"""
+    text = "".join(str(m.get("content", "")) for m in messages)
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+def _guess_category(activity: str) -> str:
+    for category, keywords in _KEYWORD_CATEGORIES:
+        if any(keyword in activity for keyword in keywords):
+            return category
+    return "기타"
+
+def canned_content(messages: List[Dict], response_format: Optional[Dict] = None) -> str:
+    """요청 프롬프트 종류에 맞는 고정 JSON 응답 본문 (json_schema가 있으면 그 필드만)"""
+    system = messages[0].get("content", "") if messages else ""
+    user = messages[-1].get("content", "") if messages else ""
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    if '"results"' in system:
+        results = []
+        for line in user.splitlines():
+            match = _BATCH_LINE_PATTERN.match(line.strip())
+            if match:
+                results.append({"id": int(match.group(1)), "category": _guess_category(match.group(2))})
+        payload = {"results": results}
+    elif "suggested_category" in system:
+        activity = user.split("사용자가 입력한 활동:", 1)[-1].split("\n", 1)[0].strip()
+        category = _guess_category(activity)
+        payload = {
+            "suggested_category": category,
+            "category_description": f"'{activity}' 활동은 {category}에 가깝습니다.",
+            "alternative_categories": [{"name": "기타", "reason": "모의 응답"}],
+            "routines": [{"name": activity, "description": "모의 루틴", "time_estimate": "30분"}],
+            "timestamp": now,
+        }
+    elif "feedbacks" in system:
+        payload = {
+            "summary": "꾸준히 기록하고 계시네요.",
+            "feedbacks": [
+                {"title": "기록 습관", "description": "매일 기록을 남기고 계십니다.", "type": "positive"},
+                {"title": "운동 시간", "description": "운동 시간을 조금 늘려보시면 좋겠습니다.", "type": "suggestion"},
+                {"title": "시간대 패턴", "description": "오전에 활동이 집중되어 있습니다.", "type": "neutral"},
+            ],
+            "timestamp": now,
+        }
+    else:
+        payload = {
+            "summary": "지금 루틴을 바탕으로 작은 변화부터 시작해보세요.",
+            "advices": [
+                {"title": "짧은 운동부터", "description": "하루 10분 스트레칭으로 시작해보세요.", "priority": 1},
+                {"title": "취침 시간 고정", "description": "매일 같은 시간에 잠자리에 들어보세요.", "priority": 2},
+                {"title": "기록 유지", "description": "지금처럼 꾸준히 기록해주세요.", "priority": 3},
+            ],
+            "timestamp": now,
+        }
+    schema = ((response_format or {}).get("json_schema") or {}).get("schema") or {}
+    if schema.get("properties"):
+        payload = {key: payload[key] for key in schema["properties"] if key in payload}
+    return json.dumps(payload, ensure_ascii=False)
+
+def malform(content: str, how: str) -> str:
+    """응답 본문의 형식을 깨뜨림"""
+    if how == "fence":
+        return f"```json\n{content}\n```"
+    if how == "drop_field":
+        payload = json.loads(content)
+        if len(payload) > 1:
+            payload.pop(next(iter(payload)))
+        return json.dumps(payload, ensure_ascii=False)
+    return content[:max(1, len(content) * 2 // 3)]
+
+def _split_chunks(text: str, size: int) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive 연결 재사용
+    config: MockConfig = MockConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+
+        config = self.config
+        config.count("requests")
+        if config.should_rate_limit():
+            config.count("rate_limited")
+            self._send_json(429, {
+                "error": {
+                    "message": "Rate limit reached for requests (mock)",
+                    "type": "requests",
+                    "code": "rate_limit_exceeded",
+                }
+            }, headers={"retry-after": str(config.retry_after)})
+            return
+
+        model = request.get("model", "gpt-4o")
+        content = canned_content(request.get("messages", []), request.get("response_format"))
+        how = config.malformation()
+        if how:
+            config.count("malformed")
+            content = malform(content, how)
+        chunks = _split_chunks(content, config.chunk_chars)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        prompt_tokens = estimate_prompt_tokens(request.get("messages", []))
+        time.sleep(config.sample_ttft() + config.prefill_ms_per_1k * prompt_tokens / 1000 / 1000)
+
+        if request.get("stream"):
+            config.count("streamed")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for n, piece in enumerate(chunks):
+                if n:
+                    time.sleep(config.token_ms / 1000)
+                event = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece} if n == 0 else {"content": piece},
+                                 "finish_reason": None}],
+                }
+                self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+            final = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            }
+            self._write_chunk(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+            self._write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            return
+
+        time.sleep(config.token_ms * (len(chunks) - 1) / 1000)
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(chunks),
+                      "total_tokens": prompt_tokens + len(chunks)},
+        })
+
+def start_mock_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """백그라운드 스레드에서 모의 서버 시작 후 (서버, base_url) 반환 (port=0이면 빈 포트 사용)"""
+    handler = type("ConfiguredMockOpenAIHandler", (MockOpenAIHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-openai", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """모의 서버 설정 인자 추가 (벤치마크 스크립트와 공유)"""
+    parser.add_argument("--ttft-ms", type=float, default=300.0)
+    parser.add_argument("--dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--token-ms", type=float, default=15.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.2)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(ttft_ms=args.ttft_ms, dist=args.dist, sigma=args.sigma, jitter_ms=args.jitter_ms,
+                      token_ms=args.token_ms, error_rate=args.error_rate, retry_after=args.retry_after,
+                      malformed_rate=args.malformed_rate, prefill_ms_per_1k=args.prefill_ms_per_1k,
+                      seed=args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(config_from_args(args), args.host, args.port)
+    print(f"mock OpenAI server listening on {base_url} (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+테스트 공용 설정
+
+database 모듈은 import 시점에 현재 디렉터리의 routine_database.db를 초기화하므로, 저장소의
+실제 DB를 건드리지 않도록 backend 모듈을 import하기 전에 임시 디렉터리로 이동함
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+os.chdir(tempfile.mkdtemp(prefix="routine_test_"))
+
+import database  # noqa: E402
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """테스트마다 빈 DB 파일을 쓰는 database 모듈"""
+    monkeypatch.setattr(database, "DB_FILE", str(tmp_path / "routine_database.db"))
+    database.init_database()
+    yield database
+    database.close_all_connections()
@@ -0,0 +1,40 @@
+import pytest
+
+import category_classifier
+from category_classifier import CONFIDENCE_THRESHOLD, classify_activity
+
+TRAINING = [
+    ("아침 달리기", "운동"), ("저녁 달리기", "운동"), ("공원 달리기", "운동"), ("헬스장 운동", "운동"),
+    ("아침 식사", "식사"), ("점심 식사", "식사"), ("저녁 식사", "식사"), ("간식", "식사"),
+    ("소설 읽기", "취미"), ("그림 그리기", "취미"), ("기타 연습", "취미"),
+    ("회사 업무", "일과"), ("팀 회의", "일과"), ("보고서 작성", "일과"),
+    ("밤잠", "수면"), ("낮잠", "수면"),
+]
+
+@pytest.fixture
+def trained(db, monkeypatch):
+    """활동마다 세 번씩 기록한 DB (n-gram 모델을 쓸 만큼의 기록 수)"""
+    # 테스트마다 새 DB라 데이터 버전이 같을 수 있으므로 이전 테스트의 분류기를 쓰지 않도록 초기화
+    monkeypatch.setattr(category_classifier, "_classifier", None)
+    db.add_records_bulk([
+        {"activity": activity, "category": category, "start_time": f"{hour:02d}:00",
+         "end_time": f"{hour:02d}:30", "date": "2026-10-01"}
+        for activity, category in TRAINING for hour in (6, 12, 18)
+    ])
+    return db
+
+def test_strong_ngram_match_is_answered_locally(trained):
+    result = classify_activity("점심 식사 준비")
+
+    assert result is not None
+    assert result["category"] == "식사"
+    assert result["source"] == "ngram"
+    assert result["confidence"] >= CONFIDENCE_THRESHOLD
+
+@pytest.mark.parametrize("activity", [
+    "한강 달리기",                              # 겹치는 조각은 충분하지만 확신도가 기준보다 낮음
+    "피아노 학원 숙제 달리기",                   # 학습한 조각과 겹치는 비율이 낮음
+    "달리기 후 스트레칭과 명상 그리고 요가",
+])
+def test_weak_ngram_match_is_left_to_llm(trained, activity):
+    assert classify_activity(activity) is None
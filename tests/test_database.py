@@ -0,0 +1,40 @@
+from datetime import datetime
+
+def make_record(activity, start_time="07:00", **extra):
+    record = {
+        "activity": activity,
+        "category": "운동",
+        "start_time": start_time,
+        "end_time": "08:00",
+        "date": "2026-10-01",
+        "timestamp": datetime(2026, 10, 1, 7).isoformat(),
+    }
+    record.update(extra)
+    return record
+
+def activities(db):
+    with db.db_connection() as conn:
+        return sorted(row[0] for row in conn.execute("SELECT activity FROM records"))
+
+def test_add_records_bulk_keeps_outer_transaction_on_duplicate_id(db):
+    with db.db_connection() as conn:
+        conn.execute(
+            "INSERT INTO records (id, activity, category, start_time, end_time, memo, date, timestamp) "
+            "VALUES ('outer', '바깥 작업', '기타', '06:00', '06:30', '', '2026-10-01', '2026-10-01T06:00:00')"
+        )
+        first = db.add_records_bulk([make_record("첫 묶음", "09:00")], chunk_size=1)
+        # 같은 ID가 두 번 들어가는 묶음: 행 단위 재시도에서 두 번째 행만 오류
+        second = db.add_records_bulk(
+            [make_record("같은 ID 1", "10:00", id="dup"), make_record("같은 ID 2", "11:00", id="dup")],
+            chunk_size=2,
+        )
+
+    assert first == {"success": 1, "duplicate": 0, "error": 0, "total": 1}
+    assert second == {"success": 1, "duplicate": 0, "error": 1, "total": 2}
+    assert activities(db) == ["같은 ID 1", "바깥 작업", "첫 묶음"]
+
+def test_add_records_bulk_counts_natural_key_duplicates(db):
+    result = db.add_records_bulk([make_record("달리기"), make_record("달리기", end_time="09:00")])
+
+    assert result == {"success": 1, "duplicate": 1, "error": 0, "total": 2}
+    assert activities(db) == ["달리기"]